@@ -1,7 +1,8 @@
 import os
 import sys
-import glob
 import importlib
+import importlib.abc
+import importlib.util
 
 # Boards Vendors.
 
@@ -45,37 +46,87 @@ vendors = [
 
 # Get all platforms/targets.
 litex_boards_dir = os.path.dirname(os.path.realpath(__file__))
-platforms        = glob.glob(f"{litex_boards_dir}/platforms/*.py")
-targets          = glob.glob(f"{litex_boards_dir}/targets/*.py")
-
-# For each platform:
-for platform in platforms:
-    platform = os.path.basename(platform)
-    platform = platform.replace(".py", "")
-    # Verify if a Vendor prefix is present in platform name, if so create the short import to
-    # allow the platform to be imported with the full name or short name ex:
-    # from litex_boards.platforms import digilent_arty or
-    # from litex_boards.platforms import arty
-    if platform.split("_")[0] in vendors:
-        short_platform = platform[len(platform.split("_")[0])+1:]
-        p = importlib.import_module(f"litex_boards.platforms.{platform}")
-        vars()[short_platform] = p
-        sys.modules[f"litex_boards.platforms.{short_platform}"] = p
-
-# For each target:
-for target in targets:
-    target = os.path.basename(target)
-    target = target.replace(".py", "")
-    # Verify if a Vendor prefix is present in target name, if so create the short import to
-    # allow the target to be imported with the full name or short name ex:
-    # from litex_boards.targets import digilent_arty or
-    # from litex_boards.targets import arty
-    if target.split("_")[0] in vendors:
-        try:
-            short_target = target[len(target.split("_")[0])+1:]
-            t = importlib.import_module(f"litex_boards.targets.{target}")
-            vars()[short_target] = t
-            sys.modules[f"litex_boards.targets.{short_target}"] = t
-        except ModuleNotFoundError:
-            # Not all dependencies for this target is satisfied. Skip.
-            pass
+
+def _list_modules(directory):
+    modules = []
+    for file in sorted(os.listdir(os.path.join(litex_boards_dir, directory))):
+        if file.endswith(".py") and file != "__init__.py":
+            modules.append(file[:-len(".py")])
+    return modules
+
+modules = {
+    "litex_boards.platforms" : _list_modules("platforms"),
+    "litex_boards.targets"   : _list_modules("targets"),
+}
+
+# Short names.
+#
+# Verify if a Vendor prefix is present in platform/target name, if so create the short alias to
+# allow the platform/target to be imported with the full name or short name ex:
+# from litex_boards.platforms import digilent_arty or
+# from litex_boards.platforms import arty
+#
+# Aliases are only resolved on first access: the alias table is built from the file names and no
+# platform/target is imported until it is explicitly requested.
+
+def _short_names(package):
+    short_names = {}
+    for module in modules[package]:
+        vendor = module.split("_")[0]
+        short_name = module[len(vendor)+1:]
+        # Modules existing with the short name (ex: marble/berkeleylab_marble) take precedence.
+        if vendor in vendors and short_name not in modules[package]:
+            short_names[short_name] = module
+    return short_names
+
+aliases = {package: _short_names(package) for package in modules}
+
+def resolve_alias(package, name):
+    """Return full module name of a platform/target short name (or None if not an alias)."""
+    full_name = aliases.get(package, {}).get(name, None)
+    if full_name is None:
+        return None
+    return f"{package}.{full_name}"
+
+class _AliasLoader(importlib.abc.Loader):
+    def __init__(self, full_name):
+        self.full_name = full_name
+
+    def create_module(self, spec):
+        # Return the module imported with its full name, so that short and full names share the
+        # same module object.
+        module = importlib.import_module(self.full_name)
+        self.full_spec = module.__spec__
+        return module
+
+    def exec_module(self, module):
+        # The import machinery sets __spec__ to the alias spec, restore the original one.
+        module.__spec__ = self.full_spec
+
+    # Required by runpy to allow: python3 -m litex_boards.targets.arty
+    def get_code(self, name):
+        return importlib.util.find_spec(self.full_name).loader.get_code(self.full_name)
+
+    def is_package(self, name):
+        return False
+
+class _AliasFinder(importlib.abc.MetaPathFinder):
+    def find_spec(self, name, path, target=None):
+        package, _, short_name = name.rpartition(".")
+        full_name = resolve_alias(package, short_name)
+        if full_name is None:
+            return None
+        full_spec = importlib.util.find_spec(full_name)
+        if full_spec is None:
+            return None
+        return importlib.util.spec_from_loader(name, _AliasLoader(full_name), origin=full_spec.origin)
+
+if not any(isinstance(finder, _AliasFinder) for finder in sys.meta_path):
+    sys.meta_path.append(_AliasFinder())
+
+def _package_getattr(package):
+    def __getattr__(name):
+        if resolve_alias(package, name) is None:
+            raise AttributeError(f"module '{package}' has no attribute '{name}'")
+        return importlib.import_module(f"{package}.{name}")
+    return __getattr__
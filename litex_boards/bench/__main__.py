@@ -0,0 +1,3 @@
+from litex_boards.bench.elaboration import main
+
+main()
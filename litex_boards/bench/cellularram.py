@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# CellularRAM simulation benchmark: compares the throughput of the CellularRAM controller
+# (litex_boards.cores.sram, Nexys4) in synchronous burst (variable/fixed latency) and asynchronous
+# modes with the previous 16-bit Wishbone controller behind a 32-bit to 16-bit Wishbone converter,
+# on a behavioral CellularRAM model, for single word writes/reads and cache line refills.
+#
+# Ex: python3 -m litex_boards.bench.cellularram --sys-clk-freq=75e6 --burst-lengths=8,16,32
+
+import random
+import argparse
+
+from math import ceil
+
+from migen import *
+
+from litex.soc.interconnect import wishbone
+
+from litex_boards.cores.sram import CellularRAM
+from litex_boards.bench.sim import CellularRAMModel
+from litex_boards.bench.sram import wishbone_burst
+
+# Previous Controller ------------------------------------------------------------------------------
+
+class LegacyCellularRAM(Module):
+    """Previous Nexys4 controller: 16-bit Wishbone (asynchronous accesses of 70ns) + converter."""
+    def __init__(self, pads, sys_clk_freq):
+        self.bus = wishbone.Interface(data_width=32, adr_width=len(pads.addr) - 1)
+        bus16    = wishbone.Interface(data_width=16, adr_width=len(pads.addr))
+        self.submodules.converter = wishbone.Converter(self.bus, bus16)
+
+        # # #
+
+        delay_for_70ns = int(ceil(70e-9*sys_clk_freq)) + 1
+        delaycounter   = Signal(5)
+        self.submodules.fsm = fsm = FSM(reset_state="INIT")
+        fsm.act("INIT",
+            NextValue(delaycounter, 0),
+            NextValue(bus16.ack, 0),
+            NextValue(pads.cen, 1),
+            NextValue(pads.adv, 1),
+            NextValue(pads.lb, 1),
+            NextValue(pads.ub, 1),
+            NextValue(pads.data_oe, 0),
+            NextState("IDLE")
+        )
+        fsm.act("IDLE",
+            If(bus16.stb & bus16.cyc,
+                NextValue(pads.lb, ~bus16.sel[0]),
+                NextValue(pads.ub, ~bus16.sel[1]),
+                NextValue(delaycounter, 0),
+                NextValue(pads.cen, 0),
+                NextValue(pads.adv, 0),
+                NextValue(pads.addr, bus16.adr),
+                If(bus16.we,
+                    NextValue(pads.wen, 0),
+                    NextValue(pads.oen, 1),
+                    NextValue(pads.data_oe, 1),
+                    NextValue(pads.data_o, bus16.dat_w),
+                    NextState("WRITE")
+                ).Else(
+                    NextValue(pads.wen, 1),
+                    NextValue(pads.oen, 0),
+                    NextValue(pads.data_oe, 0),
+                    NextState("READ")
+                )
+            )
+        )
+        fsm.act("WRITE",
+            NextValue(delaycounter, delaycounter + 1),
+            If(delaycounter == delay_for_70ns,
+                NextValue(bus16.ack, 1),
+                NextState("INIT")
+            )
+        )
+        fsm.act("READ",
+            NextValue(delaycounter, delaycounter + 1),
+            NextValue(bus16.dat_r, pads.data_i),
+            If(delaycounter == delay_for_70ns,
+                NextValue(bus16.ack, 1),
+                NextState("INIT")
+            )
+        )
+
+# Bench --------------------------------------------------------------------------------------------
+
+def cellularram_pads():
+    return Record([("addr", 23), ("cen", 1), ("wen", 1), ("oen", 1), ("adv", 1), ("cre", 1),
+        ("clk", 1), ("lb", 1), ("ub", 1), ("wait", 1), ("data_o", 16), ("data_i", 16), ("data_oe", 1)])
+
+class CellularRAMBench(Module):
+    def __init__(self, controller, size, sys_clk_freq, **kwargs):
+        pads = cellularram_pads()
+        self.submodules.model = CellularRAMModel(pads, size)
+        if controller == "legacy":
+            self.submodules.ram = LegacyCellularRAM(pads, sys_clk_freq)
+        else:
+            self.submodules.ram = CellularRAM(pads, sys_clk_freq, tpu=1e-6, **kwargs)
+
+def run_bench(controller, sys_clk_freq, words=256, line_words=8, size=64*1024, **kwargs):
+    """Run the accesses, returns {access: bytes/cycle} and the errors/contentions."""
+    dut     = CellularRAMBench(controller, size, sys_clk_freq, **kwargs)
+    bus     = dut.ram.bus
+    prng    = random.Random(42)
+    data    = [prng.getrandbits(32) for i in range(words)]
+    results = {"errors": 0}
+    started = [False]
+
+    def generator():
+        # Power-up/BCR configuration.
+        for i in range(int(2e-6*sys_clk_freq)):
+            yield
+        started[0] = True
+        # Single word writes.
+        for i in range(words):
+            yield from wishbone_burst(bus, i, 1, we=True, data=[data[i]])
+        # Single word reads (random order).
+        order = list(range(words))
+        prng.shuffle(order)
+        for i in order:
+            r = yield from wishbone_burst(bus, i, 1)
+            results["errors"] += (r[0] != data[i])
+        # Cache line refills.
+        for i in range(0, words, line_words):
+            r = yield from wishbone_burst(bus, i, line_words)
+            results["errors"] += sum(r[j] != data[i + j] for j in range(line_words))
+        results["contentions"] = (yield dut.model.contentions)
+
+    # Cycles of the different phases (from the number of acknowledged accesses).
+    phases = {"write": 0, "read": 0, "burst": 0}
+    @passive
+    def monitor():
+        acks = 0
+        while True:
+            if started[0]:
+                phase = "write" if acks < words else ("read" if acks < 2*words else "burst")
+                phases[phase] += 1
+                if (yield bus.cyc) & (yield bus.stb) & (yield bus.ack):
+                    acks += 1
+            yield
+
+    run_simulation(dut, [generator(), monitor()])
+    for access in phases:
+        results[access] = 4*words/phases[access]
+    return results
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="CellularRAM simulation benchmark.")
+    parser.add_argument("--sys-clk-freq",  default="50e6,75e6", help="System clock frequencies to sweep (comma separated).")
+    parser.add_argument("--burst-lengths", default="16",        help="Burst lengths (16-bit words) to sweep (comma separated).")
+    parser.add_argument("--words",         default=256, type=int, help="Number of 32-bit words per access type.")
+    parser.add_argument("--line-words",    default=8,   type=int, help="Cache line size (32-bit words) of the burst refills.")
+    args = parser.parse_args()
+
+    configs = [("legacy", {}), ("async", {"mode": "async"})]
+    for burst_length in [int(b) for b in args.burst_lengths.split(",")]:
+        for latency in ["variable", "fixed"]:
+            configs.append((f"sync-{latency[:3]}-bl{burst_length}",
+                {"mode": "sync", "latency": latency, "burst_length": burst_length}))
+
+    print(f"{'Controller':16s} {'Sys Clk (MHz)':>14s} {'Write (MB/s)':>13s} {'Read (MB/s)':>12s} {'Burst (MB/s)':>13s} {'Errors':>7s}")
+    for sys_clk_freq in [float(f) for f in args.sys_clk_freq.split(",")]:
+        for name, kwargs in configs:
+            results = run_bench("legacy" if name == "legacy" else "cellularram", sys_clk_freq,
+                words      = args.words,
+                line_words = args.line_words,
+                **kwargs)
+            w, r, b = [results[access]*sys_clk_freq/1e6 for access in ["write", "read", "burst"]]
+            print(f"{name:16s} {sys_clk_freq/1e6:14.1f} {w:13.1f} {r:12.1f} {b:13.1f} "
+                  f"{results['errors'] + results['contentions']:7d}", flush=True)
+
+if __name__ == "__main__":
+    main()
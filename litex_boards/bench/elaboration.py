@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Elaboration benchmark: times the elaboration phases (import, BaseSoC.__init__, finalize, Verilog
+# generation) of the targets for their default configuration and optional features, with optional
+# cProfile/tracemalloc summaries. Results can be saved as a baseline and later checked against it.
+#
+# Ex:
+#   python3 -m litex_boards.bench digilent_arty --features ethernet --save-baseline
+#   python3 -m litex_boards.bench digilent_arty --features ethernet --check
+
+import io
+import os
+import sys
+import json
+import time
+import pstats
+import cProfile
+import argparse
+import resource
+import tempfile
+import importlib
+import tracemalloc
+import traceback
+import multiprocessing
+
+from litex_boards import registry
+
+# Configurations -----------------------------------------------------------------------------------
+
+# Target options enabling each benchmarked feature (first supported option is used).
+feature_options = {
+    "ethernet" : ["--with-ethernet", "--with-etherbone"],
+    "pcie"     : ["--with-pcie"],
+    "sata"     : ["--with-sata"],
+    "sdcard"   : ["--with-sdcard", "--with-spi-sdcard"],
+    "video"    : ["--with-video-framebuffer", "--with-video-terminal", "--with-video-colorbars"],
+}
+
+default_args = [
+    "--cpu-type=vexriscv",
+    "--cpu-variant=minimal",
+    "--no-compile-software",
+    "--no-compile-gateware",
+]
+
+def get_configs(target, features=None, combined=True):
+    """Return the benchmarked configurations of a target as {name: [args]}."""
+    options = registry.target(target)["options"]
+    configs = {"default": []}
+    enabled = []
+    for feature, feature_opts in feature_options.items():
+        if features is not None and feature not in features:
+            continue
+        for option in feature_opts:
+            if option in options:
+                configs[feature] = [option]
+                enabled.append(option)
+                break
+    if combined and len(enabled) > 1:
+        configs["all"] = enabled
+    return configs
+
+# Phases Instrumentation ---------------------------------------------------------------------------
+
+class Phases:
+    def __init__(self, with_tracemalloc=False):
+        self.with_tracemalloc = with_tracemalloc
+        self.durations = {}
+        self.memory    = {}
+
+    def wrap(self, name, function):
+        def wrapper(*args, **kwargs):
+            # Only account the outermost call (finalize/__init__ are re-entrant).
+            if name in self.durations:
+                return function(*args, **kwargs)
+            self.durations[name] = None
+            if self.with_tracemalloc:
+                # reset_peak requires Python >= 3.9, restart the tracing on older versions.
+                if hasattr(tracemalloc, "reset_peak"):
+                    tracemalloc.reset_peak()
+                else:
+                    tracemalloc.stop()
+                    tracemalloc.start()
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.durations[name] = time.perf_counter() - start
+                if self.with_tracemalloc:
+                    self.memory[name] = tracemalloc.get_traced_memory()[1]
+        return wrapper
+
+    def instrument(self, module):
+        # BaseSoC.__init__, then finalize/Verilog generation on the created SoC.
+        phases   = self
+        soc_cls  = module.BaseSoC
+        soc_init = soc_cls.__init__
+        def __init__(soc, *args, **kwargs):
+            phases.wrap("init", soc_init)(soc, *args, **kwargs)
+            if "finalize" not in vars(soc):
+                soc.finalize = phases.wrap("finalize", soc.finalize)
+                soc.platform.get_verilog = phases.wrap("verilog", soc.platform.get_verilog)
+        soc_cls.__init__ = __init__
+
+# Run Configuration --------------------------------------------------------------------------------
+
+def run_config(target, args, output_dir, with_profile=False, with_tracemalloc=False, profile_lines=20):
+    """Run a target configuration in the current process and return its measurements."""
+    result = {"args": args, "passed": True}
+    phases = Phases(with_tracemalloc=with_tracemalloc)
+    if with_tracemalloc:
+        tracemalloc.start()
+    profiler = cProfile.Profile() if with_profile else None
+    start    = time.perf_counter()
+    cwd      = os.getcwd()
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+        os.chdir(output_dir)
+        if profiler is not None:
+            profiler.enable()
+        # Import.
+        import_start = time.perf_counter()
+        module = importlib.import_module(f"litex_boards.targets.{target}")
+        phases.durations["import"] = time.perf_counter() - import_start
+        # Build (init/finalize/verilog).
+        phases.instrument(module)
+        sys.argv = [target] + default_args + args + ["--output-dir", os.path.join(output_dir, "build")]
+        module.main()
+    except BaseException:
+        result["passed"] = False
+        result["error"]  = traceback.format_exc()
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        os.chdir(cwd)
+    result["durations"] = {k: v for k, v in phases.durations.items() if v is not None}
+    result["durations"]["total"] = time.perf_counter() - start
+    result["max_rss"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024 # in bytes.
+    if with_tracemalloc:
+        result["memory"] = phases.memory
+        result["memory"]["total"] = tracemalloc.get_traced_memory()[1]
+        snapshot = tracemalloc.take_snapshot()
+        result["tracemalloc"] = [str(stat) for stat in snapshot.statistics("lineno")[:profile_lines]]
+        tracemalloc.stop()
+    if profiler is not None:
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(profile_lines)
+        result["profile"] = stream.getvalue()
+    return result
+
+def _run_config_worker(conn, *args, **kwargs):
+    # Forked worker: isolate the configuration (imports, global state) and its output.
+    with open(os.devnull, "w") as devnull:
+        os.dup2(devnull.fileno(), 1)
+        sys.stdout = devnull
+        conn.send(run_config(*args, **kwargs))
+
+def run_config_isolated(*args, **kwargs):
+    """Run a target configuration in a forked process and return its measurements."""
+    context = multiprocessing.get_context("fork")
+    reader, writer = context.Pipe(duplex=False)
+    p = context.Process(target=_run_config_worker, args=(writer,) + args, kwargs=kwargs)
+    p.start()
+    writer.close()
+    try:
+        result = reader.recv()
+    except EOFError:
+        result = {"args": args[1], "passed": False, "error": "Worker crashed.", "durations": {}, "max_rss": 0}
+    p.join()
+    return result
+
+# Baseline -----------------------------------------------------------------------------------------
+
+def load_baseline(filename):
+    with open(filename) as f:
+        return json.load(f)
+
+def save_baseline(filename, results):
+    baseline = {}
+    for name, result in results.items():
+        if result["passed"]:
+            baseline[name] = {k: result[k] for k in ["durations", "max_rss", "memory"] if k in result}
+    with open(filename, "w") as f:
+        json.dump(baseline, f, indent=1, sort_keys=True)
+        f.write("\n")
+
+def check_baseline(baseline, results, tolerance=0.2):
+    """Compare results to a baseline and return the list of regressions."""
+    regressions = []
+    def check(name, metric, value, reference):
+        if reference and value > reference*(1 + tolerance):
+            regressions.append(f"{name}: {metric} {value:.3f} > {reference:.3f} (+{100*(value/reference - 1):.0f}%)")
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        if not result["passed"]:
+            regressions.append(f"{name}: failed")
+            continue
+        reference = baseline[name]
+        for phase, duration in result["durations"].items():
+            check(name, f"{phase} time", duration, reference["durations"].get(phase, None))
+        check(name, "max rss", result["max_rss"], reference.get("max_rss", None))
+        for phase, memory in result.get("memory", {}).items():
+            check(name, f"{phase} memory", memory, reference.get("memory", {}).get(phase, None))
+    return regressions
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards elaboration benchmark.")
+    parser.add_argument("targets",           nargs="*",                  help="Targets to benchmark (default: all).")
+    parser.add_argument("--features",        nargs="*",  default=None,   help="Features to benchmark (ethernet, pcie, sata, sdcard, video).")
+    parser.add_argument("--no-combined",     action="store_true",        help="Do not benchmark all features combined.")
+    parser.add_argument("--profile",         action="store_true",        help="Capture cProfile summaries.")
+    parser.add_argument("--tracemalloc",     action="store_true",        help="Capture tracemalloc summaries (per-phase memory peaks).")
+    parser.add_argument("--profile-lines",   default=20, type=int,       help="Number of lines of the cProfile/tracemalloc summaries.")
+    parser.add_argument("--output",          default=None,               help="Save full results to JSON file.")
+    parser.add_argument("--baseline",        default="bench_baseline.json", help="Baseline file.")
+    parser.add_argument("--save-baseline",   action="store_true",        help="Save results as baseline.")
+    parser.add_argument("--check",           action="store_true",        help="Check results against baseline.")
+    parser.add_argument("--tolerance",       default=0.2, type=float,    help="Allowed regression vs baseline (ratio).")
+    args = parser.parse_args()
+
+    targets = args.targets or [t["name"] for t in registry.targets() if t["name"] != "simple"]
+
+    # Run configurations.
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="litex_boards_bench_") as root:
+        for target in targets:
+            target = registry.target(target)["name"]
+            for config, config_args in get_configs(target, args.features, not args.no_combined).items():
+                name = f"{target}:{config}"
+                print(f"Running {name}...", flush=True)
+                results[name] = run_config_isolated(target, config_args,
+                    output_dir       = os.path.join(root, target, config),
+                    with_profile     = args.profile,
+                    with_tracemalloc = args.tracemalloc,
+                    profile_lines    = args.profile_lines)
+
+    # Report.
+    phases = ["import", "init", "finalize", "verilog", "total"]
+    print(f"\n{'Configuration':56s}" + "".join(f"{p:>10s}" for p in phases) + f"{'RSS (MB)':>10s}")
+    for name, result in results.items():
+        if not result["passed"]:
+            print(f"{name:56s} FAILED\n{result['error']}")
+            continue
+        line = f"{name:56s}"
+        for phase in phases:
+            line += f"{result['durations'].get(phase, float('nan')):10.2f}"
+        line += f"{result['max_rss']/2**20:10.1f}"
+        print(line)
+        for summary in ["profile", "tracemalloc"]:
+            if summary in result:
+                print(f"\n{name} {summary}:")
+                print(result[summary] if isinstance(result[summary], str) else "\n".join(result[summary]))
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=1)
+
+    # Baseline.
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+    if args.check:
+        regressions = check_baseline(load_baseline(args.baseline), results, args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
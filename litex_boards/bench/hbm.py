@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Alveo U280 HBM2 fabric simulation benchmark: runs the HBM Traffic Generators of the U280 target
+# on behavioral HBM pseudo-channel models and reports the aggregate bandwidth vs number of ports.
+#
+# Ex: python3 -m litex_boards.bench.hbm --ports=1,2,4,8,16,32
+
+import argparse
+
+from migen import *
+
+from litex.soc.interconnect.axi import AXIInterface
+
+from litex_boards.targets.xilinx_alveo_u280 import HBMTrafficGenerator
+from litex_boards.bench.sim import AXIMemoryModel
+
+# Bench --------------------------------------------------------------------------------------------
+
+class HBMBench(Module):
+    def __init__(self, nports, burst_length=16):
+        self.axis = [AXIInterface(data_width=256, address_width=33, id_width=6) for i in range(nports)]
+        self.tgs  = [HBMTrafficGenerator(axi, base=0x1000_0000*i, burst_length=burst_length, with_csr=False)
+            for i, axi in enumerate(self.axis)]
+        self.submodules += self.tgs
+
+def run_bench(nports, bursts=64, burst_length=16, latency=32, clk_freq=250e6):
+    dut     = HBMBench(nports, burst_length)
+    models  = [AXIMemoryModel(axi, latency=latency) for axi in dut.axis]
+    results = {}
+
+    def generator():
+        for mode in ["write", "read"]:
+            # Start all Traffic Generators.
+            for tg in dut.tgs:
+                yield tg.write.eq(mode == "write")
+                yield tg.bursts.eq(bursts)
+                yield tg.start.eq(1)
+            yield
+            for tg in dut.tgs:
+                yield tg.start.eq(0)
+            yield
+            # Wait for completion.
+            for tg in dut.tgs:
+                while not (yield tg.done):
+                    yield
+            cycles = 0
+            errors = 0
+            for tg in dut.tgs:
+                cycles = max(cycles, (yield tg.cycles))
+                errors += (yield tg.errors)
+            nbytes = nports*bursts*burst_length*256//8
+            results[mode] = (nbytes*clk_freq/cycles/1e9, errors)
+
+    generators = [generator()]
+    for model in models:
+        generators += model.generators()
+    run_simulation(dut, generators)
+    return results
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Alveo U280 HBM2 fabric simulation benchmark.")
+    parser.add_argument("--ports",        default="1,2,4,8",     help="Number of HBM2 ports to sweep (comma separated).")
+    parser.add_argument("--bursts",       default=64,  type=int, help="Number of bursts per port.")
+    parser.add_argument("--burst-length", default=16,  type=int, help="AXI burst length (beats).")
+    parser.add_argument("--latency",      default=32,  type=int, help="Pseudo-channel model latency (cycles).")
+    parser.add_argument("--clk-freq",     default=250e6,         help="AXI clock frequency.")
+    args = parser.parse_args()
+
+    print(f"{'Ports':>6s} {'Write (GB/s)':>14s} {'Read (GB/s)':>14s} {'Errors':>8s}")
+    for nports in [int(n) for n in args.ports.split(",")]:
+        results = run_bench(nports,
+            bursts       = args.bursts,
+            burst_length = args.burst_length,
+            latency      = args.latency,
+            clk_freq     = float(args.clk_freq))
+        errors = results["write"][1] + results["read"][1]
+        print(f"{nports:6d} {results['write'][0]:14.2f} {results['read'][0]:14.2f} {errors:8d}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# HyperRAM simulation benchmark: compares the throughput of a single 8-bit HyperRAM chip (LiteX
+# HyperRAM core, previous Tang Nano 9K main_ram) with two 8-bit chips driven in lockstep as one
+# 16-bit HyperRAM (litex_boards.cores.hyperram.DualHyperRAM) on behavioral HyperRAM models, for
+# single word writes/reads, cache line refills and long sequential bursts.
+#
+# Ex: python3 -m litex_boards.bench.hyperram --sys-clk-freq=27e6,54e6 --stream-words=32
+
+import random
+import argparse
+
+from migen import *
+
+from litex.soc.cores.hyperbus import HyperRAM
+
+from litex_boards.cores.hyperram import DualHyperRAM
+from litex_boards.bench.sim import HyperRAMModel
+from litex_boards.bench.sram import wishbone_burst
+
+# Bench --------------------------------------------------------------------------------------------
+
+def hyperram_chip_pads():
+    return Record([("clk", 1), ("cs_n", 1), ("dq_o", 8), ("dq_i", 8), ("dq_oe", 1), ("rwds_o", 1)])
+
+class HyperRAMBench(Module):
+    def __init__(self, chips, size, sys_clk_freq, latency=6):
+        models = []
+        for n in range(chips):
+            chip_pads = hyperram_chip_pads()
+            models.append(HyperRAMModel(chip_pads, size//chips, latency=latency))
+        self.submodules += models
+        if chips == 1:
+            pads = Record([("clk", 1), ("cs_n", 1), ("rst_n", 1),
+                ("dq",   [("o", 8), ("oe", 1), ("i", 8)]),
+                ("rwds", [("o", 1), ("oe", 1), ("i", 1)])])
+            self.submodules.ram = HyperRAM(pads, latency=latency, sys_clk_freq=sys_clk_freq)
+            pads_dq_o, pads_dq_i, pads_dq_oe, pads_rwds_o = pads.dq.o, pads.dq.i, pads.dq.oe, pads.rwds.o
+        else:
+            pads = Record([("clk", 1), ("cs_n", 2), ("rst_n", 2),
+                ("dq_o",   16), ("dq_i",    16), ("dq_oe", 1),
+                ("rwds_o",  2), ("rwds_oe",  1)])
+            self.submodules.ram = DualHyperRAM(pads, latency=latency, sys_clk_freq=sys_clk_freq)
+            pads_dq_o, pads_dq_i, pads_dq_oe, pads_rwds_o = pads.dq_o, pads.dq_i, pads.dq_oe, pads.rwds_o
+        for n, model in enumerate(models):
+            self.comb += [
+                model.pads.clk.eq(pads.clk),
+                model.pads.cs_n.eq(pads.cs_n[n]),
+                model.pads.dq_o.eq(pads_dq_o[8*n:8*(n + 1)]),
+                model.pads.dq_oe.eq(pads_dq_oe),
+                model.pads.rwds_o.eq(pads_rwds_o[n]),
+                pads_dq_i[8*n:8*(n + 1)].eq(model.pads.dq_i),
+            ]
+
+def run_bench(chips, sys_clk_freq, words=256, line_words=8, stream_words=32, size=64*1024):
+    """Run the accesses, returns {access: bytes/cycle} and the errors."""
+    dut     = HyperRAMBench(chips, size, sys_clk_freq)
+    bus     = dut.ram.bus
+    prng    = random.Random(42)
+    data    = [prng.getrandbits(32) for i in range(words)]
+    results = {"errors": 0}
+
+    def generator():
+        # Single word writes/reads (random order, consecutive accesses would be merged in bursts).
+        order = list(range(words))
+        prng.shuffle(order)
+        for i in order:
+            yield from wishbone_burst(bus, i, 1, we=True, data=[data[i]])
+        prng.shuffle(order)
+        for i in order:
+            r = yield from wishbone_burst(bus, i, 1)
+            results["errors"] += (r[0] != data[i])
+        # Cache line refills (random order).
+        lines = list(range(0, words, line_words))
+        prng.shuffle(lines)
+        for i in lines:
+            r = yield from wishbone_burst(bus, i, line_words)
+            results["errors"] += sum(r[j] != data[i + j] for j in range(line_words))
+        # Sequential bursts (ex: DMA/memcpy).
+        for i in range(0, words, stream_words):
+            r = yield from wishbone_burst(bus, i, stream_words)
+            results["errors"] += sum(r[j] != data[i + j] for j in range(stream_words))
+
+    # Cycles of the different phases (from the number of acknowledged accesses).
+    phases = {"write": 0, "read": 0, "burst": 0, "stream": 0}
+    @passive
+    def monitor():
+        acks = 0
+        while True:
+            phase = ["write", "read", "burst", "stream"][min(acks//words, 3)]
+            phases[phase] += 1
+            if (yield bus.cyc) & (yield bus.stb) & (yield bus.ack):
+                acks += 1
+            yield
+
+    run_simulation(dut, [generator(), monitor()])
+    for access in phases:
+        results[access] = 4*words/phases[access]
+    return results
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="HyperRAM simulation benchmark.")
+    parser.add_argument("--sys-clk-freq", default="27e6,54e6", help="System clock frequencies to sweep (comma separated).")
+    parser.add_argument("--words",        default=256, type=int, help="Number of 32-bit words per access type.")
+    parser.add_argument("--line-words",   default=8,   type=int, help="Cache line size (32-bit words) of the burst refills.")
+    parser.add_argument("--stream-words", default=32,  type=int, help="Length (32-bit words) of the sequential bursts.")
+    args = parser.parse_args()
+
+    print(f"{'Chips':8s} {'Sys Clk (MHz)':>14s} {'Write (MB/s)':>13s} {'Read (MB/s)':>12s} {'Burst (MB/s)':>13s} {'Stream (MB/s)':>14s} {'Errors':>7s}")
+    for sys_clk_freq in [float(f) for f in args.sys_clk_freq.split(",")]:
+        for chips in [1, 2]:
+            results = run_bench(chips, sys_clk_freq,
+                words        = args.words,
+                line_words   = args.line_words,
+                stream_words = args.stream_words)
+            w, r, b, s = [results[access]*sys_clk_freq/1e6 for access in ["write", "read", "burst", "stream"]]
+            print(f"{chips:<8d} {sys_clk_freq/1e6:14.1f} {w:13.1f} {r:12.1f} {b:13.1f} {s:14.1f} {results['errors']:7d}", flush=True)
+
+if __name__ == "__main__":
+    main()
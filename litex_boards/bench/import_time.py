@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Startup benchmark: compares the time needed to import a platform/target through the lazy short
+# name aliases against the time needed to import every platform/target (previous behaviour).
+#
+# Ex: python3 -m litex_boards.bench.import_time litex_boards.targets.arty
+
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+# Import Snippets ----------------------------------------------------------------------------------
+
+_lazy_snippet = "import {module}"
+
+_eager_snippet = """\
+import importlib
+import litex_boards
+for package, modules in litex_boards.modules.items():
+    for module in modules:
+        try:
+            importlib.import_module(f"{{package}}.{{module}}")
+        except ImportError:
+            pass
+import {module}
+"""
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def time_snippet(snippet, runs=5):
+    durations = []
+    for run in range(runs):
+        start = time.perf_counter()
+        subprocess.check_call([sys.executable, "-c", snippet])
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards import time benchmark.")
+    parser.add_argument("module",  nargs="?", default="litex_boards.platforms.arty", help="Module to import.")
+    parser.add_argument("--runs",  default=5, type=int,                              help="Number of runs (median is reported).")
+    args = parser.parse_args()
+
+    python = time_snippet("pass", runs=args.runs)
+    lazy   = time_snippet(_lazy_snippet.format(module=args.module),  runs=args.runs)
+    eager  = time_snippet(_eager_snippet.format(module=args.module), runs=args.runs)
+
+    print(f"Import of {args.module} (median of {args.runs} runs):")
+    print(f"  interpreter : {python*1e3:8.1f} ms")
+    print(f"  lazy        : {lazy*1e3:8.1f} ms")
+    print(f"  eager       : {eager*1e3:8.1f} ms")
+    print(f"  speedup     : {eager/lazy:8.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# PCIe DMA loopback simulation benchmark: builds the LitePCIe Endpoint/DMAs of a PCIe target (as
+# done by add_pcie) on a behavioral PCIe PHY/Host model (instead of the target's hard PHY), runs
+# Host -> FPGA -> Host DMA loopbacks and reports the throughput and descriptor latency vs number
+# of DMAs, data width and DMA buffer (descriptor) size.
+#
+# Ex: python3 -m litex_boards.bench.pcie xilinx_kc705 --dmas=1,2,4 --buffer-sizes=512,2048,8192
+
+import re
+import sys
+import inspect
+import argparse
+import importlib
+
+from migen import *
+
+from litex.soc.interconnect.csr import CSRStorage
+
+from litepcie.core import LitePCIeEndpoint
+from litepcie.frontend.dma import LitePCIeDMA
+
+from litex_boards import registry
+from litex_boards.cores.pcie import get_pcie_data_width
+from litex_boards.bench.sim import PCIePHYModel
+
+# Target Configuration -----------------------------------------------------------------------------
+
+def get_target_config(target):
+    """Return the PCIe configuration of a target: PHY class, default lanes/data width/sys_clk_freq."""
+    module   = importlib.import_module(f"litex_boards.targets.{registry.target(target)['name']}")
+    m        = re.search(r"(\w+PCIEPHY)\(", inspect.getsource(module))
+    if m is None:
+        raise ValueError(f"{target} has no PCIe PHY.")
+    phy_cls  = getattr(module, m.group(1))
+    defaults = {k: v.default for k, v in inspect.signature(module.BaseSoC.__init__).parameters.items()}
+    return {
+        "phy_cls"      : phy_cls,
+        "endianness"   : phy_cls.endianness,
+        "nlanes"       : defaults["pcie_lanes"],
+        "data_width"   : get_pcie_data_width(phy_cls, defaults["pcie_lanes"]),
+        "sys_clk_freq" : defaults["sys_clk_freq"],
+    }
+
+# Bench --------------------------------------------------------------------------------------------
+
+class PCIeBench(Module):
+    def __init__(self, phy, ndmas=1, buffering_depth=1024, max_pending_requests=8):
+        self.submodules.endpoint = LitePCIeEndpoint(phy,
+            max_pending_requests = max_pending_requests,
+            endianness           = phy.endianness,
+            address_width        = 32)
+        self.dmas = [LitePCIeDMA(phy, self.endpoint,
+            with_buffering  = True,
+            buffering_depth = buffering_depth,
+            with_loopback   = True,
+            address_width   = 32) for i in range(ndmas)]
+        self.submodules += self.dmas
+        # CSRs are driven by the simulation (no CSR bank): decode the fields from the storages.
+        for dma in self.dmas:
+            for csr in dma.get_csrs():
+                if isinstance(csr, CSRStorage) and hasattr(csr, "fields"):
+                    for field in csr.fields.fields:
+                        self.comb += field.eq(csr.storage[field.offset:field.offset + field.size])
+
+def run_bench(data_width, endianness="big", ndmas=1, buffer_size=4096, descriptors=4,
+    buffering_depth = 1024,
+    latency         = 64,
+    timeout         = 100000):
+    """Run the DMA loopbacks, returns the bytes/cycle, mean descriptor latency (cycles) and errors."""
+    phy = PCIePHYModel(data_width, endianness, latency=latency)
+    dut = PCIeBench(phy, ndmas=ndmas, buffering_depth=buffering_depth)
+
+    # Host buffers: src/dst buffers of each DMA/descriptor.
+    def buffer(dma, n, dst):
+        return 0x100000*(2*dma + dst) + buffer_size*n
+    for dma in range(ndmas):
+        for n in range(descriptors):
+            for i in range(buffer_size//4):
+                phy.mem[buffer(dma, n, dst=0)//4 + i] = (dma << 24) ^ (n << 16) ^ (i*0x9e3779b1 & 0xffffffff)
+    nbytes = ndmas*descriptors*buffer_size
+
+    def program_table(table, addresses):
+        yield table.loop_prog_n.storage.eq(0)
+        for address in addresses:
+            yield table.value.storage.eq(address | (buffer_size << 32))
+            yield table.we.re.eq(1)
+            yield
+            yield table.we.re.eq(0)
+            yield
+
+    def generator():
+        for dma in dut.dmas:
+            yield dma.loopback.enable.storage.eq(1)
+        for i, dma in enumerate(dut.dmas):
+            yield from program_table(dma.writer.table, [buffer(i, n, dst=1) for n in range(descriptors)])
+            yield from program_table(dma.reader.table, [buffer(i, n, dst=0) for n in range(descriptors)])
+        for dma in dut.dmas:
+            yield dma.writer._enable.storage.eq(1)
+            yield dma.reader._enable.storage.eq(1)
+        yield
+        # Wait for all the dst buffers to be written.
+        for cycle in range(timeout):
+            if sum(n for _, _, n in phy.writes) >= nbytes:
+                break
+            yield
+
+    run_simulation(dut, [generator()] + phy.generators())
+
+    # Check dst buffers.
+    errors = 0
+    for dma in range(ndmas):
+        for n in range(descriptors):
+            for i in range(buffer_size//4):
+                src = phy.mem[buffer(dma, n, dst=0)//4 + i]
+                dst = phy.mem.get(buffer(dma, n, dst=1)//4 + i, None)
+                errors += (src != dst)
+    if not phy.writes:
+        return {"bytes_per_cycle": 0, "latency": float("nan"), "errors": errors}
+
+    # Throughput: from first read request to last write.
+    first  = min(cycle for cycle, _, _ in phy.reads)
+    last   = max(cycle for cycle, _, _ in phy.writes)
+    # Descriptor latency: from first read request of a src buffer to last write of its dst buffer.
+    def descriptor(address):
+        return (address//0x100000//2, (address%0x100000)//buffer_size)
+    read_start = {}
+    write_end  = {}
+    for cycle, address, _ in phy.reads:
+        read_start.setdefault(descriptor(address), cycle)
+    for cycle, address, _ in phy.writes:
+        write_end[descriptor(address)] = cycle
+    latencies = [write_end[d] - read_start[d] for d in read_start if d in write_end]
+    return {
+        "bytes_per_cycle" : nbytes/(last - first + 1),
+        "latency"         : sum(latencies)/max(len(latencies), 1),
+        "errors"          : errors,
+    }
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="PCIe DMA loopback simulation benchmark.")
+    parser.add_argument("targets",           nargs="*",              help="PCIe targets to benchmark (default: all).")
+    parser.add_argument("--dmas",            default="1,2",          help="Number of DMAs to sweep (comma separated).")
+    parser.add_argument("--data-widths",     default=None,           help="PHY data widths to sweep (comma separated, default: target's).")
+    parser.add_argument("--buffer-sizes",    default="512,2048",     help="DMA buffer (descriptor) sizes to sweep in bytes (comma separated).")
+    parser.add_argument("--descriptors",     default=2,   type=int,  help="Number of descriptors per DMA.")
+    parser.add_argument("--buffering-depth", default=1024, type=int, help="DMA buffering depth (in bytes).")
+    parser.add_argument("--latency",         default=64,  type=int,  help="Host memory read latency (in cycles).")
+    args = parser.parse_args()
+
+    targets = args.targets or [t["name"] for t in registry.targets(feature="pcie")]
+
+    print(f"{'Target':32s} {'DMAs':>5s} {'Width':>6s} {'Buffer':>7s} {'MB/s':>9s} {'Latency (ns)':>13s} {'Errors':>7s}")
+    failed = False
+    cache  = {} # Targets with the same PHY configuration share the simulation results (in cycles).
+    for target in targets:
+        config = get_target_config(target)
+        if args.data_widths is None:
+            data_widths = [config["data_width"]]
+        else:
+            data_widths = [int(w) for w in args.data_widths.split(",")]
+        for ndmas in [int(n) for n in args.dmas.split(",")]:
+            for data_width in data_widths:
+                for buffer_size in [int(s) for s in args.buffer_sizes.split(",")]:
+                    key = (config["endianness"], data_width, ndmas, buffer_size)
+                    if key not in cache:
+                        cache[key] = run_bench(data_width,
+                            endianness      = config["endianness"],
+                            ndmas           = ndmas,
+                            buffer_size     = buffer_size,
+                            descriptors     = args.descriptors,
+                            buffering_depth = args.buffering_depth,
+                            latency         = args.latency)
+                    results      = cache[key]
+                    sys_clk_freq = config["sys_clk_freq"]
+                    failed |= results["errors"] != 0
+                    print(f"{target:32s} {ndmas:5d} {data_width:6d} {buffer_size:7d} "
+                          f"{results['bytes_per_cycle']*sys_clk_freq/1e6:9.1f} "
+                          f"{results['latency']*1e9/sys_clk_freq:13.1f} {results['errors']:7d}", flush=True)
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Multi-channel SDRAM simulation benchmark: runs sequential/random write+read traffic on N behavioral
+# DRAM channels (litex_boards.bench.sim.NativePortModel), either from one master on the interleaved
+# native port (main_ram path, N times the channels' data width) or from one master per channel
+# (per-channel native ports for DMAs), and reports the bandwidth scaling from 1 to 4 channels.
+#
+# Note: with cacheline interleaving each access of the interleaved port is striped over all the
+# channels; with page interleaving each access goes to a single channel (N beats), the channels
+# only working in parallel on the pipelined accesses to different pages.
+#
+# Ex: python3 -m litex_boards.bench.sdram_interleaving --channels=1,2,4 --interleaving=cacheline,page
+
+import random
+import argparse
+
+from migen import *
+
+from litedram.common import LiteDRAMNativePort
+
+from litex_boards.cores.sdram import LiteDRAMInterleavedNativePort
+from litex_boards.bench.sim import NativePortModel, NativePortMaster
+
+# Bench --------------------------------------------------------------------------------------------
+
+class SDRAMBench(Module):
+    def __init__(self, nchannels, granularity=None, address_width=20, data_width=512):
+        self.channel_ports = [LiteDRAMNativePort("both", address_width, data_width) for i in range(nchannels)]
+        if granularity is not None:
+            self.submodules.interleaved = LiteDRAMInterleavedNativePort(self.channel_ports, granularity)
+            self.port = self.interleaved.port
+
+def get_addresses(n, pattern, address_width, seed=0):
+    if pattern == "sequential":
+        return list(range(n))
+    rng = random.Random(seed)
+    return rng.sample(range(2**address_width), n)
+
+def run_bench(nchannels, mode, pattern, words=1024, granularity=1, row_words=128, data_width=512):
+    address_width = 20
+    if mode == "interleaved":
+        addresses = [get_addresses(words//nchannels, pattern, address_width)]
+    else:
+        addresses = [get_addresses(words//nchannels, pattern, address_width, seed=i) for i in range(nchannels)]
+    mems    = [{} for i in range(nchannels)] # Channels content, kept between write/read runs.
+    results = {}
+    for write in [True, False]:
+        dut = SDRAMBench(nchannels,
+            granularity   = granularity if mode == "interleaved" else None,
+            address_width = address_width,
+            data_width    = data_width)
+        models = [NativePortModel(port, row_words=row_words) for port in dut.channel_ports]
+        for model, mem in zip(models, mems):
+            model.mem = mem
+        ports   = [dut.port] if mode == "interleaved" else dut.channel_ports
+        masters = [NativePortMaster(port, addrs, write=write) for port, addrs in zip(ports, addresses)]
+        generators = [model.handler() for model in models]
+        for master in masters:
+            generators += master.generators()
+        run_simulation(dut, generators)
+        # Throughput in bytes/cycle and read errors.
+        nbytes = sum(m.nbytes for m in masters)
+        cycles = max(m.cycles for m in masters)
+        results["write" if write else "read"] = (nbytes/cycles, sum(m.errors for m in masters))
+    return results
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-channel SDRAM simulation benchmark.")
+    parser.add_argument("--channels",     default="1,2,4",          help="Number of channels to sweep (comma separated).")
+    parser.add_argument("--interleaving", default="cacheline,page", help="Interleaving granularities (cacheline, page).")
+    parser.add_argument("--patterns",     default="sequential,random", help="Access patterns (sequential, random).")
+    parser.add_argument("--words",        default=1024, type=int,   help="Number of channel native words written/read.")
+    parser.add_argument("--row-words",    default=128,  type=int,   help="DRAM page size (in native words).")
+    parser.add_argument("--data-width",   default=512,  type=int,   help="Native port data width.")
+    parser.add_argument("--sys-clk-freq", default=125e6,            help="System clock frequency.")
+    args = parser.parse_args()
+
+    sys_clk_freq = float(args.sys_clk_freq)
+    granularities = {"cacheline": 1, "page": args.row_words}
+    configs = [("per-channel", None)] + [(f"interleaved ({i})", i) for i in args.interleaving.split(",")]
+    print(f"{'Channels':>8s} {'Access':24s} {'Pattern':12s} {'Write (GB/s)':>13s} {'Read (GB/s)':>12s} {'Errors':>7s}")
+    for nchannels in [int(n) for n in args.channels.split(",")]:
+        for name, interleaving in configs:
+            for pattern in args.patterns.split(","):
+                results = run_bench(nchannels,
+                    mode        = "per-channel" if interleaving is None else "interleaved",
+                    pattern     = pattern,
+                    words       = args.words,
+                    granularity = granularities.get(interleaving, 1),
+                    row_words   = args.row_words,
+                    data_width  = args.data_width)
+                w, r   = [results[d][0]*sys_clk_freq/1e9 for d in ["write", "read"]]
+                errors = results["read"][1]
+                print(f"{nchannels:8d} {name:24s} {pattern:12s} {w:13.2f} {r:12.2f} {errors:7d}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,764 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Behavioral models used by the simulation benchmarks.
+
+from collections import deque
+
+from migen import Module, Signal, Memory, If, Case, Cat, Mux, log2_int
+from migen.sim import passive
+
+# AXI Memory Model ---------------------------------------------------------------------------------
+
+class AXIMemoryModel:
+    """Behavioral AXI slave memory
+
+    Accepts AW/AR requests (up to max_outstanding bursts per direction), returns data/responses
+    after a fixed latency and then transfers one beat per cycle: models a memory controller port
+    able to sustain its full bandwidth.
+    """
+    def __init__(self, axi, latency=16, max_outstanding=16):
+        self.axi             = axi
+        self.latency         = latency
+        self.max_outstanding = max_outstanding
+        self.mem             = {}
+
+    def generators(self):
+        return [self.write_handler(), self.read_handler()]
+
+    @passive
+    def write_handler(self):
+        axi       = self.axi
+        bursts    = deque() # [addr, beats, size, id].
+        responses = deque() # (cycle, id).
+        cycle     = 0
+        while True:
+            # Transfers of the current cycle.
+            if (yield axi.aw.valid) and (yield axi.aw.ready):
+                bursts.append([(yield axi.aw.addr), (yield axi.aw.len) + 1, (yield axi.aw.size), (yield axi.aw.id)])
+            if (yield axi.w.valid) and (yield axi.w.ready):
+                burst = bursts[0]
+                self.mem[burst[0]] = (yield axi.w.data)
+                burst[0] += 2**burst[2]
+                burst[1] -= 1
+                if burst[1] == 0:
+                    bursts.popleft()
+                    responses.append((cycle + self.latency, burst[3]))
+            if (yield axi.b.valid) and (yield axi.b.ready):
+                responses.popleft()
+            # Next cycle.
+            yield axi.aw.ready.eq(len(bursts) < self.max_outstanding)
+            yield axi.w.ready.eq(len(bursts) > 0)
+            if len(responses) and responses[0][0] <= cycle + 1:
+                yield axi.b.valid.eq(1)
+                yield axi.b.id.eq(responses[0][1])
+            else:
+                yield axi.b.valid.eq(0)
+            cycle += 1
+            yield
+
+    @passive
+    def read_handler(self):
+        axi    = self.axi
+        bursts = deque() # [cycle, addr, beats, size, id].
+        cycle  = 0
+        while True:
+            # Transfers of the current cycle.
+            if (yield axi.ar.valid) and (yield axi.ar.ready):
+                bursts.append([cycle + self.latency, (yield axi.ar.addr), (yield axi.ar.len) + 1, (yield axi.ar.size), (yield axi.ar.id)])
+            if (yield axi.r.valid) and (yield axi.r.ready):
+                burst = bursts[0]
+                burst[1] += 2**burst[3]
+                burst[2] -= 1
+                if burst[2] == 0:
+                    bursts.popleft()
+            # Next cycle.
+            yield axi.ar.ready.eq(len(bursts) < self.max_outstanding)
+            if len(bursts) and bursts[0][0] <= cycle + 1:
+                burst = bursts[0]
+                yield axi.r.valid.eq(1)
+                yield axi.r.data.eq(self.mem.get(burst[1], 0))
+                yield axi.r.last.eq(burst[2] == 1)
+                yield axi.r.id.eq(burst[4])
+            else:
+                yield axi.r.valid.eq(0)
+            cycle += 1
+            yield
+
+# AXI Burst Master ---------------------------------------------------------------------------------
+
+class AXIBurstMaster:
+    """Behavioral AXI master
+
+    Issues bursts INCR bursts of burst_length beats (writes on AW/W/B or reads on AR/R) from base,
+    with up to max_outstanding bursts in flight. cycles is the number of cycles between the first
+    request and the last response.
+    """
+    def __init__(self, axi, write=True, bursts=64, burst_length=16, max_outstanding=8, base=0):
+        self.axi             = axi
+        self.write           = write
+        self.bursts          = bursts
+        self.burst_length    = burst_length
+        self.max_outstanding = max_outstanding
+        self.base            = base
+        self.data_width      = len(axi.w.data)
+        self.issued          = 0
+        self.completed       = 0
+        self.cycles          = 0
+
+    @property
+    def nbytes(self):
+        return self.bursts*self.burst_length*self.data_width//8
+
+    def generators(self):
+        if self.write:
+            return [self.address_generator(self.axi.aw), self.w_generator(), self.response_generator(self.axi.b)]
+        else:
+            return [self.address_generator(self.axi.ar), self.response_generator(self.axi.r)]
+
+    def address_generator(self, channel):
+        size = log2_int(self.data_width//8)
+        while self.issued < self.bursts:
+            if (yield channel.valid) and (yield channel.ready):
+                self.issued += 1
+            valid = (self.issued < self.bursts) and (self.issued - self.completed < self.max_outstanding)
+            yield channel.valid.eq(valid)
+            yield channel.addr.eq(self.base + (self.issued*self.burst_length << size))
+            yield channel.len.eq(self.burst_length - 1)
+            yield channel.size.eq(size)
+            yield channel.burst.eq(0b01) # INCR.
+            yield
+        yield channel.valid.eq(0)
+
+    def w_generator(self):
+        beats = 0
+        while beats < self.bursts*self.burst_length:
+            if (yield self.axi.w.valid) and (yield self.axi.w.ready):
+                beats += 1
+            valid = beats < min(self.issued, self.bursts)*self.burst_length
+            yield self.axi.w.valid.eq(valid)
+            yield self.axi.w.data.eq(beats)
+            yield self.axi.w.strb.eq(2**(self.data_width//8) - 1)
+            yield self.axi.w.last.eq(beats%self.burst_length == (self.burst_length - 1))
+            yield
+        yield self.axi.w.valid.eq(0)
+
+    def response_generator(self, channel):
+        cycles = 0
+        yield channel.ready.eq(1)
+        while self.completed < self.bursts:
+            if (yield channel.valid) and (yield channel.ready) and (self.write or (yield channel.last)):
+                self.completed += 1
+            cycles += 1
+            yield
+        self.cycles = cycles
+
+# LiteDRAM Native Port Model -----------------------------------------------------------------------
+
+class NativePortModel:
+    """Behavioral DRAM channel on a LiteDRAM native port
+
+    Commands are accepted one per cycle (up to max_outstanding in flight). Accessing a row that is
+    not open in its bank stalls the commands for row_miss cycles, refresh stalls them for trfc
+    cycles every trefi cycles. Write data is accepted in command order, read data is returned in
+    command order after latency cycles (without waiting for rdata.ready, as the LiteDRAM crossbar).
+    """
+    def __init__(self, port, latency=16, row_words=128, nbanks=8, row_miss=12, trefi=975, trfc=44,
+        max_outstanding = 16):
+        self.port            = port
+        self.latency         = latency
+        self.row_words       = row_words
+        self.nbanks          = nbanks
+        self.row_miss        = row_miss
+        self.trefi           = trefi
+        self.trfc            = trfc
+        self.max_outstanding = max_outstanding
+        self.mem             = {}
+
+    @passive
+    def handler(self):
+        port      = self.port
+        writes    = deque() # addr.
+        reads     = deque() # [cycle, addr].
+        open_rows = {}
+        stall     = 0
+        cycle     = 0
+        while True:
+            # Transfers of the current cycle.
+            if (yield port.cmd.valid) and (yield port.cmd.ready):
+                addr = (yield port.cmd.addr)
+                bank = (addr//self.row_words)%self.nbanks
+                row  = addr//(self.row_words*self.nbanks)
+                if open_rows.get(bank, None) != row:
+                    open_rows[bank] = row
+                    stall = self.row_miss
+                if (yield port.cmd.we):
+                    writes.append(addr)
+                else:
+                    reads.append([cycle + self.latency, addr])
+            if (yield port.wdata.valid) and (yield port.wdata.ready):
+                self.mem[writes.popleft()] = (yield port.wdata.data)
+            if (yield port.rdata.valid):
+                reads.popleft()
+            # Next cycle.
+            if self.trefi and (cycle%self.trefi == 0):
+                stall = max(stall, self.trfc)
+            stall = max(stall - 1, 0)
+            r_valid = len(reads) > 0 and reads[0][0] <= cycle + 1
+            yield port.cmd.ready.eq((stall == 0) and (len(writes) + len(reads) < self.max_outstanding))
+            yield port.wdata.ready.eq(len(writes) > 0)
+            yield port.rdata.valid.eq(r_valid)
+            yield port.rdata.data.eq(self.mem.get(reads[0][1], 0) if r_valid else 0)
+            cycle += 1
+            yield
+
+# LiteDRAM Native Port Master ----------------------------------------------------------------------
+
+class NativePortMaster:
+    """Behavioral LiteDRAM native port master (DMA)
+
+    Writes (or reads) the given addresses with up to max_outstanding commands in flight. cycles is
+    the number of cycles to complete the transfer, errors the number of read data different from
+    the data written by a write master to the same addresses (data = address).
+    """
+    def __init__(self, port, addresses, write=True, max_outstanding=16):
+        self.port            = port
+        self.addresses       = addresses
+        self.write           = write
+        self.max_outstanding = max_outstanding
+        self.data_width      = len(port.wdata.data)
+        self.issued          = 0
+        self.completed       = 0
+        self.cycles          = 0
+        self.errors          = 0
+
+    @property
+    def nbytes(self):
+        return len(self.addresses)*self.data_width//8
+
+    def generators(self):
+        if self.write:
+            return [self.cmd_generator(), self.wdata_generator()]
+        else:
+            return [self.cmd_generator(), self.rdata_generator()]
+
+    def cmd_generator(self):
+        cmd = self.port.cmd
+        while self.issued < len(self.addresses):
+            if (yield cmd.valid) and (yield cmd.ready):
+                self.issued += 1
+            valid = (self.issued < len(self.addresses)) and (self.issued - self.completed < self.max_outstanding)
+            yield cmd.valid.eq(valid)
+            yield cmd.we.eq(self.write)
+            yield cmd.addr.eq(self.addresses[self.issued] if valid else 0)
+            yield
+        yield cmd.valid.eq(0)
+
+    def wdata_generator(self):
+        wdata  = self.port.wdata
+        cycles = 0
+        while self.completed < len(self.addresses):
+            if (yield wdata.valid) and (yield wdata.ready):
+                self.completed += 1
+            valid = self.completed < self.issued
+            yield wdata.valid.eq(valid)
+            yield wdata.data.eq(self.addresses[self.completed] if valid else 0)
+            yield wdata.we.eq(2**(self.data_width//8) - 1)
+            cycles += 1
+            yield
+        yield wdata.valid.eq(0)
+        self.cycles = cycles
+
+    def rdata_generator(self):
+        rdata  = self.port.rdata
+        cycles = 0
+        yield rdata.ready.eq(1)
+        while self.completed < len(self.addresses):
+            if (yield rdata.valid) and (yield rdata.ready):
+                if (yield rdata.data) != self.addresses[self.completed]:
+                    self.errors += 1
+                self.completed += 1
+            cycles += 1
+            yield
+        self.cycles = cycles
+
+# PCIe PHY/Host Model ------------------------------------------------------------------------------
+
+class PCIePHYModel:
+    """Behavioral PCIe PHY and Host (Root Complex) memory
+
+    Exposes the interface of the LitePCIe PHYs (TLP streams, data_width, endianness, bar0_mask,
+    id, max_request_size/max_payload_size) to a LitePCIeEndpoint. Memory Write requests are stored
+    in the host memory, Memory Read requests are completed after latency cycles with completions
+    split on completion_size boundaries. TLPs are transferred one beat per cycle in each direction:
+    models a link sustaining the full bandwidth of the PHY's data width.
+
+    The host memory stores the dwords as transferred on the TLP streams: data written by a DMA
+    Writer can be compared to the data read by a DMA Reader regardless of the PHY's endianness.
+    """
+    def __init__(self, data_width=64, endianness="big", bar0_size=0x100000, latency=64,
+        max_request_size = 512,
+        max_payload_size = 256,
+        completion_size  = 128):
+        from litex.soc.interconnect import stream
+        from litepcie.common import get_bar_mask, phy_layout
+        self.sink             = stream.Endpoint(phy_layout(data_width))
+        self.source           = stream.Endpoint(phy_layout(data_width))
+        self.data_width       = data_width
+        self.endianness       = endianness
+        self.bar0_mask        = get_bar_mask(bar0_size)
+        self.id               = Signal(16)
+        self.max_request_size = Signal(16, reset=max_request_size)
+        self.max_payload_size = Signal(16, reset=max_payload_size)
+        self.latency          = latency
+        self.completion_size  = completion_size
+        self.mem              = {} # Host memory (dword address: dword).
+        self.writes           = [] # (cycle, address, nbytes) of the Memory Write requests.
+        self.reads            = [] # (cycle, address, nbytes) of the Memory Read requests.
+        self.completions      = deque() # (cycle, [dwords]).
+
+    def generators(self):
+        return [self.rx_handler(), self.tx_handler()]
+
+    def _completions(self, cycle, address, nbytes, requester_id, tag):
+        # Split the completions of a read request on completion_size boundaries.
+        while nbytes:
+            length = min(nbytes, self.completion_size - address%self.completion_size)
+            header = [
+                (0b10 << 29) | (0b01010 << 24) | ((length//4) & 0x3ff),
+                nbytes & 0xfff,
+                (requester_id << 16) | (tag << 8) | (address & 0x7f),
+            ]
+            data = [self.mem.get(address//4 + i, 0) for i in range(length//4)]
+            self.completions.append((cycle + self.latency, header + data))
+            address += length
+            nbytes  -= length
+
+    @passive
+    def rx_handler(self):
+        # TLPs from the FPGA.
+        sink   = self.sink
+        ndw    = self.data_width//32
+        dwords = []
+        cycle  = 0
+        yield sink.ready.eq(1)
+        while True:
+            if (yield sink.valid):
+                dat = (yield sink.dat)
+                dwords += [(dat >> 32*i) & 0xffffffff for i in range(ndw)]
+                if (yield sink.last):
+                    fmt     = (dwords[0] >> 29) & 0b11
+                    nbytes  = 4*((dwords[0] & 0x3ff) or 1024)
+                    address = dwords[3 if (fmt & 0b01) else 2] & 0xfffffffc
+                    if fmt & 0b10:
+                        # Memory Write.
+                        data = dwords[4 if (fmt & 0b01) else 3:]
+                        for i in range(nbytes//4):
+                            self.mem[address//4 + i] = data[i]
+                        self.writes.append((cycle, address, nbytes))
+                    else:
+                        # Memory Read.
+                        self.reads.append((cycle, address, nbytes))
+                        self._completions(cycle, address, nbytes,
+                            requester_id = dwords[1] >> 16,
+                            tag          = (dwords[1] >> 8) & 0xff)
+                    dwords = []
+            cycle += 1
+            yield
+
+    @passive
+    def tx_handler(self):
+        # Completions to the FPGA.
+        source = self.source
+        ndw    = self.data_width//32
+        beats  = deque()
+        cycle  = 0
+        while True:
+            if (yield source.valid) and (yield source.ready):
+                beats.popleft()
+            if not beats and len(self.completions) and self.completions[0][0] <= cycle + 1:
+                dwords = self.completions.popleft()[1]
+                for i in range(0, len(dwords), ndw):
+                    beat = dwords[i:i + ndw]
+                    beats.append((
+                        sum(dw << 32*n for n, dw in enumerate(beat)),
+                        2**(4*len(beat)) - 1,
+                        i == 0,
+                        i + ndw >= len(dwords)))
+            # Next cycle.
+            if beats:
+                dat, be, first, last = beats[0]
+                yield source.valid.eq(1)
+                yield source.dat.eq(dat)
+                yield source.be.eq(be)
+                yield source.first.eq(first)
+                yield source.last.eq(last)
+            else:
+                yield source.valid.eq(0)
+            cycle += 1
+            yield
+
+# Asynchronous SRAM Model --------------------------------------------------------------------------
+
+class AsyncSRAMModel(Module):
+    """Behavioral asynchronous SRAM (OE tied low)
+
+    Zero-delay model: reads return the data at addr when selected (CE low, WE high), writes are
+    done on each cycle with CE and WE low (the last one wins). The tAA/tWC timings are ensured by
+    the controllers' cycles. contentions counts the cycles with the data bus driven by both the
+    SRAM and the controller.
+
+    pads: addr, cen, wen (in), data_i (out), data_o/data_oe (in).
+    """
+    def __init__(self, pads, size):
+        self.mem         = mem = Memory(len(pads.data_i), size)
+        self.contentions = Signal(32)
+        self.specials += mem
+        rport = mem.get_port(async_read=True)
+        wport = mem.get_port(write_capable=True)
+        self.specials += rport, wport
+        self.comb += [
+            rport.adr.eq(pads.addr),
+            If(~pads.cen & pads.wen,
+                pads.data_i.eq(rport.dat_r)
+            ),
+            wport.adr.eq(pads.addr),
+            wport.dat_w.eq(pads.data_o),
+            wport.we.eq(~pads.cen & ~pads.wen),
+        ]
+        self.sync += If(~pads.cen & pads.wen & pads.data_oe, self.contentions.eq(self.contentions + 1))
+
+# CellularRAM Model --------------------------------------------------------------------------------
+
+class CellularRAMModel(Module):
+    """Behavioral CellularRAM (MT45W8MW16BGX)
+
+    Zero-delay model of the asynchronous accesses (as AsyncSRAMModel, with LB/UB byte masks and OE)
+    and of the synchronous burst reads enabled by a BCR write (CRE high): the address is latched on
+    the CLK rising edge with ADV low, the words of the (wrapping) burst are then launched on the
+    following rising edges after the latency code (+ the latency code on refresh collisions, every
+    collision_period bursts, in variable latency, flagged by WAIT).
+
+    pads: addr, cen, wen, oen, adv, cre, clk, lb, ub (in), wait/data_i (out), data_o/data_oe (in).
+    """
+    def __init__(self, pads, size, collision_period=4):
+        self.mem         = mem = Memory(len(pads.data_i), size)
+        self.bcr         = bcr = Signal(20, reset=0x9d1f)
+        self.contentions = Signal(32)
+        self.specials += mem
+        rport = mem.get_port(async_read=True)
+        wport = mem.get_port(write_capable=True, we_granularity=8)
+        self.specials += rport, wport
+
+        # # #
+
+        addr        = pads.addr[:log2_int(size)]
+        selected    = ~pads.cen
+        sync_mode   = ~bcr[15]
+        fixed       = bcr[14]
+        code        = bcr[11:14]
+        clk_d       = Signal()
+        rising      = Signal()
+        burst_adr   = Signal(len(addr))
+        edges       = Signal(8)
+        bursts      = Signal(max=collision_period)
+        latency     = Signal(8)
+        mask        = Signal(len(addr))
+        data_valid  = Signal()
+        self.sync += clk_d.eq(pads.clk)
+        self.comb += [
+            rising.eq(pads.clk & ~clk_d),
+            Case(bcr[:3], {
+                0b001     : mask.eq(4  - 1),
+                0b010     : mask.eq(8  - 1),
+                0b011     : mask.eq(16 - 1),
+                0b100     : mask.eq(32 - 1),
+                "default" : mask.eq(2**len(addr) - 1),
+            }),
+            data_valid.eq(edges >= latency),
+        ]
+
+        # Synchronous burst reads.
+        self.sync += If(sync_mode & selected & rising,
+            If(~pads.adv,
+                burst_adr.eq(addr),
+                edges.eq(0),
+                bursts.eq(bursts + 1),
+                If(bursts == (collision_period - 1),
+                    bursts.eq(0)
+                ),
+                If(~fixed & (bursts == 0),
+                    latency.eq(2*code)
+                ).Else(
+                    latency.eq(code)
+                )
+            ).Else(
+                edges.eq(edges + 1)
+            )
+        )
+        self.comb += [
+            If(sync_mode,
+                rport.adr.eq((burst_adr & ~mask) | ((burst_adr + edges - latency) & mask)),
+                If(selected, pads.wait.eq(~data_valid)),
+                If(selected & pads.wen & ~pads.oen & data_valid,
+                    pads.data_i.eq(rport.dat_r)
+                )
+            ).Else(
+                rport.adr.eq(addr),
+                If(selected & pads.wen & ~pads.oen,
+                    pads.data_i.eq(rport.dat_r)
+                )
+            )
+        ]
+
+        # Asynchronous writes (array or BCR).
+        self.comb += [
+            wport.adr.eq(addr),
+            wport.dat_w.eq(pads.data_o),
+            If(selected & ~pads.wen & ~pads.cre,
+                wport.we.eq(Cat(~pads.lb, ~pads.ub))
+            )
+        ]
+        self.sync += [
+            If(selected & ~pads.wen & pads.cre & (pads.addr[18:20] == 0b10),
+                bcr.eq(pads.addr[:20])
+            ),
+            If(selected & pads.wen & ~pads.oen & pads.data_oe,
+                self.contentions.eq(self.contentions + 1)
+            )
+        ]
+
+# HyperRAM Model -----------------------------------------------------------------------------------
+
+class HyperRAMModel(Module):
+    """Behavioral 8-bit HyperRAM (fixed latency)
+
+    Zero-delay model: the Command/Address is captured on the first 6 CK edges with CS# low, the
+    bytes of the (linear) burst are then written/launched on each CK edge after the fixed latency
+    (2 x latency clocks), the first byte of each 16-bit word being its MSB. RWDS masks the written
+    bytes.
+
+    pads: clk, cs_n, dq_o, dq_oe, rwds_o (in), dq_i (out).
+    """
+    def __init__(self, pads, size, latency=6):
+        self.pads = pads
+        self.mem  = mem = Memory(16, size//2)
+        self.specials += mem
+        rport = mem.get_port(async_read=True)
+        wport = mem.get_port(write_capable=True, we_granularity=8)
+        self.specials += rport, wport
+
+        # # #
+
+        data_edge = 4*latency + 4 # CA (6 edges) + 2 x latency clocks (from the middle of the CA).
+        clk_d     = Signal()
+        edge      = Signal()
+        edges     = Signal(16)
+        ca        = Signal(48)
+        index     = Signal(16)
+        active    = Signal()
+        self.sync += clk_d.eq(pads.clk)
+        self.comb += [
+            edge.eq(~pads.cs_n & (pads.clk != clk_d)),
+            index.eq(edges - data_edge),
+            active.eq(edges >= data_edge),
+        ]
+        self.sync += [
+            If(pads.cs_n,
+                edges.eq(0)
+            ).Elif(edge,
+                edges.eq(edges + 1),
+                If(edges < 6,
+                    ca.eq(Cat(pads.dq_o, ca[:-8]))
+                )
+            )
+        ]
+
+        # Linear bursts from the CA word address (MSB first).
+        self.comb += [
+            rport.adr.eq(Cat(ca[0:3], ca[16:45]) + index[1:]),
+            wport.adr.eq(rport.adr),
+            wport.dat_w.eq(Cat(pads.dq_o, pads.dq_o)),
+            If(edge & active & ~ca[47] & ~pads.rwds_o,
+                wport.we.eq(Mux(index[0], 0b01, 0b10))
+            )
+        ]
+        self.sync += If(edge & active & ca[47],
+            pads.dq_i.eq(Mux(index[0], rport.dat_r[:8], rport.dat_r[8:]))
+        )
+
+# SPI Flash Model ----------------------------------------------------------------------------------
+
+class SPIFlashModel:
+    """Behavioral SPI Flash behind a LiteSPI MMAP (Wishbone slave)
+
+    Reads are acknowledged after the SPI transfers of the LiteSPI MMAP: command (1-bit), address
+    (24-bit on addr_width lanes), dummy bits and 32-bit data (on bus_width lanes) at sys_clk/(2*(1 +
+    div)), plus the CS# delay and the stream handshakes. Sequential reads within timeout cycles
+    continue the burst (data only). The data of each word is returned by init(adr).
+    """
+    def __init__(self, bus, init, bus_width=1, addr_width=1, dummy_bits=0, div=1, cs_delay=10,
+        timeout = 256):
+        spi_clk          = 2*(1 + div)
+        self.bus         = bus
+        self.init        = init
+        self.cmd_cycles  = cs_delay + spi_clk*(8 + 24//addr_width + dummy_bits) + 6
+        self.word_cycles = spi_clk*(32//bus_width) + 3
+        self.timeout     = timeout
+        self.reads       = 0
+        self.commands    = 0
+
+    @passive
+    def handler(self):
+        bus       = self.bus
+        burst_adr = None
+        idle      = 0
+        while True:
+            if (yield bus.cyc) and (yield bus.stb):
+                adr     = (yield bus.adr)
+                latency = 1
+                if not (yield bus.we):
+                    latency = self.word_cycles
+                    if (adr != burst_adr) or (idle >= self.timeout):
+                        latency += self.cmd_cycles
+                        self.commands += 1
+                    self.reads += 1
+                for i in range(latency - 1):
+                    yield
+                yield bus.dat_r.eq(self.init(adr))
+                yield bus.ack.eq(1)
+                yield
+                yield bus.ack.eq(0)
+                burst_adr = adr + 1
+                idle      = 0
+            else:
+                idle += 1
+            yield
+
+# RV32IM Model -------------------------------------------------------------------------------------
+
+class RV32IMModel:
+    """Instruction set model of a RV32IM CPU (no CSRs/traps)
+
+    Runs a binary (Intel HEX, ex: the VexRiscv regression programs) from its first address, returning
+    the instruction fetch and load addresses to replay them through the timing models. Accesses
+    outside of the memory (IOs) are ignored (loads return 0), stop_adr stops the execution on a
+    store (ex: end of the program).
+    """
+    def __init__(self, filename, mem_size=0x10000, stop_adr=None):
+        self.mem      = {}
+        self.stop_adr = stop_adr
+        self.load_ihex(filename)
+        self.base     = min(self.mem)
+        self.end      = self.base + mem_size
+        self.pc       = self.base
+        self.x        = [0]*32
+
+    def load_ihex(self, filename):
+        base = 0
+        with open(filename) as f:
+            for line in f:
+                line = line.strip()
+                if not line.startswith(":"):
+                    continue
+                data = bytes.fromhex(line[1:])
+                n, adr, typ = data[0], (data[1] << 8) | data[2], data[3]
+                if typ == 0x00:
+                    for i in range(n):
+                        self.mem[base + adr + i] = data[4 + i]
+                elif typ == 0x04:
+                    base = ((data[4] << 8) | data[5]) << 16
+
+    def read(self, adr, size):
+        if not (self.base <= adr < self.end):
+            return 0
+        return sum(self.mem.get(adr + i, 0) << 8*i for i in range(size))
+
+    def write(self, adr, size, value):
+        if self.base <= adr < self.end:
+            for i in range(size):
+                self.mem[adr + i] = (value >> 8*i) & 0xff
+
+    def run(self):
+        """Generator of the accesses: ("fetch", adr), ("load", adr) and ("store", adr)."""
+        sext = lambda v, n: v - (1 << n) if v & (1 << (n - 1)) else v
+        s32  = lambda v: sext(v & 0xffffffff, 32)
+        x    = self.x
+        while True:
+            pc = self.pc
+            yield ("fetch", pc)
+            i      = self.read(pc, 4)
+            op     = i & 0x7f
+            rd     = (i >>  7) & 0x1f
+            f3     = (i >> 12) & 0x7
+            rs1    = x[(i >> 15) & 0x1f]
+            rs2    = x[(i >> 20) & 0x1f]
+            f7     = i >> 25
+            imm_i  = sext(i >> 20, 12)
+            imm_s  = sext(((i >> 20) & 0xfe0) | ((i >> 7) & 0x1f), 12)
+            imm_b  = sext(((i >> 19) & 0x1000) | ((i << 4) & 0x800) | ((i >> 20) & 0x7e0) | ((i >> 7) & 0x1e), 13)
+            imm_j  = sext(((i >> 11) & 0x100000) | (i & 0xff000) | ((i >> 9) & 0x800) | ((i >> 20) & 0x7fe), 21)
+            next_pc = pc + 4
+            value   = None
+            if op == 0x37:   # LUI.
+                value = i & 0xfffff000
+            elif op == 0x17: # AUIPC.
+                value = pc + (i & 0xfffff000)
+            elif op == 0x6f: # JAL.
+                value, next_pc = pc + 4, pc + imm_j
+            elif op == 0x67: # JALR.
+                value, next_pc = pc + 4, (rs1 + imm_i) & 0xfffffffe
+            elif op == 0x63: # Branches.
+                a, b = s32(rs1), s32(rs2)
+                taken = {0: a == b, 1: a != b, 4: a < b, 5: a >= b,
+                    6: rs1 < rs2, 7: rs1 >= rs2}[f3]
+                if taken:
+                    next_pc = pc + imm_b
+            elif op == 0x03: # Loads.
+                adr = (rs1 + imm_i) & 0xffffffff
+                yield ("load", adr)
+                size  = 1 << (f3 & 0x3)
+                value = self.read(adr, size)
+                if not (f3 & 0x4):
+                    value = sext(value, 8*size)
+            elif op == 0x23: # Stores.
+                adr = (rs1 + imm_s) & 0xffffffff
+                yield ("store", adr)
+                if adr == self.stop_adr:
+                    return
+                self.write(adr, 1 << f3, rs2)
+            elif op in [0x13, 0x33]: # ALU (Immediate/Register).
+                b = imm_i if op == 0x13 else rs2
+                if op == 0x33 and f7 == 0x01: # M extension.
+                    a, b = s32(rs1), s32(rs2)
+                    if f3 == 0:
+                        value = a*b
+                    elif f3 in [1, 2, 3]:
+                        value = {1: a*b, 2: a*(rs2 & 0xffffffff), 3: rs1*rs2}[f3] >> 32
+                    elif f3 == 4:
+                        value = -1 if b == 0 else (abs(a)//abs(b))*(1 if (a < 0) == (b < 0) else -1)
+                    elif f3 == 5:
+                        value = 0xffffffff if rs2 == 0 else rs1//rs2
+                    elif f3 == 6:
+                        value = a if b == 0 else a - b*((abs(a)//abs(b))*(1 if (a < 0) == (b < 0) else -1))
+                    else:
+                        value = rs1 if rs2 == 0 else rs1%rs2
+                else:
+                    shamt = b & 0x1f
+                    sub   = (op == 0x33) and (f7 == 0x20)
+                    value = {
+                        0: rs1 - b if sub else rs1 + b,
+                        1: rs1 << shamt,
+                        2: int(s32(rs1) < s32(b)),
+                        3: int(rs1 < (b & 0xffffffff)),
+                        4: rs1 ^ b,
+                        5: (s32(rs1) >> shamt) if (f7 & 0x20) else (rs1 >> shamt),
+                        6: rs1 | b,
+                        7: rs1 & b,
+                    }[f3]
+            # Others (FENCE/SYSTEM): NOP.
+            if value is not None and rd != 0:
+                x[rd] = value & 0xffffffff
+            self.pc = next_pc & 0xffffffff
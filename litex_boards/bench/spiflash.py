@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# SPI Flash XIP simulation benchmark: compares the code execution from SPI Flash (iCE40/Tang Nano
+# XIP targets) without and with the SPIFlashPrefetcher (litex_boards.cores.spiflash), with/without
+# next-line prefetch, behind a CPU instruction fetch model (1 instruction/cycle, optional
+# direct-mapped I-Cache refilled by 32-byte bursts as VexRiscv) and a LiteSPI MMAP timing model.
+# The first iteration runs with cold caches/prefetcher, the speedup is given on the last one.
+#
+# Programs:
+# - calls/loops: synthetic programs (a call graph of small functions and a set of loop nests, with
+#   gaps between the functions), only exercising the fetch patterns.
+# - dhrystone: the Dhrystone binary of the VexRiscv regression (dhrystoneO3M.hex: RV32IM, -O3, from
+#   pythondata-cpu-vexriscv) executed by an instruction set model (RV32IMModel), one iteration being
+#   one Dhrystone run in steady state (instruction fetches and .rodata loads from the Flash). Warm
+#   cycles give the DMIPS/MHz: 1e6/(1757*cycles).
+#
+# The CPU remains a fetch model (not the VexRiscv RTL, no litex_sim run): the results are relative
+# speedups of the Flash accesses. CoreMark is not run (the VexRiscv CoreMark binaries are RV32IMC,
+# compressed instructions are not supported by the model).
+#
+# Ex: python3 -m litex_boards.bench.spiflash --icache-sizes=0,2048 --flash-modes=1x,4x --lines=32,128
+
+import os
+import argparse
+
+from migen import *
+
+from litex.soc.interconnect import wishbone
+
+from litex_boards.cores.spiflash import SPIFlashPrefetcher
+from litex_boards.bench.sim import SPIFlashModel, RV32IMModel
+from litex_boards.bench.sram import wishbone_burst
+
+# Synthetic Programs -------------------------------------------------------------------------------
+
+# Functions in Flash order: (name, body) or ("pad", words) for the code between the functions.
+# Body: ("seq", n) instructions, ("call", function) or ("loop", count, body) (+1 branch).
+
+calls = [
+    ("main", [("seq", 24), ("call", "f5"), ("call", "f4"), ("seq", 18), ("call", "f12"),
+        ("seq", 6), ("call", "f10"), ("seq", 10), ("loop", 1, [("seq", 8), ("call", "f7")]),
+        ("seq", 6), ("call", "f8"), ("seq", 4), ("call", "f1"),
+        ("loop", 2, [("seq", 6), ("call", "f9"), ("seq", 4)]), ("seq", 12), ("call", "f2"),
+        ("seq", 10)]),
+    ("f1", [("seq", 22), ("call", "f3"), ("seq", 10), ("call", "f6"), ("seq", 8),
+        ("call", "f7"), ("seq", 12)]),
+    ("f2", [("seq", 10)]),
+    ("f3", [("seq", 8), ("call", "f7"), ("seq", 4)]),
+    ("f4", [("seq", 10)]),
+    ("f5", [("seq", 6)]),
+    ("f6", [("seq", 14), ("call", "f11"), ("seq", 10)]),
+    ("f7", [("seq", 5)]),
+    ("f8", [("seq", 12), ("loop", 2, [("seq", 6)]), ("seq", 12)]),
+    ("f9", [("seq", 8)]),
+    ("f10", [("seq", 8), ("loop", 1, [("seq", 4), ("call", "f9"), ("seq", 6)]), ("seq", 4),
+        ("call", "f13"), ("seq", 8)]),
+    ("f11", [("seq", 5)]),
+    ("pad", 1024),
+    ("f12", [("seq", 4), ("loop", 30, [("seq", 5)]), ("seq", 2)]),
+    ("pad", 64),
+    ("f13", [("seq", 6), ("loop", 20, [("seq", 7)]), ("seq", 6)]),
+]
+
+def _loop_nest(n, inner):
+    return [("seq", 6), ("loop", n, [("seq", 3), ("loop", n, inner), ("seq", 2)]), ("seq", 2)]
+
+loops = [
+    ("main", [("seq", 10), ("call", "l1"), ("seq", 6), ("call", "l7"),
+        ("seq", 6), ("call", "l14"), ("seq", 6), ("call", "l17"), ("seq", 8)]),
+    ("pad", 128),
+    ("l1", [("seq", 30), ("loop", 2, [("seq", 14), ("call", "l2"),
+        ("call", "l3"), ("seq", 10)]), ("call", "l4"), ("seq", 20),
+        ("call", "l17"), ("seq", 10)]),
+    ("l2", [("seq", 6), ("loop", 12, [("seq", 6)]), ("seq", 4)]),
+    ("l3", [("seq", 4), ("loop", 12, [("seq", 5)]), ("seq", 2)]),
+    ("l4", [("seq", 20), ("loop", 2, [("seq", 12), ("loop", 4, [("seq", 16),
+        ("call", "l5"), ("seq", 12)]), ("seq", 10)]), ("seq", 8)]),
+    ("l5", [("seq", 10), ("call", "l6"), ("seq", 4), ("call", "l6"), ("seq", 6)]),
+    ("l6", [("seq", 14)]),
+    ("pad", 256),
+    ("l7", [("seq", 12), ("call", "l10"), ("call", "l9"),
+        ("call", "l8"), ("call", "l11"), ("call", "l8"),
+        ("call", "l12"), ("call", "l8"), ("call", "l13"),
+        ("call", "l8"), ("seq", 10), ("call", "l18"), ("seq", 4)]),
+    ("l8",  _loop_nest(3, [("seq", 12)])),
+    ("l9",  _loop_nest(3, [("seq",  7)])),
+    ("l10", _loop_nest(3, [("seq",  6)])),
+    ("l11", _loop_nest(3, [("seq",  8)])),
+    ("l12", _loop_nest(2, [("seq",  4), ("loop", 2, [("seq",  9)]), ("seq", 3)])),
+    ("l13", _loop_nest(2, [("seq",  4), ("loop", 2, [("seq", 16)]), ("seq", 3)])),
+    ("pad", 256),
+    ("l14", [("seq", 20), ("loop", 8, [("seq", 4), ("call", "l15"),
+        ("seq", 6)]), ("seq", 16), ("loop", 8, [("seq", 8)]), ("seq", 10)]),
+    ("l15", [("seq", 14), ("loop", 3, [("seq", 22)]), ("seq", 10)]),
+    ("pad", 512),
+    ("l16", [("seq", 4), ("loop", 8, [("seq", 9)]), ("seq", 2)]),
+    ("l17", [("seq", 4), ("call", "l16"), ("call", "l16"), ("seq", 2)]),
+    ("l18", [("seq", 3), ("call", "l17"), ("seq", 2)]),
+]
+
+programs = {"calls": calls, "loops": loops}
+
+def _size(body):
+    return sum({"seq": lambda e: e[1], "call": lambda e: 1, "loop": lambda e: _size(e[2]) + 1}[e[0]](e)
+        for e in body)
+
+def program_trace(program, base=0):
+    """Instruction word addresses of one iteration of the program (first function)."""
+    functions = {}
+    adr       = base
+    for name, body in program:
+        if name == "pad":
+            adr += body
+        else:
+            functions[name] = (adr, body)
+            adr += _size(body)
+    trace = []
+    def execute(body, pc):
+        for e in body:
+            if e[0] == "seq":
+                trace.extend(range(pc, pc + e[1]))
+                pc += e[1]
+            elif e[0] == "call":
+                trace.append(pc)
+                execute(functions[e[1]][1], functions[e[1]][0])
+                pc += 1
+            else:
+                for i in range(e[1]):
+                    execute(e[2], pc)
+                    trace.append(pc + _size(e[2]))
+                pc += _size(e[2]) + 1
+    execute(*reversed(functions[program[0][0]]))
+    return trace
+
+# Dhrystone ----------------------------------------------------------------------------------------
+
+def dhrystone_trace(base=0):
+    """Instruction fetch word addresses and ("load", word address) Flash (.rodata) loads of one
+    Dhrystone run (between the 2nd and 3rd calls of the first function called in the loop)."""
+    from litex import get_data_mod
+    filename = os.path.join(get_data_mod("cpu", "vexriscv").data_location,
+        "ext", "VexRiscv", "src", "test", "resources", "hex", "dhrystoneO3M.hex")
+    cpu    = RV32IMModel(filename, stop_adr=0xf00fff20)
+    image  = set(cpu.mem) # Bytes of the binary.
+    stores = set()
+    trace  = []
+    clock  = False # Begin_Time = clock() done.
+    entry  = None  # First function called in the loop.
+    runs   = 0
+    prev   = None
+    word   = lambda adr: base + (adr - cpu.base)//4
+    for kind, adr in cpu.run():
+        if kind == "fetch":
+            call = (prev is not None) and (cpu.read(prev, 4) & 0xfff) == 0x0ef # JAL ra.
+            if clock and entry is None and call:
+                entry = adr
+            if adr == entry:
+                runs += 1
+                if runs == 3:
+                    break
+            if runs == 2:
+                trace.append(word(adr))
+            prev = adr
+        elif kind == "load":
+            clock |= (adr == 0xf00fff10)
+            if runs == 2 and adr in image and adr//4 not in stores:
+                trace.append(("load", word(adr)))
+        else:
+            stores.add(adr//4)
+    return trace
+
+def get_trace(program, base=0):
+    if program == "dhrystone":
+        return dhrystone_trace(base)
+    return program_trace(programs[program], base)
+
+# Bench --------------------------------------------------------------------------------------------
+
+flash_modes = {
+    "1x": dict(bus_width=1, addr_width=1, dummy_bits=0), # READ_1_1_1.
+    "2x": dict(bus_width=2, addr_width=1, dummy_bits=8), # READ_1_1_2.
+    "4x": dict(bus_width=4, addr_width=1, dummy_bits=8), # READ_1_1_4.
+}
+
+def run_bench(program, icache_size=0, flash_mode="1x", nlines=0, prefetch=True, iterations=2,
+    line_words = 8):
+    """Run the iterations, returns the cycles of the first (cold) and last (warm) iterations and the
+    flash commands of the last iteration."""
+    flash_data = lambda adr: (adr*2654435761) & 0xffffffff
+    slave      = wishbone.Interface(adr_width=22)
+    dut        = Module()
+    bus        = slave
+    if nlines:
+        dut.submodules.prefetcher = SPIFlashPrefetcher(slave, nlines=nlines, line_words=line_words,
+            prefetch = prefetch)
+        bus = dut.prefetcher.bus
+    flash   = SPIFlashModel(slave, flash_data, **flash_modes[flash_mode])
+    trace   = get_trace(program, base=0x10000)
+    results = {"errors": 0, "cycles": [], "commands": []}
+    cycle   = [0]
+
+    def cpu():
+        icache = {}
+        for n in range(iterations):
+            start    = (cycle[0], flash.commands)
+            for adr in trace:
+                # Data load (not cached).
+                if isinstance(adr, tuple):
+                    r = yield from wishbone_burst(bus, adr[1], 1)
+                    results["errors"] += (r[0] != flash_data(adr[1]))
+                # Direct-mapped I-Cache (refilled by line bursts).
+                elif icache_size:
+                    line  = adr//line_words
+                    index = line%(icache_size//(4*line_words))
+                    if icache.get(index, None) != line:
+                        r = yield from wishbone_burst(bus, line*line_words, line_words)
+                        results["errors"] += sum(r[i] != flash_data(line*line_words + i) for i in range(line_words))
+                        icache[index] = line
+                    yield
+                # No I-Cache: one fetch per instruction.
+                else:
+                    r = yield from wishbone_burst(bus, adr, 1)
+                    results["errors"] += (r[0] != flash_data(adr))
+            results["cycles"].append(cycle[0] - start[0])
+            results["commands"].append(flash.commands - start[1])
+
+    @passive
+    def counter():
+        while True:
+            cycle[0] += 1
+            yield
+
+    run_simulation(dut, [cpu(), flash.handler(), counter()])
+    instructions = sum(not isinstance(adr, tuple) for adr in trace)
+    return results["cycles"][0], results["cycles"][-1], results["commands"][-1], results["errors"], instructions
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="SPI Flash XIP simulation benchmark.")
+    parser.add_argument("--programs",     default="calls,loops,dhrystone", help="Programs (calls, loops, dhrystone) to run (comma separated).")
+    parser.add_argument("--icache-sizes", default="0,2048",             help="CPU I-Cache sizes (bytes, 0: none) to sweep (comma separated).")
+    parser.add_argument("--flash-modes",  default="1x",                 help="SPI Flash modes (1x, 2x, 4x) to sweep (comma separated).")
+    parser.add_argument("--lines",        default="32",                 help="Prefetcher lines (32-byte) to sweep (comma separated).")
+    parser.add_argument("--iterations",   default=2, type=int,          help="Iterations (the first one cold, the last one warm).")
+    args = parser.parse_args()
+
+    print(f"{'Program':10s} {'I-Cache':>8s} {'Flash':>6s} {'Prefetcher':>18s} {'Instructions':>13s} {'Cold Cycles':>12s} {'Warm Cycles':>12s} {'Flash Cmds':>11s} {'Speedup':>8s} {'Errors':>7s}")
+    for program in args.programs.split(","):
+        for icache_size in [int(s) for s in args.icache_sizes.split(",")]:
+            for flash_mode in args.flash_modes.split(","):
+                configs = [(0, False)]
+                for nlines in [int(n) for n in args.lines.split(",")]:
+                    configs += [(nlines, False), (nlines, True)]
+                reference = None
+                for nlines, prefetch in configs:
+                    cold, cycles, commands, errors, instructions = run_bench(program,
+                        icache_size = icache_size,
+                        flash_mode  = flash_mode,
+                        nlines      = nlines,
+                        prefetch    = prefetch,
+                        iterations  = args.iterations)
+                    reference  = cycles if reference is None else reference
+                    prefetcher = "none" if not nlines else f"{nlines} lines" + (" + next" if prefetch else "")
+                    print(f"{program:10s} {icache_size:8d} {flash_mode:>6s} {prefetcher:>18s} {instructions:13d} "
+                          f"{cold:12d} {cycles:12d} {commands:11d} {reference/cycles:8.2f} {errors:7d}", flush=True)
+
+if __name__ == "__main__":
+    main()
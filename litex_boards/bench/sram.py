@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Asynchronous SRAM simulation benchmark: compares the throughput of the 32-bit AsyncSRAM controller
+# (litex_boards.cores.sram, CmodA7/Mercury2) with the previous 8-bit Wishbone controller behind a
+# 32-bit to 8-bit Wishbone converter, on a behavioral SRAM model, for single word writes/reads and
+# cache line refills (incrementing bursts).
+#
+# Ex: python3 -m litex_boards.bench.sram --sys-clk-freq=48e6,100e6
+
+import random
+import argparse
+
+from migen import *
+
+from litex.soc.interconnect import wishbone
+
+from litex_boards.cores.sram import AsyncSRAM
+from litex_boards.bench.sim import AsyncSRAMModel
+
+# Previous Controller ------------------------------------------------------------------------------
+
+class LegacyAsyncSRAM(Module):
+    """Previous CmodA7/Mercury2 controller: 8-bit Wishbone (ack every other cycle) + converter."""
+    def __init__(self, pads, size):
+        self.bus = wishbone.Interface(data_width=32, adr_width=log2_int(size//4))
+        bus8     = wishbone.Interface(data_width=8, adr_width=log2_int(size))
+        self.submodules.converter = wishbone.Converter(self.bus, bus8)
+
+        # # #
+
+        chip_ena  = bus8.cyc & bus8.stb & bus8.sel[0]
+        write_ena = chip_ena & bus8.we
+        self.comb += [
+            pads.cen.eq(~chip_ena),
+            pads.wen.eq(~write_ena),
+            pads.data_oe.eq(write_ena),
+            pads.addr.eq(bus8.adr),
+            pads.data_o.eq(bus8.dat_w),
+            bus8.dat_r.eq(pads.data_i),
+        ]
+        self.sync += bus8.ack.eq(bus8.cyc & bus8.stb & ~bus8.ack)
+
+# Bench --------------------------------------------------------------------------------------------
+
+def sram_pads(size):
+    return Record([("addr", log2_int(size)), ("cen", 1), ("wen", 1),
+        ("data_o", 8), ("data_i", 8), ("data_oe", 1)])
+
+class SRAMBench(Module):
+    def __init__(self, controller, size, sys_clk_freq):
+        pads = sram_pads(size)
+        self.submodules.model = AsyncSRAMModel(pads, size)
+        if controller == "legacy":
+            self.submodules.sram = LegacyAsyncSRAM(pads, size)
+        else:
+            self.submodules.sram = AsyncSRAM(pads, size, sys_clk_freq)
+
+def wishbone_burst(bus, adr, n, we=False, data=None):
+    """Wishbone access of n consecutive words (incrementing burst when n > 1), returns read data."""
+    r = []
+    yield bus.cyc.eq(1)
+    yield bus.stb.eq(1)
+    yield bus.we.eq(we)
+    yield bus.sel.eq(0b1111)
+    for i in range(n):
+        yield bus.adr.eq(adr + i)
+        yield bus.cti.eq(0b000 if n == 1 else (0b010 if i < (n - 1) else 0b111))
+        if we:
+            yield bus.dat_w.eq(data[i])
+        yield
+        while not (yield bus.ack):
+            yield
+        r.append((yield bus.dat_r))
+    yield bus.cyc.eq(0)
+    yield bus.stb.eq(0)
+    yield
+    return r
+
+def run_bench(controller, sys_clk_freq, words=256, line_words=8, size=64*1024):
+    """Run the accesses, returns {access: bytes/cycle} and the errors/contentions."""
+    dut     = SRAMBench(controller, size, sys_clk_freq)
+    bus     = dut.sram.bus
+    prng    = random.Random(42)
+    data    = [prng.getrandbits(32) for i in range(words)]
+    results = {"errors": 0}
+
+    def generator():
+        # Single word writes.
+        for i in range(words):
+            yield from wishbone_burst(bus, i, 1, we=True, data=[data[i]])
+        # Single word reads (random order).
+        order = list(range(words))
+        prng.shuffle(order)
+        for i in order:
+            r = yield from wishbone_burst(bus, i, 1)
+            results["errors"] += (r[0] != data[i])
+        # Cache line refills.
+        for i in range(0, words, line_words):
+            r = yield from wishbone_burst(bus, i, line_words)
+            results["errors"] += sum(r[j] != data[i + j] for j in range(line_words))
+        results["contentions"] = (yield dut.model.contentions)
+
+    # Cycles of the different phases (from the number of acknowledged accesses).
+    phases = {"write": 0, "read": 0, "burst": 0}
+    @passive
+    def monitor():
+        acks = 0
+        while True:
+            phase = "write" if acks < words else ("read" if acks < 2*words else "burst")
+            phases[phase] += 1
+            if (yield bus.cyc) & (yield bus.stb) & (yield bus.ack):
+                acks += 1
+            yield
+
+    run_simulation(dut, [generator(), monitor()])
+    for access in phases:
+        results[access] = 4*words/phases[access]
+    return results
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Asynchronous SRAM simulation benchmark.")
+    parser.add_argument("--sys-clk-freq", default="48e6,100e6", help="System clock frequencies to sweep (comma separated).")
+    parser.add_argument("--words",        default=256, type=int, help="Number of 32-bit words per access type.")
+    parser.add_argument("--line-words",   default=8,   type=int, help="Cache line size (32-bit words) of the burst refills.")
+    args = parser.parse_args()
+
+    print(f"{'Controller':12s} {'Sys Clk (MHz)':>14s} {'Write (MB/s)':>13s} {'Read (MB/s)':>12s} {'Burst (MB/s)':>13s} {'Errors':>7s}")
+    for sys_clk_freq in [float(f) for f in args.sys_clk_freq.split(",")]:
+        for controller in ["legacy", "async_sram"]:
+            results = run_bench(controller, sys_clk_freq, words=args.words, line_words=args.line_words)
+            w, r, b = [results[access]*sys_clk_freq/1e6 for access in ["write", "read", "burst"]]
+            print(f"{controller:12s} {sys_clk_freq/1e6:14.1f} {w:13.1f} {r:12.1f} {b:13.1f} "
+                  f"{results['errors'] + results['contentions']:7d}")
+
+if __name__ == "__main__":
+    main()
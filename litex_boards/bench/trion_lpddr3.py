@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Efinix Trion T120 LPDDR3 simulation benchmark: runs write/read/mixed traffic through the AW/AR
+# arbiter of the T120 target on a behavioral model of the hard DDR controller (shared address
+# channel, read/write turnaround, shared data bus) and reports the sustained throughput of the
+# single-beat (SoC bus through AXILite2AXI) and burst (native ports) accesses.
+#
+# Ex: python3 -m litex_boards.bench.trion_lpddr3 --fairness=1,4,16
+
+import argparse
+from collections import deque
+
+from migen import *
+from migen.sim import passive
+
+from litex.soc.interconnect.axi import AXIInterface
+
+from litex_boards.targets.efinix_trion_t120_bga576_dev_kit import AXIAddressArbiter
+from litex_boards.bench.sim import AXIBurstMaster
+
+# Trion DDR Controller Model -----------------------------------------------------------------------
+
+class TrionDDRModel:
+    """Behavioral model of the Trion hard DDR controller (one AXI target)
+
+    Requests are accepted on the shared address channel, with a turnaround penalty when switching
+    between reads and writes. Read data is returned after a fixed latency; read and write data share
+    the DRAM data bus (one beat per cycle).
+    """
+    def __init__(self, arbiter, axi, latency=16, turnaround=8, max_outstanding=8):
+        self.arbiter         = arbiter
+        self.axi             = axi
+        self.latency         = latency
+        self.turnaround      = turnaround
+        self.max_outstanding = max_outstanding
+
+    @passive
+    def handler(self):
+        arbiter, axi = self.arbiter, self.axi
+        writes    = deque() # [beats, id].
+        responses = deque() # id.
+        reads     = deque() # [cycle, beats, id].
+        atype     = None
+        stall     = 0
+        cycle     = 0
+        while True:
+            # Transfers of the current cycle.
+            if (yield arbiter.valid) and (yield arbiter.ready):
+                _atype = (yield arbiter.atype)
+                if atype is not None and _atype != atype:
+                    stall = self.turnaround
+                atype = _atype
+                beats = (yield arbiter.len) + 1
+                if atype:
+                    writes.append([beats, (yield arbiter.id)])
+                else:
+                    reads.append([cycle + self.latency, beats, (yield arbiter.id)])
+            if (yield axi.w.valid) and (yield axi.w.ready):
+                writes[0][0] -= 1
+                if writes[0][0] == 0:
+                    responses.append(writes.popleft()[1])
+            if (yield axi.b.valid) and (yield axi.b.ready):
+                responses.popleft()
+            r_valid = (yield axi.r.valid)
+            if r_valid and (yield axi.r.ready):
+                reads[0][1] -= 1
+                if reads[0][1] == 0:
+                    reads.popleft()
+            # Next cycle.
+            stall   = max(stall - 1, 0)
+            r_valid = len(reads) > 0 and reads[0][0] <= cycle + 1
+            yield arbiter.ready.eq((stall == 0) and (len(writes) + len(reads) < self.max_outstanding))
+            yield axi.r.valid.eq(r_valid)
+            yield axi.r.last.eq(r_valid and reads[0][1] == 1)
+            yield axi.r.id.eq(reads[0][2] if r_valid else 0)
+            yield axi.w.ready.eq(len(writes) > 0 and not r_valid) # Shared data bus.
+            yield axi.b.valid.eq(len(responses) > 0)
+            yield axi.b.id.eq(responses[0] if len(responses) else 0)
+            cycle += 1
+            yield
+
+# Bench --------------------------------------------------------------------------------------------
+
+class TrionDDRBench(Module):
+    def __init__(self, data_width=256, fairness=4):
+        self.axi = AXIInterface(data_width=data_width, address_width=28, id_width=8)
+        self.submodules.arbiter = AXIAddressArbiter(self.axi, fairness=fairness)
+
+def run_bench(mode, burst_length=16, max_outstanding=8, bursts=64, fairness=4, latency=16, turnaround=8,
+    data_width=256):
+    dut     = TrionDDRBench(data_width=data_width, fairness=fairness)
+    model   = TrionDDRModel(dut.arbiter, dut.axi, latency=latency, turnaround=turnaround)
+    masters = []
+    for write in {"write": [True], "read": [False], "mixed": [True, False]}[mode]:
+        masters.append(AXIBurstMaster(dut.axi,
+            write           = write,
+            bursts          = bursts,
+            burst_length    = burst_length,
+            max_outstanding = max_outstanding,
+            base            = 0 if write else 0x800_0000))
+    generators = [model.handler()]
+    for master in masters:
+        generators += master.generators()
+    run_simulation(dut, generators)
+    # Throughput in bytes/cycle (write, read and total).
+    results = {("write" if m.write else "read"): m.nbytes/m.cycles for m in masters}
+    results["total"] = sum(m.nbytes for m in masters)/max(m.cycles for m in masters)
+    return results
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Efinix Trion T120 LPDDR3 simulation benchmark.")
+    parser.add_argument("--bursts",       default=64,     type=int, help="Number of bursts per direction.")
+    parser.add_argument("--burst-length", default=16,     type=int, help="Native ports AXI burst length (beats).")
+    parser.add_argument("--fairness",     default="1,4,16",         help="Arbiter fairness values to sweep (comma separated).")
+    parser.add_argument("--latency",      default=16,     type=int, help="Controller read latency (cycles).")
+    parser.add_argument("--turnaround",   default=8,      type=int, help="Controller read/write turnaround (cycles).")
+    parser.add_argument("--data-width",   default=256,    type=int, help="Target data width (256: target0, 128: target1).")
+    parser.add_argument("--sys-clk-freq", default=75e6,             help="System clock frequency.")
+    args = parser.parse_args()
+
+    sys_clk_freq = float(args.sys_clk_freq)
+    configs = [
+        # Name       Burst Length       Outstanding
+        ("single-beat", 1,                 1), # SoC bus (AXILite2AXI).
+        ("burst",       args.burst_length, 8), # Native ports.
+    ]
+    print(f"{'Access':12s} {'Traffic':8s} {'Fairness':>8s} {'Write (MB/s)':>13s} {'Read (MB/s)':>12s} {'Total (MB/s)':>13s}")
+    for name, burst_length, max_outstanding in configs:
+        for mode in ["write", "read", "mixed"]:
+            for fairness in [int(f) for f in args.fairness.split(",")] if mode == "mixed" else [1]:
+                results = run_bench(mode,
+                    burst_length    = burst_length,
+                    max_outstanding = max_outstanding,
+                    bursts          = args.bursts,
+                    fairness        = fairness,
+                    latency         = args.latency,
+                    turnaround      = args.turnaround,
+                    data_width      = args.data_width)
+                w = results.get("write", 0)*sys_clk_freq/1e6
+                r = results.get("read",  0)*sys_clk_freq/1e6
+                t = results["total"]*sys_clk_freq/1e6
+                print(f"{name:12s} {mode:8s} {fairness:8d} {w:13.1f} {r:12.1f} {t:13.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""
+Content-addressed build cache.
+
+Bitstreams are stored in a local on-disk store, keyed on a hash of the generated gateware (HDL,
+constraints, scripts, memory initialization files), of the sources/IPs added to the platform (CPU
+cores, .xci, etc...) and of the versions of the toolchain's tools. When a target is rebuilt with
+identical inputs, the bitstreams are restored from the store instead of re-running the toolchain.
+The store is bounded in size (least recently used entries are evicted first).
+
+Ex (for any target):
+    python3 -m litex_boards.cache litex_boards.targets.digilent_arty --build
+
+Or from a custom script, instead of builder.build(run=True):
+    from litex_boards.cache import cached_build
+    cached_build(builder)
+
+Store directory/size can be configured with LITEX_BOARDS_CACHE_DIR/LITEX_BOARDS_CACHE_SIZE (in GB).
+
+IPs generated from Python parameters (ex: Alveo U280's HBM) are also cached, in a directory keyed on
+their configuration (LITEX_BOARDS_IP_CACHE_DIR).
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import importlib
+import subprocess
+
+# Configuration ------------------------------------------------------------------------------------
+
+default_cache_dir  = os.environ.get("LITEX_BOARDS_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "litex_boards", "builds"))
+default_cache_size = int(float(os.environ.get("LITEX_BOARDS_CACHE_SIZE", 20))*1e9)
+
+default_ip_cache_dir = os.environ.get("LITEX_BOARDS_IP_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "litex_boards", "ips"))
+
+# Generated files that are inputs of the toolchain.
+source_extensions = [
+    # HDL.
+    ".v", ".sv", ".vh", ".svh", ".vhd", ".vhdl",
+    # Constraints.
+    ".xdc", ".lpf", ".pcf", ".sdc", ".qsf", ".cst", ".pdc", ".ldc", ".ucf",
+    # IPs.
+    ".xci", ".xcix", ".qip", ".ip",
+    # Scripts/Projects.
+    ".tcl", ".sh", ".bat", ".ys", ".prj", ".xml",
+    # Memory initialization.
+    ".init", ".mem",
+]
+
+# Toolchain outputs restored from the cache.
+output_extensions = [".bit", ".svf", ".bin", ".fs", ".hex", ".sof", ".rbf", ".jed", ".rpt"]
+
+# Tools (as found in the build scripts) and their version command.
+tools_version_args = {
+    "vivado"        : ["-version"],
+    "xst"           : ["-help"],
+    "yosys"         : ["-V"],
+    "nextpnr-ecp5"  : ["--version"],
+    "nextpnr-ice40" : ["--version"],
+    "nextpnr-nexus" : ["--version"],
+    "nextpnr-gowin" : ["--version"],
+    "ecppack"       : ["--help"],
+    "icepack"       : ["-h"],
+    "quartus_sh"    : ["--version"],
+    "diamondc"      : ["-version"],
+    "radiantc"      : ["-version"],
+    "gw_sh"         : ["-version"],
+}
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def _files(directory, extensions):
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for file in sorted(files):
+            if os.path.splitext(file)[1].lower() in extensions:
+                yield os.path.join(root, file)
+
+def _hash_file(h, filename, replacements={}):
+    with open(filename, "rb") as f:
+        content = f.read()
+    # Make the content independent of the build location.
+    for old, new in replacements.items():
+        content = content.replace(old.encode(), new.encode())
+    h.update(hashlib.sha256(content).digest())
+
+def get_tool_version(tool):
+    try:
+        r = subprocess.run([tool] + tools_version_args[tool],
+            stdout  = subprocess.PIPE,
+            stderr  = subprocess.STDOUT,
+            timeout = 60)
+        return r.stdout.decode(errors="replace").strip()
+    except (OSError, subprocess.TimeoutExpired):
+        return "unavailable"
+
+def get_tools_versions(gateware_dir):
+    # Find the tools called by the build scripts.
+    scripts = "".join(open(f, errors="replace").read() for f in _files(gateware_dir, [".sh", ".bat", ".tcl"]))
+    return {tool: get_tool_version(tool) for tool in sorted(tools_version_args) if tool in scripts}
+
+def get_build_script(gateware_dir, build_name):
+    for ext, shell in [(".sh", ["bash"]), (".bat", ["cmd", "/c"])]:
+        script = os.path.join(gateware_dir, f"build_{build_name}{ext}")
+        if os.path.exists(script):
+            return shell + [script]
+    return None
+
+# IP Cache -----------------------------------------------------------------------------------------
+
+def get_ip_dir(name, config, directory=None):
+    """Return the directory of an IP generated from config (keyed on a hash of name/config)."""
+    directory = default_ip_cache_dir if directory is None else directory
+    key = hashlib.sha256(json.dumps({"name": name, "config": config}, sort_keys=True).encode()).hexdigest()
+    return os.path.join(directory, f"{name}_{key[:16]}")
+
+def add_cached_ip(platform, name, vlnv, config, directory=None):
+    """Add a Vivado IP (vlnv: vendor:library:name, config: CONFIG.* properties) generated and
+    synthesized in the build directory (module name: name), re-used from the IP cache when already
+    generated by a previous build.
+
+    Builds only work on their own copy of the IP (ip/name in the build directory): the cache is only
+    read, or published to (atomically, once synth_ip succeeded), so concurrent builds never see or
+    remove each other's partial IPs."""
+    ip_dir   = get_ip_dir(name, dict(device=platform.device, vlnv=vlnv, **config), directory)
+    tmp_dir  = ip_dir + ".tmp[pid]"
+    cached   = os.path.exists(os.path.join(ip_dir, name, name + ".dcp"))
+    commands = platform.toolchain.pre_synthesis_commands
+    commands.append(f"file delete -force ip/{name}")
+    if cached:
+        # Re-use the cached IP (already generated/synthesized by a previous build).
+        commands.append("file mkdir ip")
+        commands.append(f"file copy {ip_dir}/{name} ip")
+        commands.append(f"read_ip ip/{name}/{name}.xci")
+    else:
+        # Generate the IP.
+        vendor, library, ip = vlnv.split(":")[:3]
+        properties = " ".join(f"CONFIG.{k} {v}" for k, v in config.items())
+        commands.append(f"create_ip -name {ip} -vendor {vendor} -library {library} -module_name {name} -dir ip")
+        commands.append(f"set_property -dict [list {properties}] [get_ips {name}]")
+    commands.append(f"generate_target all [get_ips {name}]")
+    commands.append(f"synth_ip [get_ips {name}]")
+    if not cached:
+        # Publish the IP to the cache (unless already published by a concurrent build).
+        commands.append(f"file mkdir {tmp_dir}")
+        commands.append(f"file copy ip/{name} {tmp_dir}")
+        commands.append(f"if ![file exists {ip_dir}] \"catch \\\"file rename {tmp_dir} {ip_dir}\\\"\"")
+        commands.append(f"file delete -force {tmp_dir}")
+    return ip_dir
+
+# Build Key ----------------------------------------------------------------------------------------
+
+def get_build_key(platform, gateware_dir, output_dir=None):
+    """Compute the cache key of a (generated but not yet built) gateware."""
+    h = hashlib.sha256()
+    replacements = {os.path.abspath(gateware_dir): "<gateware_dir>"}
+    if output_dir is not None:
+        replacements[os.path.abspath(output_dir)] = "<output_dir>"
+    # Generated files.
+    for filename in _files(gateware_dir, source_extensions):
+        h.update(os.path.relpath(filename, gateware_dir).encode())
+        _hash_file(h, filename, replacements)
+    # Platform sources/IPs (CPU cores, .xci, etc...).
+    sources = [source[0] for source in getattr(platform, "sources", [])]
+    sources += list(getattr(platform, "ips", {}))
+    for filename in sorted(set(sources)):
+        if os.path.isfile(filename):
+            h.update(os.path.basename(filename).encode())
+            _hash_file(h, filename)
+    # Toolchain.
+    h.update(json.dumps(get_tools_versions(gateware_dir), sort_keys=True).encode())
+    return h.hexdigest()
+
+# Build Cache --------------------------------------------------------------------------------------
+
+class BuildCache:
+    def __init__(self, directory=default_cache_dir, max_size=default_cache_size):
+        self.directory = directory
+        self.max_size  = max_size
+
+    def _entry_dir(self, key):
+        return os.path.join(self.directory, key)
+
+    def _read_meta(self, key):
+        with open(os.path.join(self._entry_dir(key), "meta.json")) as f:
+            return json.load(f)
+
+    def _write_meta(self, key, meta):
+        with open(os.path.join(self._entry_dir(key), "meta.json"), "w") as f:
+            json.dump(meta, f, indent=1)
+
+    def entries(self):
+        entries = {}
+        if os.path.isdir(self.directory):
+            for key in os.listdir(self.directory):
+                try:
+                    entries[key] = self._read_meta(key)
+                except (OSError, ValueError):
+                    pass # Incomplete entry.
+        return entries
+
+    def restore(self, key, gateware_dir):
+        """Restore outputs of a cached build to gateware_dir, return True on hit."""
+        try:
+            meta = self._read_meta(key)
+        except (OSError, ValueError):
+            return False
+        for file in meta["files"]:
+            shutil.copy2(os.path.join(self._entry_dir(key), file), os.path.join(gateware_dir, file))
+        meta["last_used"] = time.time()
+        self._write_meta(key, meta)
+        return True
+
+    def store(self, key, gateware_dir):
+        """Store outputs of a build from gateware_dir."""
+        files = [os.path.relpath(f, gateware_dir) for f in _files(gateware_dir, output_extensions)]
+        if not files:
+            return
+        entry_dir = self._entry_dir(key)
+        tmp_dir   = entry_dir + ".tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        for file in files:
+            os.makedirs(os.path.dirname(os.path.join(tmp_dir, file)), exist_ok=True)
+            shutil.copy2(os.path.join(gateware_dir, file), os.path.join(tmp_dir, file))
+        size = sum(os.path.getsize(os.path.join(tmp_dir, file)) for file in files)
+        with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+            json.dump({"files": files, "size": size, "last_used": time.time()}, f, indent=1)
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        os.rename(tmp_dir, entry_dir)
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the store fits in max_size."""
+        entries = sorted(self.entries().items(), key=lambda e: e[1]["last_used"])
+        size    = sum(meta["size"] for key, meta in entries)
+        for key, meta in entries:
+            if size <= self.max_size:
+                break
+            shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+            size -= meta["size"]
+
+# Cached Build -------------------------------------------------------------------------------------
+
+def cached_build(builder, cache=None, fallback=None, **kwargs):
+    """Replacement for builder.build(run=True, **kwargs) using the build cache.
+
+    The gateware is generated, then the bitstreams are restored from the cache on a hit or built
+    (with the toolchain's build script, or fallback() when the toolchain has no build script) and
+    stored on a miss.
+    """
+    cache = BuildCache() if cache is None else cache
+    vns   = builder.build(run=False, **kwargs)
+    if not builder.compile_gateware:
+        return vns
+    soc = builder.soc
+    key = get_build_key(soc.platform, builder.gateware_dir, builder.output_dir)
+    if cache.restore(key, builder.gateware_dir):
+        print(f"Build cache hit ({key[:16]}), bitstreams restored to {builder.gateware_dir}.")
+        return vns
+    print(f"Build cache miss ({key[:16]}), building...")
+    script = get_build_script(builder.gateware_dir, soc.build_name)
+    if script is not None:
+        subprocess.check_call(script, cwd=builder.gateware_dir)
+    elif fallback is not None:
+        fallback()
+    else:
+        raise OSError(f"No build script found in {builder.gateware_dir}, can't build from cache.")
+    cache.store(key, builder.gateware_dir)
+    return vns
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a LiteX-Boards target with the build cache.",
+        usage="%(prog)s [-h] [--cache-dir DIR] [--cache-size GB] [--clear] target [target args]")
+    parser.add_argument("--cache-dir",  default=default_cache_dir,        help="Build cache directory.")
+    parser.add_argument("--cache-size", default=default_cache_size/1e9, type=float, help="Build cache max size (in GB).")
+    parser.add_argument("--clear",      action="store_true",              help="Clear the build cache.")
+    parser.add_argument("target",       nargs="?",                        help="Target module (ex: litex_boards.targets.digilent_arty).")
+    parser.add_argument("target_args",  nargs=argparse.REMAINDER,         help="Target arguments.")
+    args = parser.parse_args()
+
+    cache = BuildCache(directory=args.cache_dir, max_size=int(args.cache_size*1e9))
+    if args.clear:
+        shutil.rmtree(cache.directory, ignore_errors=True)
+    if args.target is None:
+        return
+
+    # Run the target with Builder.build(run=True) going through the cache.
+    from litex.soc.integration.builder import Builder
+    builder_build = Builder.build
+    def build(builder, *build_args, run=True, **kwargs):
+        if not run:
+            return builder_build(builder, *build_args, run=False, **kwargs)
+        def fallback():
+            # No build script: re-run the target without the cache.
+            subprocess.check_call([sys.executable, "-m", args.target] + args.target_args)
+        Builder.build = builder_build
+        try:
+            return cached_build(builder, cache=cache, fallback=fallback, **kwargs)
+        finally:
+            Builder.build = build
+    Builder.build = build
+
+    module   = importlib.import_module(args.target)
+    sys.argv = [args.target] + args.target_args
+    module.main()
+
+if __name__ == "__main__":
+    main()
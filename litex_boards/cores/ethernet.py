@@ -0,0 +1,333 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+from functools import reduce
+from operator import xor
+
+from migen import *
+from migen.genlib.cdc import MultiReg
+from migen.genlib.resetsync import AsyncResetSynchronizer
+
+from litex.soc.interconnect import stream
+from litex.soc.interconnect.csr import *
+from litex.soc.interconnect.packet import Arbiter, Dispatcher
+
+from liteeth.common import convert_ip, eth_udp_user_description, eth_etherbone_mmap_description
+from liteeth.phy.xgmii import LiteEthPHYXGMII
+
+# 10GBASE-R PHY ------------------------------------------------------------------------------------
+
+class Xilinx10GBASERPHY(LiteEthPHYXGMII):
+    """10GBASE-R Ethernet PHY on Xilinx 7-Series/Ultrascale transceivers
+
+    Xilinx 10G Ethernet PCS/PMA IP (BASE-R, shared logic in core) on a SFP+ transceiver, with
+    LiteEth's XGMII PHY (64-bit) on its XGMII interface. The IP is generated locally (at synthesis)
+    from its parameters and cached. refclk_pads must provide a 156.25MHz reference clock to the
+    transceiver's Quad; gt_location is the transceiver channel (required on Ultrascale).
+    """
+    def __init__(self, platform, refclk_pads, data_pads, dclk_freq, gt_location=None,
+        ip_name = "ten_gig_eth_pcs_pma_0"):
+        self.platform    = platform
+        self.ip_name     = ip_name
+        self.dclk_freq   = dclk_freq
+        self.gt_location = gt_location
+
+        self.status = CSRStatus(fields=[
+            CSRField("block_lock", size=1, description="PCS Block Lock."),
+            CSRField("reset_done", size=1, description="Transceiver Reset Done."),
+        ])
+
+        # # #
+
+        class Open(Signal): pass
+
+        clock_pads  = Record([("tx", 1), ("rx", 1)])
+        xgmii_pads  = Record([("tx_ctl", 8), ("tx_data", 64), ("rx_ctl", 8), ("rx_data", 64)])
+        core_status = Signal(8)
+        reset_done  = Signal()
+
+        # XGMII PHY.
+        LiteEthPHYXGMII.__init__(self, clock_pads, xgmii_pads)
+        self.specials += [
+            AsyncResetSynchronizer(self.crg.cd_eth_tx, ~reset_done),
+            AsyncResetSynchronizer(self.crg.cd_eth_rx, ~reset_done),
+        ]
+
+        # PCS/PMA (XGMII is synchronous to coreclk_out for both directions).
+        self.ip_params = dict(
+            # Clocks/Resets.
+            i_refclk_p      = refclk_pads.p,
+            i_refclk_n      = refclk_pads.n,
+            i_dclk          = ClockSignal("sys"),
+            i_reset         = ResetSignal("sys") | self.crg._reset.storage,
+            o_coreclk_out   = clock_pads.tx,
+            o_rxrecclk_out  = Open(),
+            o_resetdone_out = reset_done,
+
+            # Transceiver.
+            o_txp = data_pads.txp,
+            o_txn = data_pads.txn,
+            i_rxp = data_pads.rxp,
+            i_rxn = data_pads.rxn,
+
+            # XGMII.
+            i_xgmii_txd = xgmii_pads.tx_data,
+            i_xgmii_txc = xgmii_pads.tx_ctl,
+            o_xgmii_rxd = xgmii_pads.rx_data,
+            o_xgmii_rxc = xgmii_pads.rx_ctl,
+
+            # Configuration/Status (No MDIO).
+            i_configuration_vector = 0,
+            o_status_vector        = Open(448),
+            o_core_status          = core_status,
+            i_pma_pmd_type         = 0b111, # 10GBASE-SR.
+            i_signal_detect        = 1,
+            i_tx_fault             = 0,
+            o_tx_disable           = Open(),
+            i_sim_speedup_control  = 0,
+        )
+        self.comb += clock_pads.rx.eq(clock_pads.tx)
+        self.specials += [
+            MultiReg(core_status[0], self.status.fields.block_lock),
+            MultiReg(reset_done,     self.status.fields.reset_done),
+        ]
+        platform.add_period_constraint(refclk_pads.p, 1e9/156.25e6)
+
+    def get_config(self):
+        """Return the configuration (CONFIG.* properties) of the Vivado 10G PCS/PMA IP."""
+        config = {
+            "MDIO_Management" : "false",
+            "base_kr"         : "BASE-R",
+            "SupportLevel"    : "1",
+            "RefClkRate"      : "156.25",
+            "DClkRate"        : f"{self.dclk_freq/1e6:g}",
+        }
+        if self.gt_location is not None:
+            config["Locations"] = self.gt_location
+        return config
+
+    def add_sources(self, platform):
+        from litex_boards.cache import add_cached_ip
+        add_cached_ip(platform, self.ip_name, "xilinx.com:ip:ten_gig_eth_pcs_pma", self.get_config())
+
+    def do_finalize(self):
+        self.add_sources(self.platform)
+        self.specials += Instance(self.ip_name, **self.ip_params)
+
+# 64-bit Etherbone ---------------------------------------------------------------------------------
+
+def add_etherbone_64b(soc, phy, ip_address, mac_address=0x10e2d5000000, udp_port=1234, buffer_depth=16):
+    """Add a 64-bit MAC/ARP/IP/ICMP/UDP/Etherbone stack on a 64-bit (10G) Ethernet PHY.
+
+    SoC.add_etherbone only supports stacks narrower than the PHY (8/32-bit). Here the stack runs
+    with a 64-bit datapath in the sys clock domain: sustaining 10Gbps requires sys_clk_freq to be
+    >= 156.25MHz (a warning is emitted otherwise). The UDP core is exposed as soc.ethcore.udp to
+    connect other UDP streamers.
+    """
+    from liteeth.core import LiteEthUDPIPCore
+    from liteeth.frontend.etherbone import LiteEthEtherbone
+
+    assert phy.dw == 64
+    if soc.sys_clk_freq < 156.25e6:
+        soc.logger.warning("64-bit Etherbone with a {}MHz sys_clk_freq: can't sustain 10Gbps (requires >= 156.25MHz).".format(
+            soc.sys_clk_freq/1e6))
+
+    # Core.
+    soc.submodules.ethcore = LiteEthUDPIPCore(phy,
+        mac_address       = mac_address,
+        ip_address        = convert_ip(ip_address),
+        clk_freq          = soc.sys_clk_freq,
+        dw                = 64,
+        with_sys_datapath = True)
+
+    # Etherbone.
+    soc.submodules.etherbone = LiteEthEtherbone(soc.ethcore.udp, udp_port, buffer_depth=buffer_depth)
+    soc.bus.add_master(name="etherbone", master=soc.etherbone.wishbone.bus)
+
+    # Timing constraints.
+    soc.platform.add_false_path_constraints(soc.crg.cd_sys.clk, phy.crg.cd_eth_rx.clk, phy.crg.cd_eth_tx.clk)
+
+# UDP Steering -------------------------------------------------------------------------------------
+
+class UDPSteering(Module):
+    """Share the UDP packets of a data port between several Ethernet ports
+
+    TX packets are dispatched to the ports per packet ("round-robin"), per flow ("hash" of the
+    IP address/UDP ports, keeping the packets of a flow in order on the same port) or to tx_port
+    ("port", ex: replies sent on the port of the request). RX packets of the ports are merged
+    (round-robin arbitration between packets), rx_port giving the port of the packet on source.
+    """
+    def __init__(self, ports, policy="round-robin", dw=32):
+        assert policy in ["round-robin", "hash", "port"]
+        self.sink    = stream.Endpoint(eth_udp_user_description(dw))
+        self.source  = stream.Endpoint(eth_udp_user_description(dw))
+        self.tx_port = Signal(max=max(len(ports), 2)) # i
+        self.rx_port = Signal(max=max(len(ports), 2)) # o
+
+        # # #
+
+        # TX.
+        self.submodules.dispatcher = dispatcher = Dispatcher(self.sink, [port.sink for port in ports])
+        if len(ports) > 1:
+            if policy == "round-robin":
+                port = Signal(max=len(ports))
+                self.sync += If(self.sink.valid & self.sink.ready & self.sink.last,
+                    If(port == (len(ports) - 1),
+                        port.eq(0)
+                    ).Else(
+                        port.eq(port + 1)
+                    )
+                )
+                self.comb += dispatcher.sel.eq(port)
+            if policy == "hash":
+                bits = log2_int(len(ports))
+                flow = Cat(self.sink.ip_address, self.sink.src_port, self.sink.dst_port)
+                self.comb += dispatcher.sel.eq(reduce(xor, [flow[i:i+bits] for i in range(0, len(flow), bits)]))
+            if policy == "port":
+                self.comb += dispatcher.sel.eq(self.tx_port)
+
+        # RX.
+        self.submodules.arbiter = arbiter = Arbiter([port.source for port in ports], self.source)
+        self.comb += self.rx_port.eq(arbiter.grant)
+
+# Dual Ethernet ------------------------------------------------------------------------------------
+
+def add_dual_ethernet(soc, phys, ip_address, mode="etherbone+udp",
+    mac_address             = 0x10e2d5000000,
+    udp_port                = 2000,
+    with_etherbone          = True,
+    with_loopback           = None,
+    with_timing_constraints = True):
+    """Add a MAC/ARP/IP/ICMP/UDP stack on each Ethernet PHY of a board (to use them simultaneously).
+
+    Port n is at ip_address + n (and mac_address + n); its PHY clock domains must be renamed to
+    eth<n>_tx/eth<n>_rx. Modes:
+    - etherbone+udp: Etherbone on port 0, UDP data port on port 1.
+    - round-robin/hash: UDP data port on all the ports with load sharing (see UDPSteering) and
+      optional Etherbone on port 0.
+    The data port (udp_port) is exposed as soc.udp_steering.sink/source for user logic (TX packets
+    shared between the ports with the round-robin/hash policy) or looped back (UDP echo) with
+    with_loopback (default: with etherbone+udp only): replies are then sent on the port of the
+    request (the load sharing being done by the hosts sending to the different IP addresses). The
+    stacks run with a 32-bit datapath in the sys clock domain.
+    """
+    from liteeth.core import LiteEthUDPIPCore
+    from liteeth.frontend.etherbone import LiteEthEtherbone
+
+    assert mode in ["etherbone+udp", "round-robin", "hash"]
+    if with_loopback is None:
+        with_loopback = (mode == "etherbone+udp")
+
+    # Cores.
+    ethcores = []
+    for n, phy in enumerate(phys):
+        ethcore = LiteEthUDPIPCore(phy,
+            mac_address       = mac_address + n,
+            ip_address        = convert_ip(ip_address) + n,
+            clk_freq          = soc.sys_clk_freq,
+            dw                = 32,
+            with_sys_datapath = True)
+        ethcore = ClockDomainsRenamer({"eth_tx": f"eth{n}_tx", "eth_rx": f"eth{n}_rx"})(ethcore)
+        setattr(soc.submodules, f"ethcore{n}", ethcore)
+        ethcores.append(ethcore)
+
+    # Etherbone (on port 0).
+    if with_etherbone or (mode == "etherbone+udp"):
+        soc.submodules.etherbone = LiteEthEtherbone(ethcores[0].udp, 1234)
+        soc.bus.add_master(name="etherbone", master=soc.etherbone.wishbone.bus)
+
+    # UDP data port.
+    data_cores = ethcores[1:] if mode == "etherbone+udp" else ethcores
+    soc.submodules.udp_steering = UDPSteering(
+        ports  = [ethcore.udp.crossbar.get_port(udp_port, dw=32) for ethcore in data_cores],
+        policy = "port" if with_loopback else "hash" if mode == "hash" else "round-robin")
+    if with_loopback:
+        soc.comb += [
+            soc.udp_steering.tx_port.eq(soc.udp_steering.rx_port),
+            soc.udp_steering.source.connect(soc.udp_steering.sink, omit={"src_port", "dst_port"}),
+            soc.udp_steering.sink.src_port.eq(soc.udp_steering.source.dst_port),
+            soc.udp_steering.sink.dst_port.eq(soc.udp_steering.source.src_port),
+        ]
+
+    # Timing constraints.
+    if with_timing_constraints:
+        for phy in phys:
+            soc.platform.add_period_constraint(phy.crg.cd_eth_rx.clk, 1e9/phy.rx_clk_freq)
+            soc.platform.add_period_constraint(phy.crg.cd_eth_tx.clk, 1e9/phy.tx_clk_freq)
+            soc.platform.add_false_path_constraints(soc.crg.cd_sys.clk, phy.crg.cd_eth_rx.clk, phy.crg.cd_eth_tx.clk)
+
+# Pipelined Etherbone ------------------------------------------------------------------------------
+
+class PipelinedEtherbone(Module):
+    """Pipelined Etherbone (Wishbone Master) with burst support
+
+    Same protocol/features as LiteEthEtherbone (master mode), built from the same blocks. With
+    buffer_depth=256 and a 32-bit stack in the sys clock domain, LiteEthEtherbone (SoC.add_etherbone)
+    already provides the 32-bit datapath and full bursts (replies being stored and forwarded by the
+    record sender); this only adds registered valid/ready on the UDP port and on the MMAP streams
+    around the Wishbone Master, cutting the combinatorial paths between the UDP/IP stack, the
+    records and the Wishbone Master.
+    """
+    def __init__(self, udp, udp_port, buffer_depth=256):
+        from liteeth.frontend.etherbone import (
+            LiteEthEtherbonePacketTX, LiteEthEtherbonePacketRX, LiteEthEtherboneProbe,
+            LiteEthEtherboneRecord, LiteEthEtherboneWishboneMaster)
+
+        # # #
+
+        # UDP Port / Packet.
+        port = udp.crossbar.get_port(udp_port, dw=32)
+        self.submodules.tx        = tx        = LiteEthEtherbonePacketTX(udp_port)
+        self.submodules.rx        = rx        = LiteEthEtherbonePacketRX()
+        self.submodules.rx_buffer = rx_buffer = stream.Buffer(eth_udp_user_description(32), pipe_ready=True)
+        self.comb += [
+            tx.source.connect(port.sink),
+            port.source.connect(rx_buffer.sink),
+            rx_buffer.source.connect(rx.sink),
+        ]
+
+        # Probe / Records.
+        self.submodules.probe  = probe  = LiteEthEtherboneProbe()
+        self.submodules.record = record = LiteEthEtherboneRecord(buffer_depth=buffer_depth)
+        dispatcher = Dispatcher(rx.source, [probe.sink, record.sink])
+        self.comb += dispatcher.sel.eq(~rx.source.pf)
+        arbiter = Arbiter([probe.source, record.source], tx.sink)
+        self.submodules += dispatcher, arbiter
+
+        # Wishbone Master.
+        self.submodules.wishbone    = LiteEthEtherboneWishboneMaster()
+        self.submodules.mmap_sink   = stream.Buffer(eth_etherbone_mmap_description(32), pipe_ready=True)
+        self.submodules.mmap_source = stream.Buffer(eth_etherbone_mmap_description(32), pipe_ready=True)
+        self.comb += [
+            record.receiver.source.connect(self.mmap_sink.sink),
+            self.mmap_sink.source.connect(self.wishbone.sink),
+            self.wishbone.source.connect(self.mmap_source.sink),
+            self.mmap_source.source.connect(record.sender.sink),
+        ]
+
+def add_etherbone_pipelined(soc, phy, ip_address, mac_address=0x10e2d5000000, udp_port=1234, buffer_depth=256):
+    """Add a MAC/ARP/IP/ICMP/UDP stack with a PipelinedEtherbone on an 8-bit Ethernet PHY.
+
+    The stack runs with a 32-bit datapath in the sys clock domain (width conversion/CDC at the PHY
+    boundary): only the PHY and the CDC FIFOs remain in the PHY clock domains (125MHz for RGMII).
+    """
+    from liteeth.core import LiteEthUDPIPCore
+
+    # Core.
+    soc.submodules.ethcore_etherbone = LiteEthUDPIPCore(phy,
+        mac_address       = mac_address,
+        ip_address        = convert_ip(ip_address),
+        clk_freq          = soc.sys_clk_freq,
+        dw                = 32,
+        with_sys_datapath = True)
+
+    # Etherbone.
+    soc.submodules.etherbone = PipelinedEtherbone(soc.ethcore_etherbone.udp, udp_port, buffer_depth=buffer_depth)
+    soc.bus.add_master(name="etherbone", master=soc.etherbone.wishbone.bus)
+
+    # Timing constraints.
+    soc.platform.add_period_constraint(phy.crg.cd_eth_rx.clk, 1e9/phy.rx_clk_freq)
+    soc.platform.add_period_constraint(phy.crg.cd_eth_tx.clk, 1e9/phy.tx_clk_freq)
+    soc.platform.add_false_path_constraints(soc.crg.cd_sys.clk, phy.crg.cd_eth_rx.clk, phy.crg.cd_eth_tx.clk)
@@ -0,0 +1,90 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# HyperRAM controllers shared by the targets with two 8-bit HyperRAM/PSRAM chips on separate byte
+# lanes (ex: Tang Nano 9K's 2x32Mbit PSRAMs).
+
+from migen import *
+
+from litex.soc.cores.hyperbus import HyperRAM
+from litex.soc.integration.soc import SoCRegion, colorer
+
+# Dual HyperRAM ------------------------------------------------------------------------------------
+
+class DualHyperRAM(Module):
+    """Two 8-bit HyperRAM chips driven in lockstep as one 16-bit HyperRAM
+
+    Wraps the 16-bit LiteX HyperRAM core: CS#/CK/RESET# are shared, each chip stores one byte of
+    the 16-bit words (its RWDS masking its byte on writes) and the Command/Address, sent by the
+    core on DQ[7:0] only (as for x16 chips), is duplicated on DQ[15:8] for the second chip. Both
+    chips run with the same (default) fixed latency: the capacity and the burst bandwidth are
+    doubled with the same access latency.
+
+    pads: clk, cs_n (2), rst_n (2) and dq (16)/rwds (2) or (simulation) dq_o/dq_i/dq_oe and
+    rwds_o/rwds_oe.
+    """
+    def __init__(self, pads, latency=6, sys_clk_freq=None):
+        core_pads = Record([("clk", 1), ("cs_n", 1), ("rst_n", 1),
+            ("dq",   [("o", 16), ("oe", 1), ("i", 16)]),
+            ("rwds", [("o",  2), ("oe", 1), ("i",  2)])])
+        self.submodules.core = HyperRAM(core_pads, latency=latency, sys_clk_freq=sys_clk_freq)
+        self.bus = self.core.bus
+
+        # # #
+
+        dq        = core_pads.dq
+        rwds      = core_pads.rwds
+        ca_active = Signal()
+        dq_o      = Signal(16)
+        self.comb += [
+            # Command/Address: DQ driven without RWDS (RWDS is driven with the write data).
+            ca_active.eq(dq.oe & ~rwds.oe),
+            dq_o.eq(Cat(dq.o[:8], Mux(ca_active, dq.o[:8], dq.o[8:]))),
+            pads.clk.eq(core_pads.clk),
+            pads.cs_n.eq(Replicate(core_pads.cs_n, 2)),
+            pads.rst_n.eq(Replicate(core_pads.rst_n, 2)),
+        ]
+
+        # Simulation pads.
+        if hasattr(pads, "dq_oe"):
+            self.comb += [
+                pads.dq_o.eq(dq_o),
+                pads.dq_oe.eq(dq.oe),
+                dq.i.eq(pads.dq_i),
+                pads.rwds_o.eq(rwds.o),
+                pads.rwds_oe.eq(rwds.oe),
+            ]
+        # FPGA pads.
+        else:
+            dq_t   = TSTriple(16)
+            rwds_t = TSTriple(2)
+            self.specials += dq_t.get_tristate(pads.dq), rwds_t.get_tristate(pads.rwds)
+            self.comb += [
+                dq_t.o.eq(dq_o),
+                dq_t.oe.eq(dq.oe),
+                dq.i.eq(dq_t.i),
+                rwds_t.o.eq(rwds.o),
+                rwds_t.oe.eq(rwds.oe),
+                rwds.i.eq(rwds_t.i),
+            ]
+
+def add_hyperram(soc, pads, name="main_ram", origin=0x40000000, size=8*1024*1024, chips=2, latency=6):
+    """Add a HyperRAM to the SoC bus: one 8-bit chip (pads: clk, cs_n, rst_n, dq (8), rwds) or two
+    8-bit chips in lockstep (DualHyperRAM pads, size: total size of the two chips)."""
+    assert chips in [1, 2]
+    soc.check_if_exists(name)
+    if chips == 1:
+        ram = HyperRAM(pads, latency=latency, sys_clk_freq=soc.sys_clk_freq)
+    else:
+        ram = DualHyperRAM(pads, latency=latency, sys_clk_freq=soc.sys_clk_freq)
+    setattr(soc.submodules, name, ram)
+    soc.bus.add_slave(name, ram.bus, SoCRegion(origin=origin, size=size, mode="rw"))
+    soc.logger.info("HyperRAM {} {} {} ({} chip(s), {}-bit, Latency: {}).".format(
+        colorer(name),
+        colorer("added", color="green"),
+        soc.bus.regions[name],
+        chips,
+        8*chips,
+        latency))
@@ -0,0 +1,30 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# PCIe helpers shared by the PCIe targets (--pcie-lanes/--pcie-data-width/--pcie-dmas).
+
+# PCIe Data Width ----------------------------------------------------------------------------------
+
+# Data width (in bits) of the PHYs sustaining the bandwidth of the link, per number of lanes. This is
+# the width of the PCIe hard IP interface (C_DATA_WIDTH of the .xci), --pcie-data-width only selects
+# the width of the core's datapath (converted to/from the PHY's width in the PHY):
+#   data_width      = get_pcie_data_width(PHY, nlanes, data_width),
+#   pcie_data_width = get_pcie_data_width(PHY, nlanes),
+pcie_data_widths = {
+    # 7-Series (Gen2, up to 128-bit).
+    "S7PCIEPHY"     : {1: 64, 2: 64, 4: 128, 8: 128},
+    # Ultrascale (Gen3).
+    "USPCIEPHY"     : {1: 64, 2: 64, 4: 128, 8: 256},
+    # Ultrascale+ (Gen3).
+    "USPPCIEPHY"    : {1: 64, 2: 64, 4: 128, 8: 256, 16: 512},
+    "USPHBMPCIEPHY" : {1: 64, 2: 64, 4: 128, 8: 256, 16: 512},
+}
+
+def get_pcie_data_width(phy_cls, nlanes, data_width=None):
+    """Return data_width when specified, else the PHY's data width for nlanes."""
+    data_widths = pcie_data_widths[phy_cls.__name__]
+    if nlanes not in data_widths:
+        raise ValueError(f"Unsupported number of PCIe lanes for {phy_cls.__name__}: {nlanes}.")
+    return data_widths[nlanes] if data_width is None else data_width
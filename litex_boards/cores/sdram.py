@@ -0,0 +1,440 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+from math import log2
+from copy import copy
+from functools import reduce
+from operator import and_, or_
+
+from migen import *
+from migen.genlib.record import DIR_M_TO_S
+from migen.fhdl.simplify import FullMemoryWE
+
+from litex.soc.interconnect.csr import *
+from litex.soc.interconnect import stream
+from litex.soc.interconnect import wishbone
+from litex.soc.integration.soc import SoCRegion
+
+from litedram.common import Settings, LiteDRAMNativePort, burst_lengths
+from litedram.core import LiteDRAMCore
+from litedram.dfii import DFIInjector
+from litedram.phy import dfi
+from litedram.frontend.wishbone import LiteDRAMWishbone2Native
+
+# LiteDRAM Native Port Interleaver -----------------------------------------------------------------
+
+class LiteDRAMNativePortInterleaver(Module):
+    """LiteDRAM Native Port Interleaver
+
+    Spreads the address space of a master native port over N slave native ports (one per channel)
+    with a granularity (in native words, power of 2). Commands are pipelined (up to depth per
+    direction in flight): write data/read data are routed in command order through order FIFOs
+    and buffered per slave (LiteDRAM ports don't stall the write data requests/read data returns,
+    that can happen in a different order on each channel). Slaves can be wider than the master
+    (ex: ECC byte lanes, left unused).
+    """
+    def __init__(self, master, slaves, granularity=1, depth=16):
+        n = len(slaves)
+        assert 2**log2_int(n) == n
+        assert 2**log2_int(granularity) == granularity
+        shift = log2_int(granularity)
+        nbits = log2_int(n)
+        dw    = master.data_width
+
+        # # #
+
+        # Order FIFOs.
+        wr_order = stream.SyncFIFO([("sel", max(nbits, 1))], depth, buffered=True)
+        rd_order = stream.SyncFIFO([("sel", max(nbits, 1))], depth, buffered=True)
+        self.submodules += wr_order, rd_order
+
+        # Command.
+        addr      = Signal(len(slaves[0].cmd.addr))
+        sel       = Signal(max(nbits, 1))
+        order     = Signal()
+        cmd_ready = Signal()
+        self.comb += [
+            sel.eq(master.cmd.addr[shift:shift + nbits] if nbits else 0),
+            addr.eq(master.cmd.addr[shift + nbits:] << shift | master.cmd.addr[:shift] if shift else
+                    master.cmd.addr[nbits:]),
+            order.eq(Mux(master.cmd.we, wr_order.sink.ready, rd_order.sink.ready)),
+            wr_order.sink.valid.eq(master.cmd.valid &  master.cmd.we & cmd_ready),
+            rd_order.sink.valid.eq(master.cmd.valid & ~master.cmd.we & cmd_ready),
+            wr_order.sink.sel.eq(sel),
+            rd_order.sink.sel.eq(sel),
+            master.cmd.ready.eq(cmd_ready),
+        ]
+        for i, slave in enumerate(slaves):
+            self.comb += [
+                slave.cmd.valid.eq(master.cmd.valid & (sel == i) & order),
+                slave.cmd.last.eq(master.cmd.last),
+                slave.cmd.we.eq(master.cmd.we),
+                slave.cmd.addr.eq(addr),
+                If(sel == i, cmd_ready.eq(slave.cmd.ready & order)),
+            ]
+
+        # Write Data.
+        for i, slave in enumerate(slaves):
+            wr_sel  = wr_order.source.valid & (wr_order.source.sel == i)
+            wr_fifo = stream.SyncFIFO([("data", dw), ("we", dw//8)], depth)
+            self.submodules += wr_fifo
+            self.comb += [
+                wr_fifo.sink.valid.eq(master.wdata.valid & wr_sel),
+                wr_fifo.sink.data.eq(master.wdata.data),
+                wr_fifo.sink.we.eq(master.wdata.we),
+                If(wr_sel, master.wdata.ready.eq(wr_fifo.sink.ready)),
+                slave.wdata.valid.eq(wr_fifo.source.valid),
+                slave.wdata.data.eq(wr_fifo.source.data),
+                slave.wdata.we.eq(wr_fifo.source.we),
+                wr_fifo.source.ready.eq(slave.wdata.ready),
+            ]
+        self.comb += wr_order.source.ready.eq(master.wdata.valid & master.wdata.ready)
+
+        # Read Data.
+        for i, slave in enumerate(slaves):
+            rd_sel  = rd_order.source.valid & (rd_order.source.sel == i)
+            rd_fifo = stream.SyncFIFO([("data", dw)], depth)
+            self.submodules += rd_fifo
+            self.comb += [
+                rd_fifo.sink.valid.eq(slave.rdata.valid),
+                rd_fifo.sink.data.eq(slave.rdata.data),
+                slave.rdata.ready.eq(1),
+                rd_fifo.source.ready.eq(master.rdata.ready & rd_sel),
+                If(rd_sel,
+                    master.rdata.valid.eq(rd_fifo.source.valid),
+                    master.rdata.data.eq(rd_fifo.source.data),
+                ),
+            ]
+        self.comb += rd_order.source.ready.eq(master.rdata.valid & master.rdata.ready)
+
+# LiteDRAM Native Port Striper ---------------------------------------------------------------------
+
+class LiteDRAMNativePortStriper(Module):
+    """LiteDRAM Native Port Striper
+
+    Stripes the words of a master native port N times wider than the slave native ports (one per
+    channel) over the slaves: slave word i of each master word is stored on slave i at the master
+    word address, so each master access uses all the channels in parallel. Commands are issued to
+    all the slaves (each one accepting it on its own), write data and read data are buffered per
+    slave (up to depth reads in flight). Slaves can be wider than the master's slave words (ex: ECC
+    byte lanes, left unused).
+    """
+    def __init__(self, master, slaves, depth=16):
+        n  = len(slaves)
+        dw = master.data_width//n
+        assert dw*n == master.data_width
+
+        # # #
+
+        # Command.
+        cmd_valid = Signal()
+        cmd_ready = Signal()
+        cmd_done  = Signal(n)
+        rd_count  = Signal(max=depth + 1)
+        self.comb += [
+            cmd_valid.eq(master.cmd.valid & (master.cmd.we | (rd_count != depth))),
+            cmd_ready.eq(reduce(and_, [slave.cmd.ready | cmd_done[i] for i, slave in enumerate(slaves)])),
+            master.cmd.ready.eq(cmd_valid & cmd_ready),
+        ]
+        for i, slave in enumerate(slaves):
+            self.comb += [
+                slave.cmd.valid.eq(cmd_valid & ~cmd_done[i]),
+                slave.cmd.last.eq(master.cmd.last),
+                slave.cmd.we.eq(master.cmd.we),
+                slave.cmd.addr.eq(master.cmd.addr),
+            ]
+        self.sync += [
+            If(master.cmd.valid & master.cmd.ready,
+                cmd_done.eq(0)
+            ).Elif(cmd_valid,
+                cmd_done.eq(cmd_done | Cat(*[slave.cmd.ready for slave in slaves]))
+            ),
+            rd_count.eq(rd_count
+                + (master.cmd.valid & master.cmd.ready & ~master.cmd.we)
+                - (master.rdata.valid & master.rdata.ready)
+            )
+        ]
+
+        # Write Data.
+        wr_fifos = [stream.SyncFIFO([("data", dw), ("we", dw//8)], depth) for i in range(n)]
+        self.submodules += wr_fifos
+        self.comb += master.wdata.ready.eq(reduce(and_, [wr_fifo.sink.ready for wr_fifo in wr_fifos]))
+        for i, (slave, wr_fifo) in enumerate(zip(slaves, wr_fifos)):
+            self.comb += [
+                wr_fifo.sink.valid.eq(master.wdata.valid & master.wdata.ready),
+                wr_fifo.sink.data.eq(master.wdata.data[i*dw:(i + 1)*dw]),
+                wr_fifo.sink.we.eq(master.wdata.we[i*dw//8:(i + 1)*dw//8]),
+                slave.wdata.valid.eq(wr_fifo.source.valid),
+                slave.wdata.data.eq(wr_fifo.source.data),
+                slave.wdata.we.eq(wr_fifo.source.we),
+                wr_fifo.source.ready.eq(slave.wdata.ready),
+            ]
+
+        # Read Data.
+        rd_fifos = [stream.SyncFIFO([("data", dw)], depth) for i in range(n)]
+        self.submodules += rd_fifos
+        self.comb += [
+            master.rdata.valid.eq(reduce(and_, [rd_fifo.source.valid for rd_fifo in rd_fifos])),
+            master.rdata.data.eq(Cat(*[rd_fifo.source.data for rd_fifo in rd_fifos])),
+        ]
+        for slave, rd_fifo in zip(slaves, rd_fifos):
+            self.comb += [
+                rd_fifo.sink.valid.eq(slave.rdata.valid),
+                rd_fifo.sink.data.eq(slave.rdata.data),
+                slave.rdata.ready.eq(1),
+                rd_fifo.source.ready.eq(master.rdata.valid & master.rdata.ready),
+            ]
+
+# LiteDRAM Interleaved Native Port -----------------------------------------------------------------
+
+class LiteDRAMInterleavedNativePort(Module):
+    """LiteDRAM Interleaved Native Port
+
+    Native port (port) N times wider than the channels' native ports (their power of 2 part) giving
+    access to the N channels as a single memory:
+    - granularity=1 (cacheline): the port words are striped over the channels, N times the
+      bandwidth of a channel per access.
+    - granularity>1 (page): the port words are split in N consecutive channel words (N commands
+      issued back to back) and the channel changes every granularity channel words (interleaver);
+      the bandwidth of a sequential stream is the one of a channel, the channels work in parallel
+      on the pipelined accesses to different pages (and hide each other's row misses/refreshes).
+    """
+    def __init__(self, slaves, granularity=1, depth=16):
+        n  = len(slaves)
+        dw = 2**int(log2(slaves[0].data_width)) # Round to lowest power of 2 (ECC byte lanes unused).
+        aw = len(slaves[0].cmd.addr)
+        self.port = LiteDRAMNativePort("both", address_width=aw, data_width=n*dw)
+
+        # # #
+
+        if (granularity == 1) or (n == 1):
+            self.submodules.striper = LiteDRAMNativePortStriper(self.port, slaves, depth=depth)
+        else:
+            port  = LiteDRAMNativePort("both", address_width=aw + log2_int(n), data_width=dw)
+            count = Signal(max=n)
+            self.comb += [
+                port.cmd.valid.eq(self.port.cmd.valid),
+                port.cmd.we.eq(self.port.cmd.we),
+                port.cmd.addr.eq(self.port.cmd.addr*n + count),
+                self.port.cmd.ready.eq(port.cmd.ready & (count == (n - 1))),
+            ]
+            self.sync += If(port.cmd.valid & port.cmd.ready,
+                If(count == (n - 1),
+                    count.eq(0)
+                ).Else(
+                    count.eq(count + 1)
+                )
+            )
+            self.submodules.wdata_converter = stream.StrideConverter(
+                description_from = self.port.wdata.description,
+                description_to   = port.wdata.description)
+            self.submodules.rdata_converter = stream.StrideConverter(
+                description_from = port.rdata.description,
+                description_to   = self.port.rdata.description)
+            self.submodules += stream.Pipeline(self.port.wdata, self.wdata_converter, port.wdata)
+            self.submodules += stream.Pipeline(port.rdata, self.rdata_converter, self.port.rdata)
+            self.submodules.interleaver = LiteDRAMNativePortInterleaver(port, slaves,
+                granularity = granularity,
+                depth       = depth)
+
+# LiteDRAM Lockstep PHY ----------------------------------------------------------------------------
+
+class LiteDRAMLockstepPHY(Module, AutoCSR):
+    """LiteDRAM Lockstep PHY
+
+    Exposes N identical PHYs (one per channel) as a single PHY N times wider (power of 2 part of
+    the PHYs' data width, ECC byte lanes unused) to the BIOS initialization/calibration:
+    - CSRs: same as the PHYs, dly_sel selecting the byte lanes of all the PHYs (channel n lanes
+      after channel n-1 ones), the other CSRStorages/CSR strobes broadcast to the PHYs and status
+      ORed (cdly_value/half_sys8x_taps identical on all the PHYs, wdly_dqs_inc_count only returned
+      by the PHY of the selected lane).
+    - DFI: commands broadcast to the N channels' DFIs (dfis, to be connected to the PHYs through
+      the channels' controllers), data lanes split/regrouped.
+    The PHYs themselves must not be exposed as CSR banks.
+    """
+    def __init__(self, phys):
+        n        = len(phys)
+        settings = phys[0].settings
+        pdw      = settings.databits
+        dw       = 2**int(log2(pdw)) # Round to lowest power of 2 (ECC byte lanes unused).
+        strobes  = dw//(pdw//settings.strobes)
+        nbeats   = settings.dfi_databits//pdw
+        self.settings = copy(settings)
+        self.settings.set_attributes(dict(
+            databits     = n*dw,
+            dfi_databits = nbeats*n*dw,
+            strobes      = n*strobes))
+        dfi_params = dict(
+            addressbits = len(phys[0].dfi.p0.address),
+            bankbits    = len(phys[0].dfi.p0.bank),
+            nranks      = len(phys[0].dfi.p0.cs_n),
+            nphases     = len(phys[0].dfi.phases))
+        self.dfi  = dfi.Interface(databits=nbeats*n*dw, **dfi_params)
+        self.dfis = [dfi.Interface(databits=settings.dfi_databits, **dfi_params) for i in range(n)]
+
+        # # #
+
+        # CSRs.
+        phys_csrs = [{csr.name: csr for csr in phy.get_csrs()} for phy in phys]
+        for name, csr in phys_csrs[0].items():
+            csrs = [phy_csrs[name] for phy_csrs in phys_csrs]
+            if isinstance(csr, CSRStorage):
+                assert not hasattr(csr, "fields")
+                if name == "dly_sel":
+                    proxy = CSRStorage(n*strobes, name=name, description=csr.description)
+                    for i, c in enumerate(csrs):
+                        self.comb += c.storage.eq(proxy.storage[i*strobes:(i + 1)*strobes])
+                else:
+                    proxy = CSRStorage(csr.size, reset=csr.storage.reset.value, name=name,
+                        description = csr.description)
+                    self.comb += [c.storage.eq(proxy.storage) for c in csrs]
+                self.comb += [c.re.eq(proxy.re) for c in csrs]
+            elif isinstance(csr, CSRStatus):
+                proxy = CSRStatus(csr.size, name=name, description=csr.description)
+                self.comb += proxy.status.eq(reduce(or_, [c.status for c in csrs]))
+            else:
+                proxy = CSR(csr.size, name=name)
+                self.comb += proxy.w.eq(reduce(or_, [c.w for c in csrs]))
+                self.comb += [c.r.eq(proxy.r)   for c in csrs]
+                self.comb += [c.re.eq(proxy.re) for c in csrs]
+                self.comb += [c.we.eq(proxy.we) for c in csrs]
+            setattr(self, f"_{name}", proxy)
+
+        # DFI.
+        for p, phase in enumerate(self.dfi.phases):
+            for i, channel_phase in enumerate(channel_dfi.phases[p] for channel_dfi in self.dfis):
+                for name, size, direction in phase.layout:
+                    if name in ["wrdata", "wrdata_mask", "rddata"]:
+                        ratio = 8 if name == "wrdata_mask" else 1
+                        w     = dw//ratio
+                        for b in range(nbeats):
+                            wide   = getattr(phase, name)[(b*n + i)*w:(b*n + i + 1)*w]
+                            narrow = getattr(channel_phase, name)[b*pdw//ratio:b*pdw//ratio + w]
+                            self.comb += wide.eq(narrow) if name == "rddata" else narrow.eq(wide)
+                    elif direction == DIR_M_TO_S:
+                        self.comb += getattr(channel_phase, name).eq(getattr(phase, name))
+                    elif i == 0:
+                        self.comb += getattr(phase, name).eq(getattr(channel_phase, name))
+
+# LiteDRAM Lockstep Initiator ----------------------------------------------------------------------
+
+class LiteDRAMLockstepInitiator(Module, AutoCSR):
+    """LiteDRAM Lockstep Initiator
+
+    DFI injector (dfii CSRs, as the one of a LiteDRAMCore) on a LiteDRAMLockstepPHY: the BIOS
+    initializes and calibrates all the channels at once (software control), the channels'
+    controllers driving their PHYs otherwise. Also provides the controller settings the BIOS'
+    sdram_phy.h is generated from.
+    """
+    def __init__(self, phy, geom_settings, timing_settings):
+        self.software = Signal()
+        self.controller = Settings()
+        self.controller.settings = Settings()
+        self.controller.settings.set_attributes(dict(
+            phy    = phy.settings,
+            geom   = geom_settings,
+            timing = timing_settings))
+
+        # # #
+
+        self.submodules.dfii = DFIInjector(
+            addressbits = len(phy.dfi.p0.address),
+            bankbits    = len(phy.dfi.p0.bank),
+            nranks      = phy.settings.nranks,
+            databits    = phy.settings.dfi_databits,
+            nphases     = phy.settings.nphases)
+        self.comb += self.dfii.master.connect(phy.dfi)
+        self.comb += self.software.eq(~self.dfii._control.fields.sel)
+
+# Interleaved SDRAM --------------------------------------------------------------------------------
+
+def get_interleaving_granularity(module, interleaving="cacheline"):
+    """Return the interleaving granularity (in native words): 1 for cacheline, DRAM page for page."""
+    if interleaving == "cacheline":
+        return 1
+    if interleaving == "page":
+        return 2**(module.geom_settings.colbits - log2_int(burst_lengths[module.memtype]))
+    raise ValueError(f"Unsupported interleaving {interleaving}, expected cacheline or page.")
+
+def add_interleaved_sdram(soc, phys, module, origin=None, size=None, interleaving="cacheline",
+    l2_cache_size = 8192,
+    **kwargs):
+    """Add N SDRAM channels (one LiteDRAM controller per PHY) to the SoC as a single interleaved
+    main_ram.
+
+    main_ram is accessed through a LiteDRAMInterleavedNativePort (N times the channels' data
+    width): with cacheline interleaving its bandwidth scales with N, with page interleaving only
+    the non-sequential accesses take advantage of the N channels.
+
+    The PHYs must be in the same clock domains and must not be exposed as CSR banks (anonymous
+    submodules): they are exposed to the BIOS as a single ddrphy (LiteDRAMLockstepPHY) with a
+    single sdram DFI injector (LiteDRAMLockstepInitiator), the BIOS initializing and calibrating all
+    the channels at boot before the memtest. The BIOS calibrating up to 16 byte lanes, this limits
+    the number of channels to 2 with 64-bit (72-bit ECC) DIMMs. Per-channel native ports (for DMAs)
+    can be requested from soc.sdram_channels[n].crossbar.get_port().
+    """
+    n = len(phys)
+    soc.submodules.ddrphy = ddrphy = LiteDRAMLockstepPHY(phys)
+    if ddrphy.settings.strobes > 16:
+        raise ValueError(f"{n} channels with {ddrphy.settings.strobes} byte lanes, the BIOS "
+            "calibrates up to 16 byte lanes.")
+    soc.submodules.sdram = sdram = LiteDRAMLockstepInitiator(ddrphy,
+        geom_settings   = module.geom_settings,
+        timing_settings = module.timing_settings)
+
+    # Channels (controller's DFI injector in hardware control, software DFI from the initiator).
+    cores = []
+    for i, phy in enumerate(phys):
+        core = LiteDRAMCore(
+            phy             = phy,
+            geom_settings   = module.geom_settings,
+            timing_settings = module.timing_settings,
+            clk_freq        = soc.sys_clk_freq,
+            **kwargs)
+        soc.submodules += core
+        soc.comb += [
+            core.dfii._control.fields.sel.eq(1),
+            core.dfii.ext_dfi_sel.eq(sdram.software),
+            ddrphy.dfis[i].connect(core.dfii.ext_dfi),
+        ]
+        cores.append(core)
+    soc.sdram_channels = cores
+
+    # Interleaved native port.
+    soc.submodules.sdram_interleaved = LiteDRAMInterleavedNativePort(
+        slaves      = [core.crossbar.get_port() for core in cores],
+        granularity = get_interleaving_granularity(module, interleaving))
+    port = soc.sdram_interleaved.port
+
+    # Main RAM region.
+    sdram_size = 2**len(port.cmd.addr)*port.data_width//8
+    if size is not None:
+        sdram_size = min(sdram_size, size)
+    origin = soc.mem_map["main_ram"] if origin is None else origin
+    wb_sdram = wishbone.Interface(data_width=soc.bus.data_width)
+    soc.bus.add_slave("main_ram", wb_sdram, SoCRegion(origin=origin, size=sdram_size))
+
+    # L2 Cache.
+    if l2_cache_size != 0:
+        l2_cache_size = max(l2_cache_size, int(2*port.data_width/8)) # Use minimal size if lower
+        l2_cache_size = 2**int(log2(l2_cache_size))                  # Round to nearest power of 2
+        l2_cache = wishbone.Cache(
+            cachesize = l2_cache_size//4,
+            master    = wb_sdram,
+            slave     = wishbone.Interface(port.data_width))
+        soc.submodules.l2_cache = FullMemoryWE()(l2_cache)
+        litedram_wb = soc.l2_cache.slave
+        soc.add_config("L2_SIZE", l2_cache_size)
+    else:
+        litedram_wb = wishbone.Interface(port.data_width)
+        soc.submodules += wishbone.Converter(wb_sdram, litedram_wb)
+
+    # Wishbone Slave <--> Interleaved LiteDRAM bridge.
+    soc.submodules.wishbone_bridge = LiteDRAMWishbone2Native(
+        wishbone     = litedram_wb,
+        port         = port,
+        base_address = origin)
+
+    return cores
@@ -0,0 +1,243 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# SPI Flash XIP helpers shared by the targets executing their BIOS/firmware from SPI Flash (ex: Tang
+# Nano 9K, iCE40 boards).
+
+from migen import *
+
+from litex.soc.interconnect import wishbone
+from litex.soc.integration.soc import colorer
+
+# SPI Flash Prefetcher -----------------------------------------------------------------------------
+
+class SPIFlashPrefetcher(Module):
+    """Read-only line buffer with sequential next-line prefetch for XIP from SPI Flash
+
+    Sits between the SoC bus (bus) and the LiteSPI MMAP Wishbone interface (slave). Reads are
+    served from nlines direct-mapped lines of line_words words (data/tags and valid bits per word
+    in block RAM): hits are acknowledged in 2 cycles, misses fill the line with sequential reads
+    from the missed word to the end of the line (the requested word being acknowledged as soon as
+    read) so that LiteSPI keeps CS# asserted and only sends the command/address once per fill. On
+    misses and on the first access to a prefetched line, the next line is prefetched while the bus
+    is idle; fills are aborted at a word boundary on accesses to other lines (the words already
+    read remaining valid).
+
+    Writes are forwarded to the slave without invalidating the lines: the Flash must not be written
+    while executing from it.
+
+    adr_width limits the tags to the word address bits of the Flash region (the upper bits being
+    decoded by the SoC bus), block RAM usage: nlines*line_words*32 (data) + nlines*(line_words +
+    adr_width - log2(nlines*line_words)) (tags) bits.
+
+    With a CPU Instruction Cache, the prefetcher is only useful when larger than the cache (the
+    lines evicted from the cache being then still served from block RAM).
+    """
+    def __init__(self, slave, nlines=4, line_words=8, prefetch=True, adr_width=None):
+        assert nlines >= 2 and nlines == 2**log2_int(nlines)
+        assert line_words >= 2 and line_words == 2**log2_int(line_words)
+        self.slave = slave
+        self.bus   = bus = wishbone.Interface(data_width=32, adr_width=len(slave.adr))
+
+        # # #
+
+        adr_width = len(bus.adr) if adr_width is None else adr_width
+        wbits     = log2_int(line_words)
+        ibits     = log2_int(nlines)
+        tag_bits  = adr_width - wbits - ibits
+        word      = lambda adr: adr[:wbits]
+        index     = lambda adr: adr[wbits:wbits + ibits]
+        line      = lambda adr: adr[wbits:adr_width]
+        tag       = lambda adr: adr[wbits + ibits:adr_width]
+        next_line = lambda adr: Cat(C(0, wbits), (line(adr) + 1)[:adr_width - wbits], adr[adr_width:])
+        assert tag_bits > 0
+        self.memory_bits = nlines*line_words*32 + nlines*(line_words + tag_bits)
+
+        # Data/Tags (Valid bits per word + Tag) Memories.
+        data = Memory(32, nlines*line_words)
+        tags = Memory(line_words + tag_bits, nlines)
+        data_rd = data.get_port()
+        data_wr = data.get_port(write_capable=True)
+        tags_rd = tags.get_port()
+        tags_wr = tags.get_port(write_capable=True)
+        self.specials += data, tags, data_rd, data_wr, tags_rd, tags_wr
+
+        # Lookups (bus or prefetch address, result on the next cycle).
+        rd_adr     = Signal(len(bus.adr))
+        pf_adr     = Signal(len(bus.adr))
+        pf_lookup  = Signal()
+        valid_mask = Signal(line_words)
+        rd_tag     = Signal(tag_bits)
+        hit        = Signal()
+        self.comb += [
+            If(pf_lookup,
+                rd_adr.eq(pf_adr)
+            ).Else(
+                rd_adr.eq(bus.adr)
+            ),
+            data_rd.adr.eq(rd_adr[:wbits + ibits]),
+            tags_rd.adr.eq(index(rd_adr)),
+            valid_mask.eq(tags_rd.dat_r[:line_words]),
+            rd_tag.eq(tags_rd.dat_r[line_words:]),
+            hit.eq((rd_tag == tag(bus.adr)) & (valid_mask >> word(bus.adr))[0]),
+        ]
+
+        # Fills (sequential slave reads, written to the Memories as read).
+        fill_adr    = Signal(len(bus.adr))
+        fill_mask   = Signal(line_words)
+        fill_mask_d = Signal(line_words)
+        fill_bit    = Signal(line_words)
+        fill_ack    = Signal()
+        self.comb += [
+            fill_bit.eq(Cat(*[word(fill_adr) == i for i in range(line_words)])),
+            data_wr.adr.eq(fill_adr[:wbits + ibits]),
+            data_wr.dat_w.eq(slave.dat_r),
+            tags_wr.adr.eq(index(fill_adr)),
+            tags_wr.dat_w.eq(Cat(fill_mask | fill_bit, tag(fill_adr))),
+            slave.sel.eq(2**len(slave.sel) - 1),
+            bus.dat_r.eq(Mux(fill_ack, slave.dat_r, data_rd.dat_r)),
+        ]
+
+        # Bus requests of the previous cycle (to serve the words read during a fill).
+        req      = Signal()
+        req_d    = Signal()
+        ack_d    = Signal()
+        req_line = Signal()
+        self.comb += [
+            req.eq(bus.cyc & bus.stb & ~bus.we),
+            req_line.eq(line(bus.adr) == line(fill_adr)),
+        ]
+        self.sync += [
+            req_d.eq(req),
+            ack_d.eq(bus.ack),
+            fill_mask_d.eq(fill_mask),
+        ]
+
+        # Next-line prefetch (on misses and on the first access to a prefetched line).
+        pf_pending    = Signal()
+        fill_prefetch = Signal()
+
+        # FSM.
+        self.submodules.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            If(bus.cyc & bus.stb,
+                If(bus.we,
+                    NextState("WRITE")
+                ).Else(
+                    NextState("LOOKUP")
+                )
+            ).Elif(pf_pending,
+                pf_lookup.eq(1),
+                NextValue(pf_pending, 0),
+                NextState("PREFETCH-LOOKUP")
+            )
+        )
+        fsm.act("LOOKUP",
+            If(hit,
+                bus.ack.eq(1),
+                NextState("IDLE")
+            ).Else(
+                # Fill from the missed word (keeping the valid words of the line).
+                NextValue(fill_adr, bus.adr),
+                NextValue(fill_mask, Mux(rd_tag == tag(bus.adr), valid_mask, 0)),
+                NextValue(fill_prefetch, 0),
+                NextValue(pf_pending, prefetch),
+                NextValue(pf_adr, next_line(bus.adr)),
+                NextState("FILL")
+            )
+        )
+        fsm.act("PREFETCH-LOOKUP",
+            If((rd_tag == tag(pf_adr)) & (valid_mask == (2**line_words - 1)),
+                NextState("IDLE")
+            ).Elif(bus.cyc & bus.stb,
+                NextValue(pf_pending, 1),
+                NextState("IDLE")
+            ).Else(
+                NextValue(fill_adr, pf_adr),
+                NextValue(fill_mask, Mux(rd_tag == tag(pf_adr), valid_mask, 0)),
+                NextValue(fill_prefetch, 1),
+                NextState("FILL")
+            )
+        )
+        # First access to a prefetched line: prefetch the following one.
+        pf_next = Signal()
+        self.sync += If(pf_next & fill_prefetch,
+            fill_prefetch.eq(0),
+            pf_pending.eq(1),
+            pf_adr.eq(next_line(fill_adr))
+        )
+        fsm.act("FILL",
+            slave.cyc.eq(1),
+            slave.stb.eq(1),
+            If(slave.ack,
+                data_wr.we.eq(1),
+                tags_wr.we.eq(1),
+                NextValue(fill_mask, fill_mask | fill_bit),
+                NextValue(fill_adr, fill_adr + 1),
+                # Acknowledge the requested word as soon as read.
+                If(req & (bus.adr == fill_adr),
+                    fill_ack.eq(1),
+                    bus.ack.eq(1),
+                    pf_next.eq(1)
+                ),
+                If(word(fill_adr) == (line_words - 1),
+                    NextState("IDLE")
+                ).Else(
+                    NextState("FILL-NEXT")
+                )
+            )
+        )
+        fsm.act("FILL-NEXT",
+            If(bus.cyc & bus.stb,
+                # Serve the valid words of the line (once looked up)...
+                If(req & req_line & (fill_mask_d >> word(bus.adr))[0],
+                    If(req_d & ~ack_d,
+                        bus.ack.eq(1),
+                        pf_next.eq(1),
+                        NextState("FILL")
+                    )
+                # Continue the fill for the next words of the line...
+                ).Elif(req & req_line & (word(bus.adr) >= word(fill_adr)),
+                    NextState("FILL")
+                # Or abort it.
+                ).Else(
+                    NextState("IDLE")
+                )
+            ).Else(
+                NextState("FILL")
+            )
+        )
+        fsm.act("WRITE",
+            slave.cyc.eq(1),
+            slave.stb.eq(1),
+            slave.we.eq(1),
+            bus.ack.eq(slave.ack),
+            If(slave.ack,
+                NextState("IDLE")
+            )
+        )
+        self.comb += [
+            slave.adr.eq(Mux(fsm.ongoing("WRITE"), bus.adr, fill_adr)),
+            slave.dat_w.eq(bus.dat_w),
+        ]
+
+def add_spi_flash_prefetcher(soc, name="spiflash", nlines=4, line_words=8, prefetch=True):
+    """Insert a SPIFlashPrefetcher between the SoC bus and the SPI Flash (add_spi_flash) of name."""
+    soc.check_if_exists(f"{name}_prefetcher")
+    prefetcher = SPIFlashPrefetcher(soc.bus.slaves[name],
+        nlines     = nlines,
+        line_words = line_words,
+        prefetch   = prefetch,
+        adr_width  = log2_int(soc.bus.regions[name].size) - 2)
+    setattr(soc.submodules, f"{name}_prefetcher", prefetcher)
+    soc.bus.slaves[name] = prefetcher.bus
+    soc.logger.info("SPI Flash Prefetcher {} {} ({} lines of {} bytes, Next-Line Prefetch: {}, {} bits of block RAM).".format(
+        colorer(name),
+        colorer("added", color="green"),
+        nlines,
+        4*line_words,
+        prefetch,
+        prefetcher.memory_bits))
+    return prefetcher
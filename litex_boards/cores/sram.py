@@ -0,0 +1,495 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# SRAM controllers shared by the targets with 8-bit asynchronous SRAMs (ISSI IS61WV5128) or 16-bit
+# CellularRAMs (Micron MT45W8MW16BGX).
+
+from math import ceil
+
+from migen import *
+
+from litex.soc.interconnect import wishbone
+from litex.soc.integration.soc import SoCRegion, colorer
+
+# Asynchronous SRAM --------------------------------------------------------------------------------
+
+class AsyncSRAM(Module):
+    """Asynchronous 8-bit SRAM controller with a 32-bit Wishbone interface
+
+    Wishbone accesses are sequenced over the byte lanes of the SRAM (only the selected lanes are
+    written), with read/write cycles derived from sys_clk_freq and the tAA/tWC of the SRAM (+ the
+    I/O delays). Reads are back-to-back (a new byte address each read cycle) and incrementing bursts
+    (CTI=0b010, ex: cache refills) prefetch the next word while the current one is acknowledged.
+
+    The SRAM's OE is expected to be tied low (as on CmodA7/Mercury2): the SRAM is deselected
+    between the write pulses and while the data bus turns around to avoid bus contention.
+    """
+    def __init__(self, pads, size, sys_clk_freq, taa=10e-9, twc=10e-9, io_delay=5e-9):
+        data_width = len(pads.data_o) if hasattr(pads, "data_oe") else len(pads.data)
+        assert data_width == 8
+        self.bus = bus = wishbone.Interface(data_width=32, adr_width=log2_int(size//4))
+
+        # Read/Write cycles (in sys_clk cycles).
+        self.read_cycles  = read_cycles  = max(1, ceil((taa + io_delay)*sys_clk_freq))
+        self.write_cycles = write_cycles = max(1, ceil(twc*sys_clk_freq))
+
+        # # #
+
+        # Pads (registered).
+        addr    = Signal(len(pads.addr))
+        cen     = Signal(reset=1)
+        wen     = Signal(reset=1)
+        data_o  = Signal(8)
+        data_oe = Signal()
+        data_i  = Signal(8)
+        self.comb += [
+            pads.addr.eq(addr),
+            pads.cen.eq(cen),
+            pads.wen.eq(wen),
+        ]
+        if hasattr(pads, "data_oe"):
+            # Simulation.
+            self.comb += [
+                pads.data_o.eq(data_o),
+                pads.data_oe.eq(data_oe),
+                data_i.eq(pads.data_i),
+            ]
+        else:
+            t = TSTriple(8)
+            self.specials += t.get_tristate(pads.data)
+            self.comb += [
+                t.o.eq(data_o),
+                t.oe.eq(data_oe),
+                data_i.eq(t.i),
+            ]
+
+        # Word buffer (last read/prefetched word).
+        word_adr   = Signal(len(bus.adr))
+        word_data  = Signal(32)
+        word_valid = Signal()
+        lane       = Signal(2)
+        timer      = Signal(max=max(read_cycles, write_cycles) + 1)
+        sel        = Signal(4)
+        dat_w      = Signal(32)
+
+        read_hit     = Signal()
+        read_capture = Signal()
+        read_last    = Signal() # Last byte of the word captured in this cycle.
+        self.sync += If(read_capture,
+            Case(lane, {i: word_data[8*i:8*(i+1)].eq(data_i) for i in range(4)})
+        )
+        self.comb += [
+            read_hit.eq(bus.cyc & bus.stb & ~bus.we & (bus.adr == word_adr)),
+            bus.dat_r.eq(word_data),
+            If(read_last,
+                bus.dat_r[24:].eq(data_i)
+            )
+        ]
+
+        def read(adr):
+            return [
+                NextValue(word_valid, 0),
+                NextValue(word_adr, adr),
+                NextValue(addr, Cat(C(0, 2), adr)),
+                NextValue(cen, 0),
+                NextValue(lane, 0),
+                NextValue(timer, read_cycles - 1),
+                NextState("READ")
+            ]
+
+        # Writes: one CE/WE pulse of write_cycles per selected byte lane, separated by a deselect
+        # cycle (address/data hold, no bus contention with the SRAM's outputs).
+        write_next = [
+            NextValue(lane,  lane + 1),
+            NextValue(sel,   sel[1:]),
+            NextValue(dat_w, dat_w[8:]),
+            If(lane == 3,
+                bus.ack.eq(1),
+                NextValue(data_oe, 0),
+                NextState("IDLE")
+            ).Else(
+                NextState("WRITE")
+            )
+        ]
+
+        def write(lane_sel, adr, lane, data, *skip):
+            return [If(lane_sel,
+                NextValue(addr, Cat(lane, adr)),
+                NextValue(data_o, data),
+                NextValue(data_oe, 1),
+                NextValue(cen, 0),
+                NextValue(wen, 0),
+                NextValue(timer, write_cycles - 1),
+                NextState("WRITE-PULSE")
+            ).Else(*skip)]
+
+        self.submodules.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            If(bus.cyc & bus.stb,
+                If(bus.we,
+                    NextValue(word_valid, 0),
+                    NextValue(word_adr, bus.adr),
+                    NextValue(sel, bus.sel),
+                    NextValue(dat_w, bus.dat_w),
+                    NextValue(lane, 0),
+                    *write(bus.sel[0], bus.adr, C(0, 2), bus.dat_w[:8], NextState("WRITE"))
+                ).Elif(read_hit & word_valid,
+                    bus.ack.eq(1),
+                    # Incrementing burst: prefetch the next word.
+                    If(bus.cti == 0b010,
+                        *read(bus.adr + 1)
+                    )
+                ).Else(
+                    *read(bus.adr)
+                )
+            )
+        )
+        # Reads: a new byte address each read_cycles (back-to-back), the word is acknowledged with
+        # its last byte and incrementing bursts continue with the next word.
+        fsm.act("READ",
+            NextValue(timer, timer - 1),
+            If(timer == 0,
+                read_capture.eq(1),
+                NextValue(lane, lane + 1),
+                NextValue(addr, Cat((lane + 1)[:2], word_adr)),
+                NextValue(timer, read_cycles - 1),
+                If(lane == 3,
+                    read_last.eq(1),
+                    If(read_hit,
+                        bus.ack.eq(1)
+                    ),
+                    If(read_hit & (bus.cti == 0b010),
+                        *read(word_adr + 1)
+                    ).Else(
+                        NextValue(cen, 1),
+                        NextValue(word_valid, 1),
+                        NextState("IDLE")
+                    )
+                )
+            )
+        )
+        fsm.act("WRITE", *write(sel[0], word_adr, lane, dat_w[:8], *write_next))
+        fsm.act("WRITE-PULSE",
+            NextValue(timer, timer - 1),
+            If(timer == 0,
+                NextValue(cen, 1),
+                NextValue(wen, 1),
+                *write_next
+            )
+        )
+
+# CellularRAM --------------------------------------------------------------------------------------
+
+# Max CLK frequency of the CellularRAM latency codes (MT45W8MW16BGX).
+cellularram_latency_codes = {
+    "variable" : {2: 66e6, 3: 104e6},
+    "fixed"    : {2: 33e6, 3: 52e6, 4: 66e6, 5: 75e6, 6: 104e6},
+}
+
+cellularram_burst_codes = {4: 0b001, 8: 0b010, 16: 0b011, 32: 0b100}
+
+class CellularRAM(Module):
+    """16-bit CellularRAM controller with a 32-bit Wishbone interface
+
+    In "sync" mode, the Bus Configuration Register (BCR) is written at startup (through CRE) to
+    switch the CellularRAM to synchronous burst mode with the selected latency ("variable": first
+    data flagged by WAIT, "fixed": first data after the latency code) and burst length (in 16-bit
+    words, ex: 16 for 32-byte cache lines). Read misses then refill a line buffer with a wrapping
+    burst clocked at sys_clk_freq/2 on CLK (requested word first), reads of the line are served from
+    it as soon as their words are captured. Writes
+    are asynchronous (CLK held low), which the CellularRAM also accepts in synchronous mode.
+
+    In "async" mode (fallback, BCR left to its default), the CellularRAM is accessed as an
+    asynchronous SRAM with read/write cycles derived from sys_clk_freq and its 70ns tAA/tWC.
+    """
+    def __init__(self, pads, sys_clk_freq,
+        mode         = "sync",
+        latency      = "variable",
+        burst_length = 16,
+        taa          = 70e-9,
+        twc          = 70e-9,
+        tpu          = 150e-6,
+        io_delay     = 5e-9):
+        assert mode    in ["sync", "async"]
+        assert latency in ["variable", "fixed"]
+        assert burst_length in cellularram_burst_codes
+        data_width = len(pads.data_o) if hasattr(pads, "data_oe") else len(pads.data)
+        assert data_width == 16
+        self.bus = bus = wishbone.Interface(data_width=32, adr_width=len(pads.addr) - 1)
+
+        # Read/Write cycles (in sys_clk cycles), latency code and BCR.
+        self.read_cycles  = read_cycles  = max(1, ceil((taa + io_delay)*sys_clk_freq))
+        self.write_cycles = write_cycles = max(1, ceil(twc*sys_clk_freq))
+        self.latency_code = latency_code = min(code
+            for code, freq in cellularram_latency_codes[latency].items() if freq >= sys_clk_freq/2)
+        self.bcr = bcr = (
+            (0b10                                  << 18) | # Register Select: BCR.
+            (0                                     << 15) | # Operating Mode: Synchronous burst.
+            ((latency == "fixed")                  << 14) | # Initial Latency: Variable/Fixed.
+            (latency_code                          << 11) | # Latency Counter.
+            (1                                     << 10) | # WAIT Polarity: Active high.
+            (0                                     <<  8) | # WAIT Configuration: Asserted during delay.
+            (0b01                                  <<  4) | # Drive Strength: 1/2.
+            (0                                     <<  3) | # Burst Wrap: Wrap within burst length.
+            (cellularram_burst_codes[burst_length] <<  0))  # Burst Length.
+        line_length = burst_length if mode == "sync" else 2 # In 16-bit words.
+
+        # # #
+
+        # Pads (registered).
+        addr    = Signal(len(pads.addr))
+        cen     = Signal(reset=1)
+        wen     = Signal(reset=1)
+        oen     = Signal(reset=1)
+        adv     = Signal(reset=1)
+        cre     = Signal()
+        clk     = Signal()
+        lb      = Signal(reset=1)
+        ub      = Signal(reset=1)
+        data_o  = Signal(16)
+        data_oe = Signal()
+        data_i  = Signal(16)
+        wait    = Signal()
+        self.comb += [
+            pads.addr.eq(addr),
+            pads.cen.eq(cen),
+            pads.wen.eq(wen),
+            pads.oen.eq(oen),
+            pads.adv.eq(adv),
+            pads.cre.eq(cre),
+            pads.clk.eq(clk),
+            pads.lb.eq(lb),
+            pads.ub.eq(ub),
+            wait.eq(pads.wait),
+        ]
+        if hasattr(pads, "data_oe"):
+            # Simulation.
+            self.comb += [
+                pads.data_o.eq(data_o),
+                pads.data_oe.eq(data_oe),
+                data_i.eq(pads.data_i),
+            ]
+        else:
+            t = TSTriple(16)
+            self.specials += t.get_tristate(pads.data)
+            self.comb += [
+                t.o.eq(data_o),
+                t.oe.eq(data_oe),
+                data_i.eq(t.i),
+            ]
+
+        # Line buffer (last read line).
+        line_words  = line_length//2 # In 32-bit words.
+        line        = Array(Signal(16) for i in range(line_length))
+        line_tag    = Signal(len(bus.adr) - log2_int(line_words))
+        line_filled = Signal(line_length) # Per 16-bit word.
+        line_offset = Signal(max=max(line_words, 2))
+        line_hit    = Signal()
+        index       = Signal(log2_int(line_length))
+        count       = Signal(max=line_length + 1)
+        edges       = Signal(8)
+        timer       = Signal(max=max(read_cycles, write_cycles, int(tpu*sys_clk_freq)) + 1)
+        lane        = Signal()
+        adr         = Signal(len(bus.adr))
+        sel         = Signal(4)
+        dat_w       = Signal(32)
+        capture     = Signal()
+
+        bus_tag = bus.adr[log2_int(line_words):]
+        if line_words > 1:
+            self.comb += line_offset.eq(bus.adr[:log2_int(line_words)])
+        self.comb += [
+            bus.dat_r.eq(Cat(line[2*line_offset + 0], line[2*line_offset + 1])),
+            line_hit.eq(~bus.we & (bus_tag == line_tag) & ((line_filled >> 2*line_offset)[:2] == 0b11)),
+        ]
+        self.sync += If(capture,
+            line[index].eq(data_i),
+            line_filled.eq(line_filled | (1 << index))
+        )
+
+        self.submodules.fsm = fsm = FSM(reset_state="POWER-UP")
+        fsm.act("POWER-UP",
+            NextValue(timer, timer + 1),
+            If(timer == int(tpu*sys_clk_freq),
+                NextState("CONFIGURE" if mode == "sync" else "IDLE")
+            )
+        )
+        # BCR write: asynchronous write with CRE high, the BCR value on the address bus.
+        fsm.act("CONFIGURE",
+            NextValue(addr, bcr),
+            NextValue(cre, 1),
+            NextValue(cen, 0),
+            NextValue(adv, 0),
+            NextValue(wen, 0),
+            NextValue(timer, write_cycles - 1),
+            NextState("CONFIGURE-WAIT")
+        )
+        fsm.act("CONFIGURE-WAIT",
+            NextValue(timer, timer - 1),
+            If(timer == 0,
+                NextValue(cen, 1),
+                NextValue(adv, 1),
+                NextValue(wen, 1),
+                NextState("CONFIGURE-END")
+            )
+        )
+        fsm.act("CONFIGURE-END",
+            NextValue(cre, 0),
+            NextState("IDLE")
+        )
+        fsm.act("IDLE",
+            If(bus.cyc & bus.stb,
+                If(bus.we,
+                    If(bus_tag == line_tag,
+                        NextValue(line_filled, 0)
+                    ),
+                    NextValue(adr, bus.adr),
+                    NextValue(sel, bus.sel),
+                    NextValue(dat_w, bus.dat_w),
+                    NextValue(lane, 0),
+                    NextState("WRITE")
+                ).Elif(line_hit,
+                    bus.ack.eq(1)
+                ).Else(
+                    # Requested word first, then the rest of the line (wrapping burst).
+                    NextValue(line_filled, 0),
+                    NextValue(line_tag, bus_tag),
+                    NextValue(index, Cat(C(0, 1), line_offset)),
+                    NextValue(addr, Cat(C(0, 1), bus.adr)),
+                    NextValue(cen, 0),
+                    NextValue(adv, 0),
+                    NextValue(oen, 0),
+                    NextValue(lb, 0),
+                    NextValue(ub, 0),
+                    NextValue(count, 0),
+                    NextValue(edges, 0),
+                    NextValue(timer, read_cycles - 1),
+                    NextState("BURST" if mode == "sync" else "READ")
+                )
+            )
+        )
+        read_end = [
+            NextValue(cen, 1),
+            NextValue(adv, 1),
+            NextValue(oen, 1),
+            NextValue(lb, 1),
+            NextValue(ub, 1),
+            NextValue(clk, 0),
+            NextState("IDLE")
+        ]
+        line_miss = bus.cyc & bus.stb & ~line_hit & (bus.we | (bus_tag != line_tag))
+        # Asynchronous reads: one word each read_cycles (address changes with CE held low).
+        fsm.act("READ",
+            NextValue(timer, timer - 1),
+            If(timer == 0,
+                capture.eq(1),
+                NextValue(index, index + 1),
+                NextValue(count, count + 1),
+                NextValue(addr, Cat((index + 1)[:len(index)], line_tag)),
+                NextValue(timer, read_cycles - 1),
+                If(count == (line_length - 1),
+                    *read_end
+                )
+            )
+        )
+        # Synchronous burst reads: the address is latched on the first CLK rising edge (ADV low),
+        # data launched on a rising edge is captured just before the next one (CLK low). The words
+        # of the line are acknowledged as soon as captured and the burst is terminated (CE high) on
+        # an access outside of the line.
+        first_data = Signal()
+        if latency == "fixed":
+            self.comb += first_data.eq(edges > latency_code)
+        else:
+            self.comb += first_data.eq((edges > 1) & ~wait)
+        fsm.act("BURST",
+            If(line_hit,
+                bus.ack.eq(1)
+            ),
+            If(clk,
+                NextValue(clk, 0),
+                NextValue(adv, 1),
+            ).Else(
+                NextValue(clk, 1),
+                NextValue(edges, edges + 1),
+                If(line_miss,
+                    *read_end
+                ).Elif(first_data,
+                    capture.eq(1),
+                    NextValue(index, index + 1),
+                    NextValue(count, count + 1),
+                    If(count == (line_length - 1),
+                        *read_end
+                    )
+                )
+            )
+        )
+        # Asynchronous writes: one CE/WE pulse of write_cycles per selected 16-bit word, separated
+        # by a deselect cycle.
+        fsm.act("WRITE",
+            If(sel[:2] != 0,
+                NextValue(addr, Cat(lane, adr)),
+                NextValue(data_o, dat_w[:16]),
+                NextValue(data_oe, 1),
+                NextValue(lb, ~sel[0]),
+                NextValue(ub, ~sel[1]),
+                NextValue(cen, 0),
+                NextValue(adv, 0),
+                NextValue(wen, 0),
+                NextValue(timer, write_cycles - 1),
+                NextState("WRITE-PULSE")
+            ).Else(
+                NextState("WRITE-NEXT")
+            )
+        )
+        fsm.act("WRITE-PULSE",
+            NextValue(timer, timer - 1),
+            If(timer == 0,
+                NextValue(cen, 1),
+                NextValue(adv, 1),
+                NextValue(wen, 1),
+                NextState("WRITE-NEXT")
+            )
+        )
+        fsm.act("WRITE-NEXT",
+            NextValue(lane,  1),
+            NextValue(sel,   sel[2:]),
+            NextValue(dat_w, dat_w[16:]),
+            If(lane,
+                bus.ack.eq(1),
+                NextValue(data_oe, 0),
+                NextValue(lb, 1),
+                NextValue(ub, 1),
+                NextState("IDLE")
+            ).Else(
+                NextState("WRITE")
+            )
+        )
+
+def add_async_sram(soc, pads, name="main_ram", origin=0x40000000, size=512*1024, **kwargs):
+    """Add an AsyncSRAM to the SoC bus (kwargs: tAA/tWC/I/O delays of the SRAM)."""
+    soc.check_if_exists(name)
+    sram = AsyncSRAM(pads, size, soc.sys_clk_freq, **kwargs)
+    setattr(soc.submodules, name, sram)
+    soc.bus.add_slave(name, sram.bus, SoCRegion(origin=origin, size=size, mode="rw"))
+    soc.logger.info("AsyncSRAM {} {} {} (Read: {} cycles/byte, Write: {} cycles/byte).".format(
+        colorer(name),
+        colorer("added", color="green"),
+        soc.bus.regions[name],
+        sram.read_cycles,
+        sram.write_cycles + 1))
+
+def add_cellular_ram(soc, pads, name="main_ram", origin=0x40000000, size=16*1024*1024, **kwargs):
+    """Add a CellularRAM to the SoC bus (kwargs: mode/latency/burst_length/timings)."""
+    soc.check_if_exists(name)
+    ram = CellularRAM(pads, soc.sys_clk_freq, **kwargs)
+    setattr(soc.submodules, name, ram)
+    soc.bus.add_slave(name, ram.bus, SoCRegion(origin=origin, size=size, mode="rw"))
+    soc.logger.info("CellularRAM {} {} {} ({}).".format(
+        colorer(name),
+        colorer("added", color="green"),
+        soc.bus.regions[name],
+        "Async, Read: {} cycles, Write: {} cycles".format(ram.read_cycles, ram.write_cycles + 1)
+        if kwargs.get("mode", "sync") == "async" else
+        "Sync Burst, BCR: 0x{:05x}, Latency Code: {}".format(ram.bcr, ram.latency_code)))
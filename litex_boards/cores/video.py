@@ -0,0 +1,213 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Video capture to SDRAM ring buffers and readout to PCIe DMAs (ex: Decklink Quad HDMI Recorder).
+
+from migen import *
+from migen.genlib.cdc import MultiReg, BusSynchronizer
+
+from litex.soc.interconnect import stream
+from litex.soc.interconnect.csr import *
+from litex.soc.cores.video import video_data_layout
+
+from litedram.frontend.dma import LiteDRAMDMAReader, LiteDRAMDMAWriter
+
+# Video Capture ------------------------------------------------------------------------------------
+
+class VideoCapture(Module, AutoCSR):
+    """Video capture to a SDRAM ring buffer of nframes frames with frame readout
+
+    The active pixels of the video sink (in clock_domain) are packed in 32-bit words (RGB888, as
+    VideoFrameBuffer) and written with burst DMA writes (one SDRAM port word per write) to the
+    ring buffer slots, the writes restarting at the next slot on each frame start (first active
+    pixel after VSync). Each completed frame is then read back from its slot and streamed on source
+    (SDRAM port data width, last on the last word of the frame) if the readout is idle (and
+    readout_enable is set), otherwise it is counted as dropped. The readout always streams full
+    frames so that a DMA using frame_size descriptors stays aligned to the frames.
+
+    The video sink can't be stalled: the active pixels that can't enter the input buffering (full
+    when the SDRAM writes don't keep up) are lost and counted in dropped_pixels.
+    """
+    def __init__(self, write_port, read_port, base, frame_size, nframes=4, clock_domain="sys",
+        cdc_depth  = 64,
+        fifo_depth = 256):
+        assert write_port.data_width == read_port.data_width
+        data_width  = write_port.data_width
+        frame_words = frame_size//(data_width//8)
+        assert frame_words*(data_width//8) == frame_size
+        self.sink           = sink   = stream.Endpoint(video_data_layout)
+        self.source         = source = stream.Endpoint([("data", data_width)])
+        self.readout_enable = Signal(reset=1)
+
+        self._enable         = CSRStorage(description="Capture Enable.")
+        self._frames         = CSRStatus(32, description="Captured frames.")
+        self._slot           = CSRStatus(bits_for(nframes - 1), description="Slot of the last captured frame.")
+        self._dropped        = CSRStatus(32, description="Captured frames not read out.")
+        self._dropped_pixels = CSRStatus(32, description="Active pixels lost on input overflow.")
+
+        # # #
+
+        slots = Array(base//(data_width//8) + i*frame_words for i in range(nframes))
+
+        # Pixels (Active/32-bit, first on Start of Frame).
+        pixel     = stream.Endpoint([("data", 32)])
+        new_frame = Signal()
+        sync = getattr(self.sync, clock_domain)
+        sync += [
+            If(sink.valid & sink.vsync,
+                new_frame.eq(1)
+            ).Elif(pixel.valid,
+                new_frame.eq(0)
+            )
+        ]
+        self.comb += [
+            sink.ready.eq(1),
+            pixel.valid.eq(sink.valid & sink.de),
+            pixel.first.eq(new_frame),
+            pixel.data.eq(Cat(sink.r, sink.g, sink.b)),
+        ]
+
+        # Clock Domain Crossing / Data-Width Conversion / Buffering.
+        if clock_domain != "sys":
+            self.submodules.cdc = stream.ClockDomainCrossing([("data", 32)],
+                cd_from = clock_domain,
+                cd_to   = "sys",
+                depth   = cdc_depth)
+            self.comb += pixel.connect(self.cdc.sink)
+            pixel = self.cdc.source
+        self.submodules.conv = stream.Converter(32, data_width)
+        self.submodules.fifo = stream.SyncFIFO([("data", data_width)], fifo_depth, buffered=True)
+        self.comb += [
+            pixel.connect(self.conv.sink),
+            self.conv.source.connect(self.fifo.sink),
+        ]
+
+        # Dropped Pixels (Input Overflow).
+        input_pixel    = self.cdc.sink if clock_domain != "sys" else self.conv.sink
+        dropped_pixels = Signal(32)
+        sync += If(input_pixel.valid & ~input_pixel.ready,
+            dropped_pixels.eq(dropped_pixels + 1)
+        )
+        if clock_domain != "sys":
+            self.submodules.dropped_pixels_sync = BusSynchronizer(32, clock_domain, "sys")
+            self.comb += [
+                self.dropped_pixels_sync.i.eq(dropped_pixels),
+                self._dropped_pixels.status.eq(self.dropped_pixels_sync.o),
+            ]
+        else:
+            self.comb += self._dropped_pixels.status.eq(dropped_pixels)
+
+        # Ring Buffer Writes.
+        enable     = Signal()
+        slot       = Signal(max=nframes)
+        offset     = Signal(max=frame_words + 1, reset=frame_words)
+        wr_slot    = Signal(max=nframes)
+        wr_offset  = Signal(max=frame_words + 1)
+        frame_done = Signal()
+        done_slot  = Signal(max=nframes)
+        self.specials += MultiReg(self._enable.storage, enable)
+        self.submodules.writer = writer = LiteDRAMDMAWriter(write_port, fifo_depth=16)
+        self.comb += [
+            # Start of Frame: restart at the next slot (if the current one has been written to).
+            wr_slot.eq(slot),
+            wr_offset.eq(offset),
+            If(self.fifo.source.first,
+                If(offset != 0,
+                    wr_slot.eq(Mux(slot == (nframes - 1), 0, slot + 1))
+                ),
+                wr_offset.eq(0)
+            ),
+            writer.sink.valid.eq(self.fifo.source.valid & enable & (wr_offset < frame_words)),
+            writer.sink.address.eq(slots[wr_slot] + wr_offset),
+            writer.sink.data.eq(self.fifo.source.data),
+            # Drop the words when disabled or exceeding the frame.
+            self.fifo.source.ready.eq(writer.sink.ready | ~writer.sink.valid),
+        ]
+        self.sync += [
+            frame_done.eq(0),
+            If(self.fifo.source.valid & self.fifo.source.ready,
+                slot.eq(wr_slot),
+                If(writer.sink.valid,
+                    offset.eq(wr_offset + 1),
+                    If(wr_offset == (frame_words - 1),
+                        frame_done.eq(1),
+                        done_slot.eq(wr_slot)
+                    )
+                ).Else(
+                    offset.eq(frame_words)
+                )
+            ),
+            If(frame_done,
+                self._frames.status.eq(self._frames.status + 1),
+                self._slot.status.eq(done_slot)
+            )
+        ]
+
+        # Frame Readout.
+        rd_base   = Signal(len(read_port.cmd.addr))
+        rd_count  = Signal(max=frame_words)
+        out_count = Signal(max=frame_words)
+        self.submodules.reader = reader = LiteDRAMDMAReader(read_port, fifo_depth=fifo_depth, fifo_buffered=True)
+        self.submodules.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            If(frame_done,
+                If(self.readout_enable,
+                    NextValue(rd_base, slots[done_slot]),
+                    NextValue(rd_count, 0),
+                    NextState("READ")
+                ).Else(
+                    NextValue(self._dropped.status, self._dropped.status + 1)
+                )
+            )
+        )
+        fsm.act("READ",
+            reader.sink.valid.eq(1),
+            reader.sink.address.eq(rd_base + rd_count),
+            If(reader.sink.ready,
+                NextValue(rd_count, rd_count + 1),
+                If(rd_count == (frame_words - 1),
+                    NextState("IDLE")
+                )
+            ),
+            If(frame_done,
+                NextValue(self._dropped.status, self._dropped.status + 1)
+            )
+        )
+        self.comb += [
+            reader.source.connect(source, omit={"last"}),
+            source.last.eq(out_count == (frame_words - 1)),
+        ]
+        self.sync += If(source.valid & source.ready,
+            out_count.eq(out_count + 1),
+            If(source.last,
+                out_count.eq(0)
+            )
+        )
+
+def add_video_capture(soc, name, source, dma, base, frame_size, nframes=4, clock_domain="sys"):
+    """Capture the video source (video_data_layout, in clock_domain) to a ring buffer of nframes
+    frames at base (SDRAM offset) and stream the frames to a LitePCIe DMA (host descriptors of
+    frame_size bytes: one frame per descriptor)."""
+    soc.check_if_exists(name)
+    write_port = soc.sdram.crossbar.get_port(mode="write")
+    read_port  = soc.sdram.crossbar.get_port(mode="read")
+    capture    = VideoCapture(write_port, read_port,
+        base         = base,
+        frame_size   = frame_size,
+        nframes      = nframes,
+        clock_domain = clock_domain)
+    setattr(soc.submodules, name, capture)
+    conv = stream.Converter(read_port.data_width, len(dma.sink.data))
+    setattr(soc.submodules, f"{name}_conv", conv)
+    soc.comb += [
+        source.connect(capture.sink),
+        capture.readout_enable.eq(dma.writer.enable),
+        capture.source.connect(conv.sink),
+        conv.source.connect(dma.sink),
+    ]
+    soc.add_constant(f"{name.upper()}_BASE",       base)
+    soc.add_constant(f"{name.upper()}_FRAME_SIZE", frame_size)
+    soc.add_constant(f"{name.upper()}_NFRAMES",    nframes)
+    return capture
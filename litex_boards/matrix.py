@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""
+Multi-configuration (matrix) builder.
+
+Builds a target for each point of a parameter grid: each configuration is elaborated in its own
+process and output directory (in parallel), then the toolchain runs go through a bounded queue to
+avoid oversubscribing the cores/RAM of the machine with Vivado/nextpnr instances. A summary of the
+timing closure and utilization of each configuration is reported at the end.
+
+Ex:
+    python3 -m litex_boards.matrix litex_boards.targets.digilent_arty \\
+        --param variant=a7-35,a7-100 --param sys-clk-freq=100e6,125e6 --build -- --with-ethernet
+"""
+
+import os
+import re
+import sys
+import glob
+import time
+import argparse
+import itertools
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+import litex_boards
+from litex_boards.cache import get_build_script
+
+# Directory containing the litex_boards package (so that targets can be run from any directory).
+_python_path = os.path.dirname(litex_boards.litex_boards_dir)
+
+# Grid ---------------------------------------------------------------------------------------------
+
+def parse_param(param):
+    """Parse a "name=value0,value1" parameter, returns (name, [values])."""
+    name, _, values = param.partition("=")
+    if not values:
+        raise ValueError(f"Invalid parameter {param}, expected name=value0,value1,...")
+    return name.lstrip("-"), values.split(",")
+
+def get_configs(params):
+    """Return the configurations of the grid as [(config_name, [target args])]."""
+    configs = []
+    names   = [name for name, values in params]
+    for values in itertools.product(*[values for name, values in params]):
+        config_name = "_".join(f"{n}={v}" for n, v in zip(names, values)) or "default"
+        config_name = re.sub(r"[^\w=.+-]", "_", config_name)
+        config_args = []
+        for n, v in zip(names, values):
+            config_args += [f"--{n}"] if v == "" else [f"--{n}={v}"]
+        configs.append((config_name, config_args))
+    return configs
+
+# Reports ------------------------------------------------------------------------------------------
+
+def _read(filename):
+    try:
+        with open(filename, errors="replace") as f:
+            return f.read()
+    except OSError:
+        return ""
+
+def parse_vivado_reports(gateware_dir):
+    summary = {}
+    # Timing (WNS).
+    # Prefer post-route report over synthesis one.
+    reports = glob.glob(os.path.join(gateware_dir, "*_timing.rpt"))
+    for report in reports or glob.glob(os.path.join(gateware_dir, "*_timing*.rpt")):
+        m = re.search(r"WNS\(ns\).*\n[\s-]+\n\s*(-?[\d.]+)", _read(report))
+        if m is not None:
+            summary["wns"] = float(m.group(1))
+    # Utilization.
+    resources = {
+        "luts" : r"\|\s*(?:Slice|CLB) LUTs\*?\s*\|\s*(\d+)",
+        "regs" : r"\|\s*(?:Slice|CLB) Registers\s*\|\s*(\d+)",
+        "bram" : r"\|\s*Block RAM Tile\s*\|\s*([\d.]+)",
+        "dsp"  : r"\|\s*DSPs\s*\|\s*(\d+)",
+    }
+    for report in glob.glob(os.path.join(gateware_dir, "*_utilization*place*.rpt")):
+        content = _read(report)
+        for name, regexp in resources.items():
+            m = re.search(regexp, content)
+            if m is not None:
+                summary[name] = float(m.group(1))
+    return summary
+
+def parse_nextpnr_log(log):
+    summary = {}
+    # Timing (Fmax of the slowest clock).
+    fmax = [float(f) for f in re.findall(r"Max frequency for clock\s+'[^']*':\s+([\d.]+) MHz", log)]
+    if fmax:
+        summary["fmax"] = min(fmax)
+    # Utilization.
+    for resource, used, available in re.findall(r"Info:\s+(\w+):\s+(\d+)/\s*(\d+)", log):
+        summary[resource.lower()] = float(used)
+    return summary
+
+def get_summary(gateware_dir, log):
+    summary = parse_vivado_reports(gateware_dir)
+    summary.update(parse_nextpnr_log(log))
+    return summary
+
+# Matrix Builder -----------------------------------------------------------------------------------
+
+class Config:
+    def __init__(self, name, args, output_dir):
+        self.name       = name
+        self.args       = args
+        self.output_dir = output_dir
+        self.status     = "pending"
+        self.durations  = {}
+        self.summary    = {}
+
+    @property
+    def gateware_dir(self):
+        return os.path.join(self.output_dir, "gateware")
+
+class MatrixBuilder:
+    def __init__(self, target, configs, output_dir, jobs=None, toolchain_jobs=None):
+        self.target         = target
+        self.configs        = [Config(name, args, os.path.join(output_dir, name)) for name, args in configs]
+        self.jobs           = jobs or os.cpu_count() or 1
+        # Toolchains are multi-threaded and memory hungry: default to 1 run per 4 cores.
+        self.toolchain_jobs = toolchain_jobs or max(1, (os.cpu_count() or 1)//4)
+
+    def _run(self, config, step, cmd, cwd):
+        start = time.perf_counter()
+        os.makedirs(config.output_dir, exist_ok=True)
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [_python_path, env.get("PYTHONPATH", "")]))
+        with open(os.path.join(config.output_dir, f"{step}.log"), "w+") as log:
+            r = subprocess.run(cmd, cwd=cwd, env=env, stdout=log, stderr=subprocess.STDOUT)
+            log.seek(0)
+            output = log.read()
+        config.durations[step] = time.perf_counter() - start
+        if r.returncode != 0:
+            config.status = f"{step} failed"
+        return output
+
+    def elaborate(self, config):
+        # Generate the gateware only (toolchain runs are done from the queue).
+        cmd = [sys.executable, "-m", self.target] + config.args + ["--output-dir", config.output_dir]
+        self._run(config, "elaborate", cmd, cwd=config.output_dir)
+
+    def build(self, config):
+        if config.status != "pending":
+            return
+        scripts = glob.glob(os.path.join(config.gateware_dir, "build_*.sh"))
+        build_name = os.path.basename(scripts[0])[len("build_"):-len(".sh")] if scripts else "top"
+        script = get_build_script(config.gateware_dir, build_name)
+        if script is None:
+            config.status = "no build script"
+            return
+        log = self._run(config, "build", script, cwd=config.gateware_dir)
+        config.summary = get_summary(config.gateware_dir, log)
+        if config.status == "pending":
+            config.status = "built"
+
+    def run(self, build=True):
+        with ThreadPoolExecutor(max_workers=self.toolchain_jobs) as toolchain_queue:
+            builds = []
+            def elaborate(config):
+                self.elaborate(config)
+                if build:
+                    builds.append(toolchain_queue.submit(self.build, config))
+                elif config.status == "pending":
+                    config.status = "elaborated"
+            with ThreadPoolExecutor(max_workers=self.jobs) as elaboration_pool:
+                list(elaboration_pool.map(elaborate, self.configs))
+            for b in builds:
+                b.result()
+        return self.configs
+
+    def print_summary(self):
+        columns = []
+        for config in self.configs:
+            for column in config.summary:
+                if column not in columns:
+                    columns.append(column)
+        print(f"\n{'Configuration':48s} {'Status':20s} {'Elab (s)':>9s} {'Build (s)':>10s}" +
+            "".join(f"{c:>14s}" for c in columns))
+        for config in self.configs:
+            line  = f"{config.name:48s} {config.status:20s}"
+            line += f"{config.durations.get('elaborate', 0):9.1f} {config.durations.get('build', 0):10.1f}"
+            for column in columns:
+                value = config.summary.get(column, None)
+                line += f"{'-':>14s}" if value is None else f"{value:14.3f}"
+            print(line)
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards multi-configuration builder.")
+    parser.add_argument("target",                                   help="Target module (ex: litex_boards.targets.digilent_arty).")
+    parser.add_argument("--param",          action="append", default=[], help="Parameter grid axis: name=value0,value1,...")
+    parser.add_argument("--build",          action="store_true",    help="Run the toolchain (elaborate only otherwise).")
+    parser.add_argument("--output-dir",     default="build_matrix", help="Base output directory.")
+    parser.add_argument("--jobs",           default=None, type=int, help="Parallel elaborations (default: number of CPUs).")
+    parser.add_argument("--toolchain-jobs", default=None, type=int, help="Parallel toolchain runs (default: number of CPUs/4).")
+    parser.epilog = "Common target arguments can be passed after --."
+
+    # Split matrix/target arguments.
+    argv        = sys.argv[1:]
+    target_args = []
+    if "--" in argv:
+        argv, target_args = argv[:argv.index("--")], argv[argv.index("--") + 1:]
+    args = parser.parse_args(argv)
+
+    configs = get_configs([parse_param(param) for param in args.param])
+    configs = [(name, target_args + config_args) for name, config_args in configs]
+    matrix  = MatrixBuilder(args.target, configs,
+        output_dir     = os.path.abspath(args.output_dir),
+        jobs           = args.jobs,
+        toolchain_jobs = args.toolchain_jobs)
+    matrix.run(build=args.build)
+    matrix.print_summary()
+    if any(config.status.endswith("failed") for config in matrix.configs):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
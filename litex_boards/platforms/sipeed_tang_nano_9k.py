@@ -42,6 +42,11 @@ _io = [
         Subsignal("miso", Pins("62"), IOStandard("LVCMOS33")),
         Subsignal("mosi", Pins("61"), IOStandard("LVCMOS33")),
     ),
+    ("spiflash2x", 0, # Only IO0 (MOSI)/IO1 (MISO) are wired.
+        Subsignal("cs_n", Pins("60"), IOStandard("LVCMOS33")),
+        Subsignal("clk",  Pins("59"), IOStandard("LVCMOS33")),
+        Subsignal("dq",   Pins("61 62"), IOStandard("LVCMOS33")),
+    ),
 
     ("spisdcard", 0,
         Subsignal("clk",  Pins("36")),
@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""
+Boards registry.
+
+Index of the platforms/targets built from a static (AST) scan of the sources: lookups never import
+the platforms/targets (and their migen/LiteX/cores dependencies). The index (content hash and info
+of each file) is shipped as JSON next to this file and updated incrementally in memory: a file is
+only re-scanned when its content hash changed, the hashes only being re-computed when the mtime
+changed (mtimes are machine specific and kept in a user cache, LITEX_BOARDS_REGISTRY_CACHE).
+
+Ex:
+    from litex_boards import registry
+    registry.targets(family="ECP5", feature="ethernet")
+
+To regenerate the shipped index: python3 -m litex_boards.registry --update
+"""
+
+import os
+import sys
+import ast
+import json
+import hashlib
+import argparse
+import itertools
+
+import litex_boards
+
+REGISTRY_VERSION = 2
+REGISTRY_FILE    = os.path.join(litex_boards.litex_boards_dir, "registry.json")
+MTIMES_FILE      = os.environ.get("LITEX_BOARDS_REGISTRY_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "litex_boards", "registry_mtimes.json"))
+
+# FPGA Families ------------------------------------------------------------------------------------
+
+# (Device prefix, Family), first match wins (so longest prefixes first).
+_families = [
+    # Xilinx.
+    ("xc6s",    "Spartan6"),
+    ("xc7a",    "Artix7"),
+    ("xc7k",    "Kintex7"),
+    ("xc7s",    "Spartan7"),
+    ("xc7v",    "Virtex7"),
+    ("xc7z",    "Zynq7000"),
+    ("xcku",    "Kintex UltraScale"),
+    ("xcvu",    "Virtex UltraScale+"),
+    ("xczu",    "Zynq UltraScale+"),
+    ("xcu",     "Virtex UltraScale+"),
+    # Lattice.
+    ("ice40",   "iCE40"),
+    ("lfe5",    "ECP5"),
+    ("lifcl",   "CrossLink-NX"),
+    ("lcmxo",   "MachXO"),
+    # Intel/Altera.
+    ("10cl",    "Cyclone10"),
+    ("10m",     "MAX10"),
+    ("5c",      "Cyclone5"),
+    ("ep3c",    "Cyclone3"),
+    ("ep4ce",   "Cyclone4"),
+    # Gowin.
+    ("gw1n",    "GW1N"),
+    ("gw2a",    "GW2A"),
+    # Efinix.
+    ("ti",      "Titanium"),
+    ("t",       "Trion"),
+    # Others.
+    ("eg4",     "Eagle"),
+    ("mpf",     "PolarFire"),
+    ("ql-eos",  "EOS S3"),
+]
+
+def get_family(device):
+    device = device.strip().lower()
+    for prefix, family in _families:
+        if device.startswith(prefix):
+            return family
+    return None
+
+# Features -----------------------------------------------------------------------------------------
+
+# (Feature, Target options enabling it).
+_features = {
+    "ethernet"  : ["--with-ethernet", "--with-etherbone"],
+    "pcie"      : ["--with-pcie"],
+    "sata"      : ["--with-sata"],
+    "sdcard"    : ["--with-sdcard", "--with-spi-sdcard"],
+    "spi_flash" : ["--with-spi-flash"],
+    "video"     : ["--with-video-terminal", "--with-video-framebuffer", "--with-video-colorbars"],
+    "usb"       : ["--with-usb"],
+}
+
+def get_features(options):
+    return sorted(feature for feature, feature_options in _features.items()
+        if any(option in options for option in feature_options))
+
+# AST Helpers --------------------------------------------------------------------------------------
+
+def _module_env(tree):
+    # Collect the possible string values of the module's globals.
+    env = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            env[node.targets[0].id] = _strings(node.value, env)
+    return env
+
+def _function_env(function, module_env={}):
+    # Collect the possible string values of the function's arguments (defaults) and locals.
+    env  = dict(module_env)
+    args = function.args.args[len(function.args.args) - len(function.args.defaults):]
+    for arg, default in zip(args, function.args.defaults):
+        env[arg.arg] = _strings(default, {})
+    for node in ast.walk(function):
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            if node.targets[0].id not in env or node.targets[0].id in module_env:
+                env[node.targets[0].id] = _strings(node.value, env)
+    return env
+
+def _strings(node, env):
+    # Return the possible string values of an expression (empty list if unknown).
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return [node.value]
+    if sys.version_info < (3, 8) and isinstance(node, ast.Str):
+        return [node.s]
+    if isinstance(node, ast.Name):
+        return env.get(node.id, [])
+    if isinstance(node, ast.Dict):
+        return list(itertools.chain(*[_strings(value, env) for value in node.values]))
+    if isinstance(node, ast.Subscript):
+        return _strings(node.value, env)
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+        return [l + r for l, r in itertools.product(_strings(node.left, env), _strings(node.right, env))]
+    if isinstance(node, ast.JoinedStr):
+        values = []
+        for value in node.values:
+            if isinstance(value, ast.FormattedValue):
+                values.append(_strings(value.value, env) or ["*"])
+            else:
+                values.append(_strings(value, env))
+        return ["".join(parts) for parts in itertools.product(*values)]
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == "format":
+        return [s.replace("{}", "*") for s in _strings(node.func.value, env)]
+    return []
+
+def _keyword(call, name):
+    for keyword in call.keywords:
+        if keyword.arg == name:
+            return keyword.value
+    return None
+
+def _call_name(call):
+    if isinstance(call.func, ast.Name):
+        return call.func.id
+    if isinstance(call.func, ast.Attribute):
+        return call.func.attr
+    return None
+
+def _unique(values):
+    return list(dict.fromkeys(values))
+
+# Platform Scan ------------------------------------------------------------------------------------
+
+def scan_platform(filename):
+    with open(filename) as f:
+        tree = ast.parse(f.read(), filename)
+    info = {
+        "vendor"      : None,
+        "base"        : None,
+        "devices"     : [],
+        "families"    : [],
+        "toolchain"   : None,
+        "programmers" : [],
+    }
+    name = os.path.basename(filename)[:-len(".py")]
+    if name.split("_")[0] in litex_boards.vendors:
+        info["vendor"] = name.split("_")[0]
+    module_env = _module_env(tree)
+    for node in tree.body:
+        if not (isinstance(node, ast.ClassDef) and node.name == "Platform"):
+            continue
+        info["base"] = next((base.id for base in node.bases if isinstance(base, ast.Name)), None)
+        for method in node.body:
+            if not isinstance(method, ast.FunctionDef):
+                continue
+            env = _function_env(method, module_env)
+            # Device/Toolchain from Platform.__init__.
+            if method.name == "__init__":
+                info["toolchain"] = (env.get("toolchain") or [None])[0]
+                for call in ast.walk(method):
+                    if not (isinstance(call, ast.Call) and _call_name(call) == "__init__"):
+                        continue
+                    if len(call.args) >= 2:
+                        info["devices"] += _strings(call.args[1], env)
+                    toolchain = _keyword(call, "toolchain")
+                    if info["toolchain"] is None and toolchain is not None:
+                        info["toolchain"] = (_strings(toolchain, env) or [None])[0]
+            # Programmers from Platform.create_programmer.
+            if method.name == "create_programmer":
+                for call in ast.walk(method):
+                    if isinstance(call, ast.Call) and isinstance(call.func, ast.Name):
+                        if call.func.id[0].isupper():
+                            info["programmers"].append(call.func.id)
+    info["devices"]     = _unique(device.strip() for device in info["devices"])
+    info["families"]    = _unique(filter(None, map(get_family, info["devices"])))
+    info["programmers"] = _unique(info["programmers"])
+    return info
+
+# Target Scan --------------------------------------------------------------------------------------
+
+def scan_target(filename):
+    with open(filename) as f:
+        tree = ast.parse(f.read(), filename)
+    info = {
+        "vendor"      : None,
+        "description" : None,
+        "platforms"   : [],
+        "toolchain"   : None,
+        "options"     : [],
+        "features"    : [],
+    }
+    name = os.path.basename(filename)[:-len(".py")]
+    if name.split("_")[0] in litex_boards.vendors:
+        info["vendor"] = name.split("_")[0]
+    for node in ast.walk(tree):
+        # Platforms.
+        if isinstance(node, ast.ImportFrom) and node.module == "litex_boards.platforms":
+            for alias in node.names:
+                full_name = litex_boards.resolve_alias("litex_boards.platforms", alias.name)
+                info["platforms"].append(alias.name if full_name is None else full_name.split(".")[-1])
+        if not isinstance(node, ast.Call):
+            continue
+        # Description.
+        if _call_name(node) == "ArgumentParser":
+            description = _keyword(node, "description")
+            if description is not None:
+                info["description"] = (_strings(description, {}) or [None])[0]
+        # Options.
+        if _call_name(node) == "add_argument" and len(node.args) >= 1:
+            option = (_strings(node.args[0], {}) or [None])[0]
+            if option is None or not option.startswith("--"):
+                continue
+            info["options"].append(option)
+            if option == "--toolchain":
+                default = _keyword(node, "default")
+                if default is not None:
+                    info["toolchain"] = (_strings(default, {}) or [None])[0]
+    info["platforms"] = _unique(info["platforms"])
+    info["options"]   = _unique(info["options"])
+    info["features"]  = get_features(info["options"])
+    return info
+
+# Registry -----------------------------------------------------------------------------------------
+
+class Registry:
+    def __init__(self, filename=REGISTRY_FILE, mtimes_filename=MTIMES_FILE):
+        self.filename        = filename
+        self.mtimes_filename = mtimes_filename
+        self.entries         = {"platforms": {}, "targets": {}}
+        self.mtimes          = {"platforms": {}, "targets": {}}
+        self.modified        = False
+        self.mtimes_modified = False
+        self.load()
+
+    def load(self):
+        content = _load_json(self.filename)
+        if content.get("version") == REGISTRY_VERSION:
+            self.entries = content["entries"]
+        # Mtimes (sha256 of the file at this mtime) of this installation.
+        content = _load_json(self.mtimes_filename)
+        if content.get("version") == REGISTRY_VERSION:
+            self.mtimes.update(content["mtimes"].get(litex_boards.litex_boards_dir, {}))
+
+    def save(self):
+        _save_json(self.filename, {"version": REGISTRY_VERSION, "entries": self.entries})
+        self.modified = False
+
+    def save_mtimes(self):
+        content = _load_json(self.mtimes_filename)
+        if content.get("version") != REGISTRY_VERSION:
+            content = {"version": REGISTRY_VERSION, "mtimes": {}}
+        content["mtimes"][litex_boards.litex_boards_dir] = self.mtimes
+        os.makedirs(os.path.dirname(os.path.abspath(self.mtimes_filename)), exist_ok=True)
+        _save_json(self.mtimes_filename, content)
+        self.mtimes_modified = False
+
+    def update(self):
+        scanners = {"platforms": scan_platform, "targets": scan_target}
+        for kind, scan in scanners.items():
+            entries = {}
+            mtimes  = {}
+            for name in litex_boards.modules[f"litex_boards.{kind}"]:
+                filename = os.path.join(litex_boards.litex_boards_dir, kind, name + ".py")
+                mtime    = os.path.getmtime(filename)
+                entry    = self.entries[kind].get(name, None)
+                cached   = self.mtimes[kind].get(name, None)
+                # Unchanged mtime (and entry of the same content): Reuse entry.
+                if entry is not None and cached is not None and cached == [mtime, entry["sha256"]]:
+                    entries[name] = entry
+                    mtimes[name]  = cached
+                    continue
+                # Changed mtime: Reuse entry if content is unchanged, re-scan otherwise.
+                with open(filename, "rb") as f:
+                    sha256 = hashlib.sha256(f.read()).hexdigest()
+                if entry is None or entry["sha256"] != sha256:
+                    entry = {"sha256": sha256, "info": scan(filename)}
+                    self.modified = True
+                entries[name] = entry
+                mtimes[name]  = [mtime, sha256]
+            if entries.keys() != self.entries[kind].keys():
+                self.modified = True
+            if mtimes != self.mtimes[kind]:
+                self.mtimes_modified = True
+            self.entries[kind] = entries
+            self.mtimes[kind]  = mtimes
+
+    # Queries.
+    def platform(self, name):
+        full_name = litex_boards.resolve_alias("litex_boards.platforms", name)
+        name = name if full_name is None else full_name.split(".")[-1]
+        return dict(name=name, **self.entries["platforms"][name]["info"])
+
+    def target(self, name):
+        full_name = litex_boards.resolve_alias("litex_boards.targets", name)
+        name = name if full_name is None else full_name.split(".")[-1]
+        info = dict(name=name, **self.entries["targets"][name]["info"])
+        # Inherit FPGA families/devices/programmers from the platform(s).
+        for key in ["devices", "families", "programmers"]:
+            info[key] = []
+            for platform in info["platforms"]:
+                if platform in self.entries["platforms"]:
+                    info[key] = _unique(info[key] + self.entries["platforms"][platform]["info"][key])
+        return info
+
+    def platforms(self, vendor=None, family=None, toolchain=None):
+        platforms = [self.platform(name) for name in sorted(self.entries["platforms"])]
+        return [p for p in platforms if _match(p, vendor, family, toolchain)]
+
+    def targets(self, vendor=None, family=None, toolchain=None, feature=None, option=None):
+        targets = [self.target(name) for name in sorted(self.entries["targets"])]
+        targets = [t for t in targets if _match(t, vendor, family, toolchain)]
+        if feature is not None:
+            targets = [t for t in targets if feature in t["features"]]
+        if option is not None:
+            targets = [t for t in targets if option in t["options"]]
+        return targets
+
+def _load_json(filename):
+    try:
+        with open(filename) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_json(filename, content):
+    with open(filename, "w") as f:
+        json.dump(content, f, indent=1, sort_keys=True)
+        f.write("\n")
+
+def _match(info, vendor, family, toolchain):
+    if vendor is not None and info["vendor"] != vendor:
+        return False
+    if family is not None and family.lower() not in [f.lower() for f in info["families"]]:
+        return False
+    if toolchain is not None and info["toolchain"] != toolchain:
+        return False
+    return True
+
+# Default Registry ---------------------------------------------------------------------------------
+
+_registry = None
+
+def get_registry():
+    global _registry
+    if _registry is None:
+        _registry = Registry()
+        _registry.update()
+        # The shipped index is only updated in memory (regenerated with --update), the mtimes cache
+        # speeds up the next lookups.
+        if _registry.mtimes_modified:
+            try:
+                _registry.save_mtimes()
+            except OSError:
+                pass
+    return _registry
+
+def platform(name):
+    return get_registry().platform(name)
+
+def target(name):
+    return get_registry().target(name)
+
+def platforms(**kwargs):
+    return get_registry().platforms(**kwargs)
+
+def targets(**kwargs):
+    return get_registry().targets(**kwargs)
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards registry.")
+    parser.add_argument("--vendor",    default=None, help="Filter on Vendor (ex: digilent).")
+    parser.add_argument("--family",    default=None, help="Filter on FPGA family (ex: ECP5).")
+    parser.add_argument("--toolchain", default=None, help="Filter on default toolchain (ex: vivado).")
+    parser.add_argument("--feature",   default=None, help="Filter on target feature (ex: ethernet).")
+    parser.add_argument("--platforms", action="store_true", help="List platforms instead of targets.")
+    parser.add_argument("--update",    action="store_true", help="Regenerate the shipped index (registry.json).")
+    args = parser.parse_args()
+
+    registry = get_registry()
+    if args.update:
+        if registry.modified:
+            registry.save()
+        return
+    filters = dict(vendor=args.vendor, family=args.family, toolchain=args.toolchain)
+    if args.platforms:
+        for p in registry.platforms(**filters):
+            print(f"{p['name']:40s} {', '.join(p['devices']):30s} {str(p['toolchain'])}")
+    else:
+        for t in registry.targets(feature=args.feature, **filters):
+            print(f"{t['name']:40s} {', '.join(t['families']):20s} {', '.join(t['features'])}")
+
+if __name__ == "__main__":
+    main()
@@ -24,6 +24,7 @@ from migen import *
 from migen.genlib.resetsync import AsyncResetSynchronizer
 
 from litex_boards.platforms import icebreaker
+from litex_boards.cores.spiflash import add_spi_flash_prefetcher
 
 from litex.soc.cores.ram import Up5kSPRAM
 from litex.soc.cores.clock import iCE40PLL
@@ -69,7 +70,7 @@ class _CRG(Module):
 
 class BaseSoC(SoCCore):
     def __init__(self, bios_flash_offset, sys_clk_freq=int(24e6), with_led_chaser=True,
-                 with_video_terminal=False, **kwargs):
+                 with_video_terminal=False, spi_flash_prefetch_lines=0, **kwargs):
         platform = icebreaker.Platform()
         platform.add_extension(icebreaker.break_off_pmod)
 
@@ -104,6 +105,8 @@ class BaseSoC(SoCCore):
         from litespi.modules import W25Q128JV
         from litespi.opcodes import SpiNorFlashOpCodes as Codes
         self.add_spi_flash(mode="4x", module=W25Q128JV(Codes.READ_1_1_4), with_master=False)
+        if spi_flash_prefetch_lines:
+            add_spi_flash_prefetcher(self, nlines=spi_flash_prefetch_lines)
 
         # Add ROM linker region --------------------------------------------------------------------
         self.bus.add_region("rom", SoCRegion(
@@ -137,20 +140,22 @@ def flash(build_dir, build_name, bios_flash_offset):
 
 def main():
     parser = argparse.ArgumentParser(description="LiteX SoC on iCEBreaker")
-    parser.add_argument("--build",               action="store_true", help="Build bitstream.")
-    parser.add_argument("--load",                action="store_true", help="Load bitstream.")
-    parser.add_argument("--flash",               action="store_true", help="Flash Bitstream and BIOS.")
-    parser.add_argument("--sys-clk-freq",        default=24e6,        help="System clock frequency.")
-    parser.add_argument("--bios-flash-offset",   default="0x40000",   help="BIOS offset in SPI Flash.")
-    parser.add_argument("--with-video-terminal", action="store_true", help="Enable Video Terminal (with DVI PMOD).")
+    parser.add_argument("--build",                    action="store_true", help="Build bitstream.")
+    parser.add_argument("--load",                     action="store_true", help="Load bitstream.")
+    parser.add_argument("--flash",                    action="store_true", help="Flash Bitstream and BIOS.")
+    parser.add_argument("--sys-clk-freq",             default=24e6,        help="System clock frequency.")
+    parser.add_argument("--bios-flash-offset",        default="0x40000",   help="BIOS offset in SPI Flash.")
+    parser.add_argument("--spi-flash-prefetch-lines", default=0, type=int, help="SPI Flash prefetcher lines (32 bytes each, 0 to disable, 32/128 lines: ~4/10 EBRs).")
+    parser.add_argument("--with-video-terminal",      action="store_true", help="Enable Video Terminal (with DVI PMOD).")
     builder_args(parser)
     soc_core_args(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
-        bios_flash_offset   = int(args.bios_flash_offset, 0),
-        sys_clk_freq        = int(float(args.sys_clk_freq)),
-        with_video_terminal = args.with_video_terminal,
+        bios_flash_offset        = int(args.bios_flash_offset, 0),
+        sys_clk_freq             = int(float(args.sys_clk_freq)),
+        spi_flash_prefetch_lines = args.spi_flash_prefetch_lines,
+        with_video_terminal      = args.with_video_terminal,
         **soc_core_argdict(args)
     )
     builder = Builder(soc, **builder_argdict(args))
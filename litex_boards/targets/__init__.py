@@ -0,0 +1,4 @@
+from litex_boards import _package_getattr
+
+# Resolve vendor-less short names (ex: arty -> digilent_arty) on first attribute access.
+__getattr__ = _package_getattr(__name__)
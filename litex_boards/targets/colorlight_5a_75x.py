@@ -33,12 +33,22 @@
 # ./colorlight_5a_75x.py --load
 # You should see the LiteX BIOS and be able to interact with it.
 #
+# 4) SoC with both Ethernet ports (Etherbone on port 0 and UDP echo data port on port 1):
+# ./colorlight_5a_75x.py --revision=7.0 --eth-dual=etherbone+udp --build
+# ./colorlight_5a_75x.py --load
+# ping 192.168.1.50 (Etherbone) / ping 192.168.1.51 (UDP data port: 2000)
+# With --eth-dual=round-robin (or hash), the UDP data port is on both ports and the TX packets of
+# the user logic (soc.udp_steering) are shared between the ports per packet (or per flow). With
+# --eth-dual-loopback, the UDP echo replies are sent on the port of the request.
+#
 # Note that you can also use a 5A-75E board:
 # ./colorlight_5a_75x.py --board=5a-75e --revision=7.1 (or 6.0) --build
 #
 # Disclaimer: SoC 2) is still a Proof of Concept with large timings violations on the IP/UDP and
 # Etherbone stack that need to be optimized. It was initially just used to validate the reversed
-# pinout but happens to work on hardware...
+# pinout but happens to work on hardware... Add --etherbone-pipelined to run the IP/UDP/Etherbone
+# stack with a 32-bit datapath in the sys clock domain (only the PHY/CDC remain at 125MHz) and
+# pipelined Etherbone with burst support (ex: litex_server --udp + RemoteClient.read(addr, length)).
 
 import os
 import argparse
@@ -65,6 +75,8 @@ from litedram.phy import GENSDRPHY, HalfRateGENSDRPHY
 
 from liteeth.phy.ecp5rgmii import LiteEthPHYRGMII
 
+from litex_boards.cores.ethernet import add_dual_ethernet, add_etherbone_pipelined
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
@@ -122,7 +134,8 @@ class _CRG(Module):
 
 class BaseSoC(SoCCore):
     def __init__(self, board, revision, sys_clk_freq=60e6, with_ethernet=False,
-                 with_etherbone=False, eth_ip=DEFAULT_IP_PREFIX + "50", eth_phy=0, with_led_chaser=True,
+                 with_etherbone=False, eth_ip=DEFAULT_IP_PREFIX + "50", eth_phy=0, eth_dual=None, eth_dual_loopback=None, etherbone_pipelined=False,
+                 with_led_chaser=True,
                  use_internal_osc=False, sdram_rate="1:1", **kwargs):
         board = board.lower()
         assert board in ["5a-75b", "5a-75e"]
@@ -131,7 +144,7 @@ class BaseSoC(SoCCore):
         elif board == "5a-75e":
             platform = colorlight_5a_75e.Platform(revision=revision)
 
-        if board == "5a-75e" and revision == "6.0" and (with_etherbone or with_ethernet):
+        if board == "5a-75e" and revision == "6.0" and (with_etherbone or with_ethernet or eth_dual is not None):
             assert use_internal_osc, "You cannot use the 25MHz clock as system clock since it is provided by the Ethernet PHY and will stop during PHY reset."
 
         # SoCCore ----------------------------------------------------------------------------------
@@ -161,16 +174,34 @@ class BaseSoC(SoCCore):
             )
 
         # Ethernet / Etherbone ---------------------------------------------------------------------
-        if with_ethernet or with_etherbone:
+        if (with_ethernet or with_etherbone) and eth_dual is None:
             self.submodules.ethphy = LiteEthPHYRGMII(
                 clock_pads = self.platform.request("eth_clocks", eth_phy),
                 pads       = self.platform.request("eth", eth_phy),
                 tx_delay   = 0e-9)
             if with_ethernet:
                 self.add_ethernet(phy=self.ethphy)
-            if with_etherbone:
+            if with_etherbone and etherbone_pipelined:
+                add_etherbone_pipelined(self, phy=self.ethphy, ip_address=eth_ip)
+            elif with_etherbone:
                 self.add_etherbone(phy=self.ethphy, ip_address=eth_ip)
 
+        # Dual Ethernet (Etherbone/UDP) ------------------------------------------------------------
+        if eth_dual is not None:
+            if with_ethernet:
+                raise ValueError("Dual Ethernet is only supported with Etherbone/UDP.")
+            ethphys = []
+            for n in range(2):
+                ethphy = LiteEthPHYRGMII(
+                    clock_pads = self.platform.request("eth_clocks", n),
+                    pads       = self.platform.request("eth", n),
+                    tx_delay   = 0e-9)
+                ethphy = ClockDomainsRenamer({"eth_tx": f"eth{n}_tx", "eth_rx": f"eth{n}_rx"})(ethphy)
+                setattr(self.submodules, f"ethphy{n}", ethphy)
+                ethphys.append(ethphy)
+            add_dual_ethernet(self, ethphys, ip_address=eth_ip, mode=eth_dual, with_etherbone=with_etherbone,
+                with_loopback=eth_dual_loopback)
+
         # Leds -------------------------------------------------------------------------------------
         # Disable leds when serial is used.
         if platform.lookup_request("serial", loose=True) is None and with_led_chaser:
@@ -182,31 +213,37 @@ class BaseSoC(SoCCore):
 
 def main():
     parser = argparse.ArgumentParser(description="LiteX SoC on Colorlight 5A-75X")
-    parser.add_argument("--build",             action="store_true",              help="Build bitstream.")
-    parser.add_argument("--load",              action="store_true",              help="Load bitstream.")
-    parser.add_argument("--board",             default="5a-75b",                 help="Board type (5a-75b or 5a-75e).")
-    parser.add_argument("--revision",          default="7.0", type=str,          help="Board revision (6.0, 6.1, 7.0 or 8.0).")
-    parser.add_argument("--sys-clk-freq",      default=60e6,                     help="System clock frequency")
+    parser.add_argument("--build",               action="store_true",              help="Build bitstream.")
+    parser.add_argument("--load",                action="store_true",              help="Load bitstream.")
+    parser.add_argument("--board",               default="5a-75b",                 help="Board type (5a-75b or 5a-75e).")
+    parser.add_argument("--revision",            default="7.0", type=str,          help="Board revision (6.0, 6.1, 7.0 or 8.0).")
+    parser.add_argument("--sys-clk-freq",        default=60e6,                     help="System clock frequency")
     ethopts = parser.add_mutually_exclusive_group()
-    ethopts.add_argument("--with-ethernet",    action="store_true",              help="Enable Ethernet support.")
-    ethopts.add_argument("--with-etherbone",   action="store_true",              help="Enable Etherbone support.")
-    parser.add_argument("--eth-ip",            default=DEFAULT_IP_PREFIX + "50", type=str, help="Ethernet/Etherbone IP address.")
-    parser.add_argument("--eth-phy",           default=0, type=int,              help="Ethernet PHY (0 or 1).")
-    parser.add_argument("--use-internal-osc",  action="store_true",              help="Use internal oscillator.")
-    parser.add_argument("--sdram-rate",        default="1:1",                    help="SDRAM Rate (1:1 Full Rate or 1:2 Half Rate).")
+    ethopts.add_argument("--with-ethernet",      action="store_true",              help="Enable Ethernet support.")
+    ethopts.add_argument("--with-etherbone",     action="store_true",              help="Enable Etherbone support.")
+    parser.add_argument("--eth-ip",              default=DEFAULT_IP_PREFIX + "50", type=str, help="Ethernet/Etherbone IP address.")
+    parser.add_argument("--eth-phy",             default=0, type=int,              help="Ethernet PHY (0 or 1).")
+    parser.add_argument("--eth-dual",            default=None,                     help="Use both Ethernet PHYs: etherbone+udp, round-robin or hash (UDP load sharing).", choices=["etherbone+udp", "round-robin", "hash"])
+    parser.add_argument("--eth-dual-loopback",   action="store_true", default=None, help="Loop back (UDP echo) the UDP data port (default with --eth-dual=etherbone+udp).")
+    parser.add_argument("--etherbone-pipelined", action="store_true",              help="Use the pipelined (32-bit sys datapath, burst) Etherbone.")
+    parser.add_argument("--use-internal-osc",    action="store_true",              help="Use internal oscillator.")
+    parser.add_argument("--sdram-rate",          default="1:1",                    help="SDRAM Rate (1:1 Full Rate or 1:2 Half Rate).")
     builder_args(parser)
     soc_core_args(parser)
     trellis_args(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(board=args.board, revision=args.revision,
-        sys_clk_freq     = int(float(args.sys_clk_freq)),
-        with_ethernet    = args.with_ethernet,
-        with_etherbone   = args.with_etherbone,
-        eth_ip           = args.eth_ip,
-        eth_phy          = args.eth_phy,
-        use_internal_osc = args.use_internal_osc,
-        sdram_rate       = args.sdram_rate,
+        sys_clk_freq        = int(float(args.sys_clk_freq)),
+        with_ethernet       = args.with_ethernet,
+        with_etherbone      = args.with_etherbone,
+        eth_ip              = args.eth_ip,
+        eth_phy             = args.eth_phy,
+        eth_dual            = args.eth_dual,
+        eth_dual_loopback   = args.eth_dual_loopback,
+        etherbone_pipelined = args.etherbone_pipelined,
+        use_internal_osc    = args.use_internal_osc,
+        sdram_rate          = args.sdram_rate,
         **soc_core_argdict(args)
     )
     builder = Builder(soc, **builder_argdict(args))
@@ -12,6 +12,7 @@ import argparse
 from migen import *
 
 from litex_boards.platforms import mini_4k
+from litex_boards.cores.pcie import get_pcie_data_width
 from litex.build.xilinx.vivado import vivado_build_args, vivado_build_argdict
 
 from litex.soc.cores.clock import *
@@ -68,7 +69,7 @@ class _CRG(Module):
 # BaseSoC ------------------------------------------------------------------------------------------
 
 class BaseSoC(SoCMini):
-    def __init__(self, sys_clk_freq=int(100e6), with_pcie=False, with_sata=False, with_video_terminal=False, with_video_framebuffer=False, **kwargs):
+    def __init__(self, sys_clk_freq=int(100e6), with_pcie=False, pcie_lanes=4, pcie_data_width=None, pcie_dmas=1, with_sata=False, with_video_terminal=False, with_video_framebuffer=False, **kwargs):
         if with_video_terminal or with_video_framebuffer:
             sys_clk_freq = int(148.5e6) # FIXME: For now requires sys_clk >= video_clk.
         platform = mini_4k.Platform()
@@ -96,10 +97,11 @@ class BaseSoC(SoCMini):
 
         # PCIe -------------------------------------------------------------------------------------
         if with_pcie:
-            self.submodules.pcie_phy = S7PCIEPHY(platform, platform.request("pcie_x4"),
-                data_width = 128,
-                bar0_size  = 0x20000)
-            self.add_pcie(phy=self.pcie_phy, ndmas=1)
+            self.submodules.pcie_phy = S7PCIEPHY(platform, platform.request(f"pcie_x{pcie_lanes}"),
+                data_width      = get_pcie_data_width(S7PCIEPHY, pcie_lanes, pcie_data_width),
+                pcie_data_width = get_pcie_data_width(S7PCIEPHY, pcie_lanes),
+                bar0_size       = 0x20000)
+            self.add_pcie(phy=self.pcie_phy, ndmas=pcie_dmas)
 
         # SATA -------------------------------------------------------------------------------------
         if with_sata:
@@ -147,16 +149,19 @@ class BaseSoC(SoCMini):
 
 def main():
     parser = argparse.ArgumentParser(description="LiteX SoC Blackmagic Decklink Mini 4K")
-    parser.add_argument("--build",                  action="store_true", help="Build bitstream.")
-    parser.add_argument("--load",                   action="store_true", help="Load bitstream.")
-    parser.add_argument("--sys-clk-freq",           default=148.5e6,     help="System clock frequency.")
+    parser.add_argument("--build",                  action="store_true",    help="Build bitstream.")
+    parser.add_argument("--load",                   action="store_true",    help="Load bitstream.")
+    parser.add_argument("--sys-clk-freq",           default=148.5e6,        help="System clock frequency.")
     pcieopts = parser.add_mutually_exclusive_group()
-    pcieopts.add_argument("--with-pcie",            action="store_true", help="Enable PCIe support.")
-    parser.add_argument("--driver",                 action="store_true", help="Generate PCIe driver.")
+    pcieopts.add_argument("--with-pcie",            action="store_true",    help="Enable PCIe support.")
+    parser.add_argument("--pcie-lanes",             default=4, type=int,    help="PCIe lanes (4).")
+    parser.add_argument("--pcie-data-width",        default=None, type=int, help="PCIe datapath width (default: sustaining the lanes bandwidth).")
+    parser.add_argument("--pcie-dmas",              default=1, type=int,    help="Number of PCIe DMA channels.")
+    parser.add_argument("--driver",                 action="store_true",    help="Generate PCIe driver.")
     viopts = parser.add_mutually_exclusive_group()
-    viopts.add_argument("--with-video-terminal",    action="store_true", help="Enable Video Terminal (HDMI).")
-    viopts.add_argument("--with-video-framebuffer", action="store_true", help="Enable Video Framebuffer (HDMI).")
-    pcieopts.add_argument("--with-sata",            action="store_true", help="Enable SATA support (over PCIe2SATA).")
+    viopts.add_argument("--with-video-terminal",    action="store_true",    help="Enable Video Terminal (HDMI).")
+    viopts.add_argument("--with-video-framebuffer", action="store_true",    help="Enable Video Framebuffer (HDMI).")
+    pcieopts.add_argument("--with-sata",            action="store_true",    help="Enable SATA support (over PCIe2SATA).")
     builder_args(parser)
     soc_core_args(parser)
     vivado_build_args(parser)
@@ -165,6 +170,9 @@ def main():
     soc = BaseSoC(
         sys_clk_freq           = int(float(args.sys_clk_freq)),
         with_pcie              = args.with_pcie,
+        pcie_lanes             = args.pcie_lanes,
+        pcie_data_width        = args.pcie_data_width,
+        pcie_dmas              = args.pcie_dmas,
         with_sata              = args.with_sata,
         with_video_terminal    = args.with_video_terminal,
         with_video_framebuffer = args.with_video_framebuffer,
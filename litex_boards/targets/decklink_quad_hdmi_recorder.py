@@ -19,22 +19,26 @@ import argparse
 from migen import *
 
 from litex_boards.platforms import quad_hdmi_recorder
+from litex_boards.cores.pcie import get_pcie_data_width
 
 from litex.soc.cores.clock import *
+from litex.soc.cores.video import VideoTimingGenerator, ColorBarsPattern
 from litex.soc.integration.soc_core import *
 from litex.soc.integration.builder import *
 
 from litedram.common import PHYPadsReducer
-from litedram.modules import MT41J256M16
+from litedram.modules import DDR3Module, _TechnologyTimings, _SpeedgradeTimings
 from litedram.phy import usddrphy
 
 from litepcie.phy.uspciephy import USPCIEPHY
 from litepcie.software import generate_litepcie_software
 
+from litex_boards.cores.video import add_video_capture
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
-    def __init__(self, platform, sys_clk_freq):
+    def __init__(self, platform, sys_clk_freq, video_clk_freq=None):
         self.clock_domains.cd_sys    = ClockDomain()
         self.clock_domains.cd_sys4x  = ClockDomain(reset_less=True)
         self.clock_domains.cd_pll4x  = ClockDomain(reset_less=True)
@@ -42,8 +46,10 @@ class _CRG(Module):
 
         # # #
 
+        clk200 = platform.request("clk200")
+
         self.submodules.pll = pll = USMMCM(speedgrade=-2)
-        pll.register_clkin(platform.request("clk200"), 200e6)
+        pll.register_clkin(clk200, 200e6)
         pll.create_clkout(self.cd_pll4x, sys_clk_freq*4, buf=None, with_reset=False)
         pll.create_clkout(self.cd_idelay, 200e6)
         platform.add_false_path_constraints(self.cd_sys.clk, pll.clkin) # Ignore sys_clk to pll.clkin path created by SoC's rst.
@@ -56,10 +62,35 @@ class _CRG(Module):
         ]
         self.submodules.idelayctrl = USIDELAYCTRL(cd_ref=self.cd_idelay, cd_sys=self.cd_sys)
 
+        # Video PLL.
+        if video_clk_freq is not None:
+            self.clock_domains.cd_video = ClockDomain()
+            self.submodules.video_pll = video_pll = USMMCM(speedgrade=-2)
+            video_pll.register_clkin(clk200, 200e6)
+            video_pll.create_clkout(self.cd_video, video_clk_freq)
+            platform.add_false_path_constraints(self.cd_sys.clk, self.cd_video.clk)
+
+# DDR3 Module --------------------------------------------------------------------------------------
+
+class H5TQ4G63CFR(DDR3Module):
+    # 4 x H5TQ4G63CFR (4Gb x16), 32-bit (2 chips) or 64-bit (4 chips) DDR3 (2KB pages).
+    # geometry
+    nbanks = 8
+    nrows  = 32768
+    ncols  = 1024
+    # timings
+    technology_timings = _TechnologyTimings(tREFI=64e6/8192, tWTR=(4, 7.5), tCCD=(4, None), tRRD=(4, 7.5), tZQCS=(64, 80))
+    speedgrade_timings = {
+        "1600": _SpeedgradeTimings(tRP=13.75, tRCD=13.75, tWR=15, tRFC=(None, 260), tFAW=(None, 40), tRAS=35),
+    }
+    speedgrade_timings["default"] = speedgrade_timings["1600"]
+
 # BaseSoC ------------------------------------------------------------------------------------------
 
 class BaseSoC(SoCCore):
-    def __init__(self, sys_clk_freq=int(200e6), with_pcie=False, **kwargs):
+    def __init__(self, sys_clk_freq=int(200e6), ddram_width=32, with_pcie=False, pcie_lanes=4, pcie_data_width=None, pcie_dmas=1,
+        with_video_capture_test_pattern = False,
+        **kwargs):
         platform = quad_hdmi_recorder.Platform()
 
         # SoCCore ----------------------------------------------------------------------------------
@@ -69,51 +100,97 @@ class BaseSoC(SoCCore):
             **kwargs)
 
         # CRG --------------------------------------------------------------------------------------
-        self.submodules.crg = _CRG(platform, sys_clk_freq)
+        self.submodules.crg = _CRG(platform, sys_clk_freq,
+            video_clk_freq = 148.5e6 if with_video_capture_test_pattern else None) # 1080p60 pixel clock.
 
         # JTAGBone  --------------------------------------------------------------------------------
         self.add_jtagbone()
 
         # DDR3 SDRAM -------------------------------------------------------------------------------
+        main_ram_size = 0x40000000 # Limited by the 32-bit address space (DMAs: full size).
+        if with_video_capture_test_pattern and ddram_width == 32:
+            main_ram_size = 0x20000000 # Upper half of the 1GB reserved to the video ring buffers.
         if not self.integrated_main_ram_size:
+            assert ddram_width in [32, 64]
+            ddram_pads = platform.request("ddram")
+            if ddram_width == 32:
+                ddram_pads = PHYPadsReducer(ddram_pads, [0, 1, 2, 3])
             self.submodules.ddrphy = usddrphy.USDDRPHY(
-                pads             = PHYPadsReducer(platform.request("ddram"), [0, 1, 2, 3]),
+                pads             = ddram_pads,
                 memtype          = "DDR3",
                 sys_clk_freq     = sys_clk_freq,
                 iodelay_clk_freq = 200e6)
             self.add_sdram("sdram",
                 phy           = self.ddrphy,
-                module        = MT41J256M16(sys_clk_freq, "1:4"),
+                module        = H5TQ4G63CFR(sys_clk_freq, "1:4"),
+                size          = main_ram_size,
                 l2_cache_size = kwargs.get("l2_size", 8192)
             )
 
         # PCIe -------------------------------------------------------------------------------------
+        if with_video_capture_test_pattern:
+            assert with_pcie and not self.integrated_main_ram_size
+            pcie_dmas = max(pcie_dmas, 4)
         if with_pcie:
-            self.submodules.pcie_phy = USPCIEPHY(platform, platform.request("pcie_x4"),
-                speed      = "gen3",
-                data_width = 128,
-                bar0_size  = 0x20000)
-            self.add_pcie(phy=self.pcie_phy, ndmas=1)
+            self.submodules.pcie_phy = USPCIEPHY(platform, platform.request(f"pcie_x{pcie_lanes}"),
+                speed           = "gen3",
+                data_width      = get_pcie_data_width(USPCIEPHY, pcie_lanes, pcie_data_width),
+                pcie_data_width = get_pcie_data_width(USPCIEPHY, pcie_lanes),
+                bar0_size       = 0x20000)
+            self.add_pcie(phy=self.pcie_phy, ndmas=pcie_dmas)
             # False Paths (FIXME: Improve integration).
             platform.toolchain.pre_placement_commands.append("set_false_path -from [get_clocks sys_clk] -to [get_clocks pcie_clk_1]")
             platform.toolchain.pre_placement_commands.append("set_false_path -from [get_clocks pcie_clk_1] -to [get_clocks sys_clk]")
 
+        # Video Capture (Test Pattern) -------------------------------------------------------------
+        # 4 x 1080p60 channels, each captured to a SDRAM ring buffer (4 frames) above the CPU's
+        # main_ram window and streamed to the host on its own PCIe DMA (frame_size descriptors).
+        # The hdmi_in TMDS lanes (through the PI3HDX1204 redrivers) reach GTH transceivers without
+        # documented clock lanes/reference clocks and there is no HDMI receiver yet: the channels
+        # only capture 1080p60 color bars (a receiver would drive the same video_data_layout sink).
+        if with_video_capture_test_pattern:
+            frame_size = 1920*1080*4 # RGB888 in 32-bit words.
+            video_base = main_ram_size
+            for n in range(4):
+                vtg     = ClockDomainsRenamer("video")(VideoTimingGenerator(default_video_timings="1920x1080@60Hz"))
+                pattern = ClockDomainsRenamer("video")(ColorBarsPattern())
+                setattr(self.submodules, f"video{n}_vtg",     vtg)
+                setattr(self.submodules, f"video{n}_pattern", pattern)
+                self.comb += vtg.source.connect(pattern.vtg_sink)
+                add_video_capture(self, f"video{n}_capture",
+                    source       = pattern.source,
+                    dma          = getattr(self, f"pcie_dma{n}"),
+                    base         = video_base + n*4*frame_size,
+                    frame_size   = frame_size,
+                    nframes      = 4,
+                    clock_domain = "video")
+
 # Build --------------------------------------------------------------------------------------------
 
 def main():
     parser = argparse.ArgumentParser(description="LiteX SoC on Blackmagic Decklink Quad HDMI Recorder")
-    parser.add_argument("--build",        action="store_true", help="Build bitstream.")
-    parser.add_argument("--load",         action="store_true", help="Load bitstream.")
-    parser.add_argument("--sys-clk-freq", default=200e6,       help="System clock frequency.")
-    parser.add_argument("--with-pcie",    action="store_true", help="Enable PCIe support.")
-    parser.add_argument("--driver",       action="store_true", help="Generate PCIe driver.")
+    parser.add_argument("--build",                           action="store_true",    help="Build bitstream.")
+    parser.add_argument("--load",                            action="store_true",    help="Load bitstream.")
+    parser.add_argument("--sys-clk-freq",                    default=200e6,          help="System clock frequency.")
+    parser.add_argument("--ddram-width",                     default=None, type=int, help="DDR3 data width (32: 2 chips or 64: 4 chips, default: 64 with video capture else 32).")
+    parser.add_argument("--with-pcie",                       action="store_true",    help="Enable PCIe support.")
+    parser.add_argument("--pcie-lanes",                      default=4, type=int,    help="PCIe lanes (1, 2, 4 or 8).")
+    parser.add_argument("--pcie-data-width",                 default=None, type=int, help="PCIe datapath width (default: sustaining the lanes bandwidth).")
+    parser.add_argument("--pcie-dmas",                       default=1, type=int,    help="Number of PCIe DMA channels.")
+    parser.add_argument("--driver",                          action="store_true",    help="Generate PCIe driver.")
+    parser.add_argument("--with-video-capture-test-pattern", action="store_true",    help="Enable 4 x 1080p60 color bars capture to DDR3 and PCIe DMAs (no HDMI receiver yet, requires --with-pcie).")
     builder_args(parser)
     soc_core_args(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
-        sys_clk_freq   = int(float(args.sys_clk_freq)),
-        with_pcie      = args.with_pcie,
+        sys_clk_freq                    = int(float(args.sys_clk_freq)),
+        ddram_width                     = args.ddram_width or (64 if args.with_video_capture_test_pattern else 32),
+        with_pcie                       = args.with_pcie,
+        pcie_lanes                      = args.pcie_lanes,
+        pcie_data_width                 = args.pcie_data_width,
+        pcie_dmas                       = args.pcie_dmas,
+        with_video_capture_test_pattern = args.with_video_capture_test_pattern,
         **soc_core_argdict(args)
 	)
     builder = Builder(soc, **builder_argdict(args))
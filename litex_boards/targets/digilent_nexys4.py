@@ -9,7 +9,6 @@
 import os
 import sys
 import argparse
-import math
 
 from migen import *
 
@@ -19,15 +18,12 @@ from litex_boards.platforms import digilent_nexys4
 
 from litex.soc.cores.clock import *
 from litex.soc.integration.soc_core import *
-from litex.soc.integration.soc import SoCRegion
 from litex.soc.integration.builder import *
 from litex.soc.cores.led import LedChaser
-from litex.soc.interconnect import wishbone
-
-from litex.soc.integration.soc import colorer
 from litex.soc.cores.video import VideoVGAPHY
 from liteeth.phy.rmii import LiteEthPHYRMII
 
+from litex_boards.cores.sram import add_cellular_ram
 
 # CRG ----------------------------------------------------------------------------------------------
 
@@ -55,119 +51,14 @@ class _CRG(Module):
 
         self.submodules.idelayctrl = S7IDELAYCTRL(self.cd_idelay)
 
-# CellularRAM (https://media.digikey.com/PDF/Data%20Sheets/Micron%20Technology%20Inc%20PDFs/MT45W8MW16BGX.pdf)
-
-class CellularRAM(Module):
-    def __init__(self, soc, platform):
-
-        sys_clk_freq = soc.sys_clk_freq
-
-        addr_width = 23
-        data_width = 16
-
-        delay_for_70ns = (70e-9) / (1.0/sys_clk_freq)
-        delay_for_70ns = int(math.ceil(delay_for_70ns))+1
-
-        #print("sys_clk_freq<%g> delay_for_70ns<%g>\n"%(sys_clk_freq,delay_for_70ns))
-
-        self.bus = wishbone.Interface(data_width=data_width,adr_width=addr_width)
-
-        self.delaycounter = Signal(5)
-
-        cellram = platform.request("cellularram")
-        addr = cellram.addr
-        data = cellram.data
-        wen = cellram.wen
-        oen = cellram.oen
-        cen = cellram.cen
-        clk = cellram.clk
-        cre = cellram.cre
-        adv = cellram.adv # address valid (low)
-        lb = cellram.lb
-        ub = cellram.ub
-        ########################
-        tristate_data = TSTriple(data_width)
-        self.specials += tristate_data.get_tristate(data)
-        ########################
-        i_rst = ResetSignal("sys")
-        fsm = FSM(reset_state="RESET")
-        fsm = ResetInserter()(fsm)
-        self.submodules.fsm = fsm
-        self.sync += fsm.reset.eq(i_rst)
-        ########################
-        fsm.act("RESET",
-            NextState("INIT"))
-        ########################
-        fsm.act("INIT",
-            NextValue(self.delaycounter,0),
-            NextValue(self.bus.ack,0),
-            NextValue(cen,1),
-            NextValue(adv,1),
-            NextValue(lb,1),
-            NextValue(ub,1),
-            NextValue(clk,0),
-            NextValue(cre,0),
-            NextValue(tristate_data.oe,0),
-            NextState("IDLE"))
-        ########################
-        fsm.act("IDLE",
-            If(self.bus.stb & self.bus.cyc,
-
-                NextValue(lb,~self.bus.sel[0]), 
-                NextValue(ub,~self.bus.sel[1]),
-
-                NextValue(self.delaycounter,0),
-                NextValue(cen,0),
-                NextValue(adv,0),
-                NextValue(addr,self.bus.adr[:addr_width]),
-                If(self.bus.we,
-                    NextValue(wen,0),
-                    NextValue(oen,1),
-                    NextValue(tristate_data.oe,1),
-                    NextValue(tristate_data.o,self.bus.dat_w[:data_width]),
-                    NextState("WRITE")
-                ).Else(
-                    NextValue(wen,1),
-                    NextValue(oen,0),
-                    NextValue(tristate_data.oe,0),
-                    NextState("READ")
-                )
-            )
-        )
-        ########################
-        fsm.act("WRITE",
-            NextValue(self.delaycounter,self.delaycounter+1),
-            If(self.delaycounter==delay_for_70ns,
-                NextValue(self.bus.ack,1),
-                NextState("INIT"))
-        )
-        ########################
-        fsm.act("READ",
-            NextValue(self.delaycounter,self.delaycounter+1),
-            NextValue(self.bus.dat_r,tristate_data.i[:data_width]),
-            If(self.delaycounter==delay_for_70ns,
-                NextValue(self.bus.ack,1),
-                NextState("INIT"))
-        )
-        ########################
-
-def addCellularRAM(soc, platform, name, origin):
-    size = 16*1024*1024
-    ram_bus = wishbone.Interface(data_width=soc.bus.data_width)
-    ram     = CellularRAM(soc,platform)
-    soc.bus.add_slave(name, ram.bus, SoCRegion(origin=origin, size=size, mode="rw"))
-    soc.check_if_exists(name)
-    soc.logger.info("CELLULARRAM {} {} {}.".format(
-        colorer(name),
-        colorer("added", color="green"),
-        soc.bus.regions[name]))
-    setattr(soc.submodules, name, ram)
-
-
 # BaseSoC ------------------------------------------------------------------------------------------
 
 class BaseSoC(SoCCore):
-    def __init__(self, sys_clk_freq=int(75e6), with_led_chaser=True, with_ethernet=False, with_etherbone=False, with_video_terminal=False, with_video_framebuffer=False, **kwargs):
+    def __init__(self, sys_clk_freq=int(75e6), with_led_chaser=True, with_ethernet=False, with_etherbone=False, with_video_terminal=False, with_video_framebuffer=False,
+        cellularram_mode         = "sync",
+        cellularram_latency      = "variable",
+        cellularram_burst_length = 16,
+        **kwargs):
         platform = digilent_nexys4.Platform()
 
         # SoCCore ----------------------------------_-----------------------------------------------
@@ -178,8 +69,13 @@ class BaseSoC(SoCCore):
         # CRG --------------------------------------------------------------------------------------
         self.submodules.crg = _CRG(platform, sys_clk_freq)
 
-        # Cellular RAM -------------------------------------------------------------------------------
-        addCellularRAM(self,platform,"main_ram",0x40000000)        
+        # Cellular RAM -----------------------------------------------------------------------------
+        add_cellular_ram(self, platform.request("cellularram"),
+            name         = "main_ram",
+            origin       = 0x40000000,
+            mode         = cellularram_mode,
+            latency      = cellularram_latency,
+            burst_length = cellularram_burst_length)
 
         # Ethernet / Etherbone ---------------------------------------------------------------------
         if with_ethernet or with_etherbone:
@@ -212,6 +108,9 @@ def main():
     parser.add_argument("--build",                  action="store_true", help="Build bitstream.")
     parser.add_argument("--load",                   action="store_true", help="Load bitstream.")
     parser.add_argument("--sys-clk-freq",           default=75e6,        help="System clock frequency.")
+    parser.add_argument("--cellularram-mode",       default="sync",      help="CellularRAM mode (sync (burst) or async).")
+    parser.add_argument("--cellularram-latency",    default="variable",  help="CellularRAM sync burst latency (variable or fixed).")
+    parser.add_argument("--cellularram-burst",      default=16,          help="CellularRAM sync burst length in 16-bit words (4, 8, 16 or 32).")
     ethopts = parser.add_mutually_exclusive_group()
     ethopts.add_argument("--with-ethernet",         action="store_true", help="Enable Ethernet support.")
     ethopts.add_argument("--with-etherbone",        action="store_true", help="Enable Etherbone support.")
@@ -226,11 +125,14 @@ def main():
     args = parser.parse_args()
 
     soc = BaseSoC(
-        sys_clk_freq           = int(float(args.sys_clk_freq)),
-        with_ethernet          = args.with_ethernet,
-        with_etherbone         = args.with_etherbone,
-        with_video_terminal    = args.with_video_terminal,
-        with_video_framebuffer = args.with_video_framebuffer,
+        sys_clk_freq             = int(float(args.sys_clk_freq)),
+        with_ethernet            = args.with_ethernet,
+        with_etherbone           = args.with_etherbone,
+        with_video_terminal      = args.with_video_terminal,
+        with_video_framebuffer   = args.with_video_framebuffer,
+        cellularram_mode         = args.cellularram_mode,
+        cellularram_latency      = args.cellularram_latency,
+        cellularram_burst_length = int(args.cellularram_burst),
         **soc_core_argdict(args)
     )
     if args.with_spi_sdcard:
@@ -25,6 +25,64 @@ from litex.config import DEFAULT_IP_PREFIX
 
 from liteeth.phy.trionrgmii import LiteEthPHYRGMII
 
+# AXI Address Arbiter ------------------------------------------------------------------------------
+
+class AXIAddressArbiter(Module):
+    """Burst-aware AW/AR arbiter for the shared address channel of the Trion DDR controller
+
+    AW/AR requests (one per burst) are granted to the shared address channel (atype=1 for writes).
+    The grant is held while a request is pending (AXI valid/payload stability) and is given to the
+    other channel when the granted one is idle or, after fairness consecutive bursts, as soon as the
+    other one has a pending request (fairness=1: round-robin on each burst).
+    """
+    def __init__(self, axi, fairness=4):
+        assert fairness >= 1
+        self.atype = Signal()                  # o (1: Write, 0: Read)
+        self.addr  = Signal(len(axi.aw.addr))  # o
+        self.id    = Signal(len(axi.aw.id))    # o
+        self.len   = Signal(8)                 # o
+        self.size  = Signal(3)                 # o
+        self.burst = Signal(2)                 # o
+        self.lock  = Signal(2)                 # o
+        self.valid = Signal()                  # o
+        self.ready = Signal()                  # i
+
+        # # #
+
+        grant = Signal(reset=1) # 1: AW, 0: AR.
+        count = Signal(max=max(fairness, 2))
+        other = Signal()
+
+        self.comb += [
+            self.atype.eq(grant),
+            other.eq(Mux(grant, axi.ar.valid, axi.aw.valid)),
+        ]
+        for channel, granted in [(axi.aw, grant), (axi.ar, ~grant)]:
+            self.comb += If(granted,
+                self.addr.eq(channel.addr),
+                self.id.eq(channel.id),
+                self.len.eq(channel.len),
+                self.size.eq(channel.size),
+                self.burst.eq(channel.burst),
+                self.lock.eq(channel.lock),
+                self.valid.eq(channel.valid),
+                channel.ready.eq(self.ready),
+            )
+        self.sync += [
+            If(self.valid & self.ready,
+                If(count != (fairness - 1),
+                    count.eq(count + 1)
+                ),
+                If(other & (count == (fairness - 1)),
+                    grant.eq(~grant),
+                    count.eq(0),
+                )
+            ).Elif(~self.valid & other,
+                grant.eq(~grant),
+                count.eq(0),
+            )
+        ]
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
@@ -47,12 +105,13 @@ class _CRG(Module):
 
 class BaseSoC(SoCCore):
     def __init__(self, sys_clk_freq=int(75e6),
-        with_spi_flash  = False,
-        with_ethernet   = False,
-        with_etherbone  = False,
-        eth_phy         = 0,
-        eth_ip          = DEFAULT_IP_PREFIX + "50",
-        with_led_chaser = True,
+        with_spi_flash        = False,
+        with_ethernet         = False,
+        with_etherbone        = False,
+        eth_phy               = 0,
+        eth_ip                = DEFAULT_IP_PREFIX + "50",
+        with_led_chaser       = True,
+        dram_arbiter_fairness = 4,
         **kwargs):
         platform = efinix_trion_t120_bga576_dev_kit.Platform()
 
@@ -112,6 +171,7 @@ class BaseSoC(SoCCore):
             platform.toolchain.excluded_ios.append(platform.lookup_request("eth").mdio)
 
         # LPDDR3 SDRAM -----------------------------------------------------------------------------
+        self.dram_ports = {}
         if not self.integrated_main_ram_size:
             # DRAM / PLL Blocks.
             # ------------------
@@ -290,20 +350,20 @@ calc_result = design.auto_calc_pll_clock("dram_pll", {"CLKOUT0_FREQ": "400.0"})
                     Subsignal("alen",    Pins(8)),
                     Subsignal("wlast",   Pins(1)),
                 )]
-                io   = platform.add_iface_ios(ios)
-                rw_n = axi_port.ar.valid
+                io      = platform.add_iface_ios(ios)
+                arbiter = AXIAddressArbiter(axi_port, fairness=dram_arbiter_fairness)
+                self.submodules += arbiter
                 self.comb += [
-                    # Pseudo AW/AR Channels.
-                    io.atype.eq(~rw_n),
-                    io.aaddr.eq(  Mux(rw_n,   axi_port.ar.addr,  axi_port.aw.addr)),
-                    io.aid.eq(    Mux(rw_n,     axi_port.ar.id,    axi_port.aw.id)),
-                    io.alen.eq(   Mux(rw_n,    axi_port.ar.len,   axi_port.aw.len)),
-                    io.asize.eq(  Mux(rw_n,   axi_port.ar.size,  axi_port.aw.size)),
-                    io.aburst.eq( Mux(rw_n,  axi_port.ar.burst, axi_port.aw.burst)),
-                    io.alock.eq(  Mux(rw_n,   axi_port.ar.lock,  axi_port.aw.lock)),
-                    io.avalid.eq( Mux(rw_n,  axi_port.ar.valid, axi_port.aw.valid)),
-                    axi_port.aw.ready.eq(~rw_n & io.aready),
-                    axi_port.ar.ready.eq( rw_n & io.aready),
+                    # Shared AW/AR Channel.
+                    io.atype.eq(arbiter.atype),
+                    io.aaddr.eq(arbiter.addr),
+                    io.aid.eq(arbiter.id),
+                    io.alen.eq(arbiter.len),
+                    io.asize.eq(arbiter.size),
+                    io.aburst.eq(arbiter.burst),
+                    io.alock.eq(arbiter.lock),
+                    io.avalid.eq(arbiter.valid),
+                    arbiter.ready.eq(io.aready),
 
                     # R Channel.
                     axi_port.r.id.eq(io.rid),
@@ -329,9 +389,13 @@ calc_result = design.auto_calc_pll_clock("dram_pll", {"CLKOUT0_FREQ": "400.0"})
 
                 # Connect AXI interface to the main bus of the SoC.
                 axi_lite_port = axi.AXILiteInterface(data_width=data_width, address_width=28)
-                self.submodules += axi.AXILite2AXI(axi_lite_port, axi_port)
+                axi_soc_port  = axi.AXIInterface(data_width=data_width, address_width=28, id_width=8)
+                self.submodules += axi.AXILite2AXI(axi_lite_port, axi_soc_port)
                 self.bus.add_slave(f"target{n}", axi_lite_port, SoCRegion(origin=0x4000_0000 + 0x1000_0000*n, size=0x1000_0000)) # 256MB.
 
+                # Masters of the port (SoC bus + native ports), arbitrated on finalize.
+                self.dram_ports[n] = (axi_port, [axi_soc_port])
+
         # Use DRAM's target0 port as Main Ram  -----------------------------------------------------
         self.bus.add_region("main_ram", SoCRegion(
             origin = 0x4000_0000,
@@ -339,6 +403,25 @@ calc_result = design.auto_calc_pll_clock("dram_pll", {"CLKOUT0_FREQ": "400.0"})
             linker = True)
         )
 
+    def get_dram_port(self, target=0):
+        """Return a new full-burst AXI port on a LPDDR3 target (target0: 256-bit, target1: 128-bit).
+
+        Ports are arbitrated (per AXI transaction) with the SoC bus on the target, for DMAs,
+        framebuffers, etc...
+        """
+        axi_port, masters = self.dram_ports[target]
+        port = axi.AXIInterface(data_width=len(axi_port.w.data), address_width=28, id_width=8)
+        masters.append(port)
+        return port
+
+    def do_finalize(self):
+        for axi_port, masters in self.dram_ports.values():
+            if len(masters) == 1:
+                self.submodules += axi.AXIInterconnectPointToPoint(masters[0], axi_port)
+            else:
+                self.submodules += axi.AXIArbiter(masters, axi_port)
+        SoCCore.do_finalize(self)
+
 # Build --------------------------------------------------------------------------------------------
 
 def main():
@@ -353,17 +436,19 @@ def main():
     ethopts.add_argument("--with-etherbone", action="store_true",              help="Enable Etherbone support.")
     parser.add_argument("--eth-ip",          default=DEFAULT_IP_PREFIX + "50", type=str, help="Ethernet/Etherbone IP address.")
     parser.add_argument("--eth-phy",         default=0, type=int,              help="Ethernet PHY: 0 (default) or 1.")
+    parser.add_argument("--dram-arbiter-fairness", default=4, type=int,        help="LPDDR3 consecutive bursts in the same direction before granting the other one.")
     builder_args(parser)
     soc_core_args(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
-        sys_clk_freq   = int(float(args.sys_clk_freq)),
-        with_spi_flash = args.with_spi_flash,
-        with_ethernet  = args.with_ethernet,
-        with_etherbone = args.with_etherbone,
-        eth_ip         = args.eth_ip,
-        eth_phy        = args.eth_phy,
+        sys_clk_freq          = int(float(args.sys_clk_freq)),
+        with_spi_flash        = args.with_spi_flash,
+        with_ethernet         = args.with_ethernet,
+        with_etherbone        = args.with_etherbone,
+        eth_ip                = args.eth_ip,
+        eth_phy               = args.eth_phy,
+        dram_arbiter_fairness = args.dram_arbiter_fairness,
         **soc_core_argdict(args))
     builder = Builder(soc, **builder_argdict(args))
     builder.build(run=args.build)
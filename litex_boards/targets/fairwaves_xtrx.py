@@ -30,6 +30,7 @@ import sys
 from migen import *
 
 from litex_boards.platforms import fairwaves_xtrx
+from litex_boards.cores.pcie import get_pcie_data_width
 
 from litex.soc.interconnect.csr import *
 from litex.soc.integration.soc_core import *
@@ -63,7 +64,7 @@ class CRG(Module):
 # BaseSoC -----------------------------------------------------------------------------------------
 
 class BaseSoC(SoCCore):
-    def __init__(self, sys_clk_freq=int(125e6), with_pcie=False, with_led_chaser=True, **kwargs):
+    def __init__(self, sys_clk_freq=int(125e6), with_pcie=False, pcie_lanes=2, pcie_data_width=None, pcie_dmas=1, with_led_chaser=True, **kwargs):
         platform = fairwaves_xtrx.Platform()
 
         # SoCCore ----------------------------------------------------------------------------------
@@ -78,10 +79,11 @@ class BaseSoC(SoCCore):
 
         # PCIe -------------------------------------------------------------------------------------
         if with_pcie:
-            self.submodules.pcie_phy = S7PCIEPHY(platform, platform.request("pcie_x2"),
-                data_width = 64,
-                bar0_size  = 0x20000)
-            self.add_pcie(phy=self.pcie_phy, ndmas=1)
+            self.submodules.pcie_phy = S7PCIEPHY(platform, platform.request(f"pcie_x{pcie_lanes}"),
+                data_width      = get_pcie_data_width(S7PCIEPHY, pcie_lanes, pcie_data_width),
+                pcie_data_width = get_pcie_data_width(S7PCIEPHY, pcie_lanes),
+                bar0_size       = 0x20000)
+            self.add_pcie(phy=self.pcie_phy, ndmas=pcie_dmas)
 
             # ICAP (For FPGA reload over PCIe).
             from litex.soc.cores.icap import ICAP
@@ -106,19 +108,25 @@ class BaseSoC(SoCCore):
 
 def main():
     parser = argparse.ArgumentParser(description="LiteX SoC on Fairwaves XTRX")
-    parser.add_argument("--build",           action="store_true", help="Build bitstream.")
-    parser.add_argument("--load",            action="store_true", help="Load bitstream.")
-    parser.add_argument("--flash",           action="store_true", help="Flash bitstream.")
-    parser.add_argument("--sys-clk-freq",    default=125e6,       help="System clock frequency.")
-    parser.add_argument("--with-pcie",       action="store_true", help="Enable PCIe support.")
-    parser.add_argument("--driver",          action="store_true", help="Generate PCIe driver.")
+    parser.add_argument("--build",           action="store_true",    help="Build bitstream.")
+    parser.add_argument("--load",            action="store_true",    help="Load bitstream.")
+    parser.add_argument("--flash",           action="store_true",    help="Flash bitstream.")
+    parser.add_argument("--sys-clk-freq",    default=125e6,          help="System clock frequency.")
+    parser.add_argument("--with-pcie",       action="store_true",    help="Enable PCIe support.")
+    parser.add_argument("--pcie-lanes",      default=2, type=int,    help="PCIe lanes (2).")
+    parser.add_argument("--pcie-data-width", default=None, type=int, help="PCIe datapath width (default: sustaining the lanes bandwidth).")
+    parser.add_argument("--pcie-dmas",       default=1, type=int,    help="Number of PCIe DMA channels.")
+    parser.add_argument("--driver",          action="store_true",    help="Generate PCIe driver.")
     builder_args(parser)
     soc_core_args(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
-        sys_clk_freq = int(float(args.sys_clk_freq)),
-        with_pcie    = args.with_pcie,
+        sys_clk_freq    = int(float(args.sys_clk_freq)),
+        with_pcie       = args.with_pcie,
+        pcie_lanes      = args.pcie_lanes,
+        pcie_data_width = args.pcie_data_width,
+        pcie_dmas       = args.pcie_dmas,
         **soc_core_argdict(args)
     )
     builder  = Builder(soc, **builder_argdict(args))
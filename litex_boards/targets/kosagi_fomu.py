@@ -16,6 +16,7 @@ from migen import *
 from migen.genlib.resetsync import AsyncResetSynchronizer
 
 from litex_boards.platforms import fomu_pvt
+from litex_boards.cores.spiflash import add_spi_flash_prefetcher
 
 from litex.soc.cores.ram import Up5kSPRAM
 from litex.soc.cores.clock import iCE40PLL
@@ -69,7 +70,7 @@ class _CRG(Module):
 
 class BaseSoC(SoCCore):
     def __init__(self, bios_flash_offset, spi_flash_module="AT25SF161", sys_clk_freq=int(12e6),
-                 with_led_chaser=True, **kwargs):
+                 with_led_chaser=True, spi_flash_prefetch_lines=0, **kwargs):
         kwargs["uart_name"] = "usb_acm" # Enforce UART to USB-ACM
         platform = fomu_pvt.Platform()
 
@@ -117,6 +118,8 @@ class BaseSoC(SoCCore):
             "W25Q128JV":  lambda: W25Q128JV( Codes.READ_1_1_4),
         }
         self.add_spi_flash(mode="4x", module=spi_flash_modules[spi_flash_module](), with_master=False)
+        if spi_flash_prefetch_lines:
+            add_spi_flash_prefetcher(self, nlines=spi_flash_prefetch_lines)
 
         # Add ROM linker region --------------------------------------------------------------------
         self.bus.add_region("rom", SoCRegion(
@@ -164,10 +167,11 @@ def flash(build_dir, build_name, bios_flash_offset):
 
 def main():
     parser = argparse.ArgumentParser(description="LiteX SoC on Fomu")
-    parser.add_argument("--build",             action="store_true", help="Build bitstream.")
-    parser.add_argument("--sys-clk-freq",      default=12e6,        help="System clock frequency.")
-    parser.add_argument("--bios-flash-offset", default="0x20000",   help="BIOS offset in SPI Flash.")
-    parser.add_argument("--flash",             action="store_true", help="Flash Bitstream.")
+    parser.add_argument("--build",                    action="store_true", help="Build bitstream.")
+    parser.add_argument("--sys-clk-freq",             default=12e6,        help="System clock frequency.")
+    parser.add_argument("--bios-flash-offset",        default="0x20000",   help="BIOS offset in SPI Flash.")
+    parser.add_argument("--spi-flash-prefetch-lines", default=0, type=int, help="SPI Flash prefetcher lines (32 bytes each, 0 to disable, 32/128 lines: ~4/10 EBRs).")
+    parser.add_argument("--flash",                    action="store_true", help="Flash Bitstream.")
     builder_args(parser)
     soc_core_args(parser)
     args = parser.parse_args()
@@ -175,8 +179,9 @@ def main():
     dfu_flash_offset = 0x40000
 
     soc = BaseSoC(
-        bios_flash_offset = dfu_flash_offset + int(args.bios_flash_offset, 0),
-        sys_clk_freq      = int(float(args.sys_clk_freq)),
+        bios_flash_offset        = dfu_flash_offset + int(args.bios_flash_offset, 0),
+        sys_clk_freq             = int(float(args.sys_clk_freq)),
+        spi_flash_prefetch_lines = args.spi_flash_prefetch_lines,
         **soc_core_argdict(args)
     )
     builder = Builder(soc, **builder_argdict(args))
@@ -29,6 +29,8 @@ from litedram.phy import ECP5DDRPHY
 
 from liteeth.phy.ecp5rgmii import LiteEthPHYRGMII
 
+from litex_boards.cores.ethernet import add_dual_ethernet
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
@@ -82,7 +84,7 @@ class _CRG(Module):
 class BaseSoC(SoCCore):
     def __init__(self, sys_clk_freq=int(75e6), device="LFE5UM5G", with_ethernet=False,
                  with_etherbone=False, with_led_chaser=True, eth_ip=DEFAULT_IP_PREFIX + "50", eth_phy=0,
-                 toolchain="trellis", **kwargs):
+                 eth_dual=None, eth_dual_loopback=None, toolchain="trellis", **kwargs):
         platform = versa_ecp5.Platform(toolchain=toolchain, device=device)
 
         # FIXME: adapt integrated rom size for Microwatt
@@ -111,7 +113,7 @@ class BaseSoC(SoCCore):
             )
 
         # Ethernet / Etherbone ---------------------------------------------------------------------
-        if with_ethernet or with_etherbone:
+        if (with_ethernet or with_etherbone) and eth_dual is None:
             self.submodules.ethphy = LiteEthPHYRGMII(
                 clock_pads = self.platform.request("eth_clocks", eth_phy),
                 pads       = self.platform.request("eth", eth_phy),
@@ -122,6 +124,23 @@ class BaseSoC(SoCCore):
             if with_etherbone:
                 self.add_etherbone(phy=self.ethphy, ip_address=eth_ip)
 
+        # Dual Ethernet (Etherbone/UDP) ------------------------------------------------------------
+        if eth_dual is not None:
+            if with_ethernet:
+                raise ValueError("Dual Ethernet is only supported with Etherbone/UDP.")
+            ethphys = []
+            for n in range(2):
+                ethphy = LiteEthPHYRGMII(
+                    clock_pads = self.platform.request("eth_clocks", n),
+                    pads       = self.platform.request("eth", n),
+                    tx_delay   = 0e-9,
+                    rx_delay   = 0e-9)
+                ethphy = ClockDomainsRenamer({"eth_tx": f"eth{n}_tx", "eth_rx": f"eth{n}_rx"})(ethphy)
+                setattr(self.submodules, f"ethphy{n}", ethphy)
+                ethphys.append(ethphy)
+            add_dual_ethernet(self, ethphys, ip_address=eth_ip, mode=eth_dual, with_etherbone=with_etherbone,
+                with_loopback=eth_dual_loopback)
+
         # Leds -------------------------------------------------------------------------------------
         if with_led_chaser:
             self.submodules.leds = LedChaser(
@@ -142,19 +161,23 @@ def main():
     ethopts.add_argument("--with-etherbone", action="store_true",              help="Enable Etherbone support.")
     parser.add_argument("--eth-ip",          default=DEFAULT_IP_PREFIX + "50", type=str, help="Ethernet/Etherbone IP address.")
     parser.add_argument("--eth-phy",         default=0, type=int,              help="Ethernet PHY (0 or 1).")
+    parser.add_argument("--eth-dual",        default=None,                     help="Use both Ethernet PHYs: etherbone+udp, round-robin or hash (UDP load sharing).", choices=["etherbone+udp", "round-robin", "hash"])
+    parser.add_argument("--eth-dual-loopback", action="store_true", default=None, help="Loop back (UDP echo) the UDP data port (default with --eth-dual=etherbone+udp).")
     builder_args(parser)
     soc_core_args(parser)
     trellis_args(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
-        sys_clk_freq   = int(float(args.sys_clk_freq)),
-        device         = args.device,
-        with_ethernet  = args.with_ethernet,
-        with_etherbone = args.with_etherbone,
-        eth_ip         = args.eth_ip,
-        eth_phy        = args.eth_phy,
-        toolchain      = args.toolchain,
+        sys_clk_freq      = int(float(args.sys_clk_freq)),
+        device            = args.device,
+        with_ethernet     = args.with_ethernet,
+        with_etherbone    = args.with_etherbone,
+        eth_ip            = args.eth_ip,
+        eth_phy           = args.eth_phy,
+        eth_dual          = args.eth_dual,
+        eth_dual_loopback = args.eth_dual_loopback,
+        toolchain         = args.toolchain,
         **soc_core_argdict(args)
     )
     builder = Builder(soc, **builder_argdict(args))
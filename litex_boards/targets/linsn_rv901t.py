@@ -25,6 +25,8 @@ from litedram.phy import GENSDRPHY
 
 from liteeth.phy.s6rgmii import LiteEthPHYRGMII
 
+from litex_boards.cores.ethernet import add_dual_ethernet
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
@@ -49,7 +51,8 @@ class _CRG(Module):
 # BaseSoC ------------------------------------------------------------------------------------------
 
 class BaseSoC(SoCCore):
-    def __init__(self, sys_clk_freq=int(75e6), with_ethernet=False, with_etherbone=False, eth_phy=0, with_led_chaser=True, **kwargs):
+    def __init__(self, sys_clk_freq=int(75e6), with_ethernet=False, with_etherbone=False, eth_ip="192.168.1.50",
+                 eth_phy=0, eth_dual=None, eth_dual_loopback=None, with_led_chaser=True, **kwargs):
         platform     = linsn_rv901t.Platform()
 
         # SoCCore ----------------------------------------------------------------------------------
@@ -70,7 +73,7 @@ class BaseSoC(SoCCore):
             )
 
         # Ethernet / Etherbone ---------------------------------------------------------------------
-        if with_ethernet or with_etherbone:
+        if (with_ethernet or with_etherbone) and eth_dual is None:
             self.submodules.ethphy = LiteEthPHYRGMII(
                 clock_pads = self.platform.request("eth_clocks", eth_phy),
                 pads       = self.platform.request("eth", eth_phy),
@@ -78,11 +81,31 @@ class BaseSoC(SoCCore):
             if with_ethernet:
                 self.add_ethernet(phy=self.ethphy, with_timing_constraints=False)
             if with_etherbone:
-                self.add_etherbone(phy=self.ethphy, with_timing_constraints=False)
+                self.add_etherbone(phy=self.ethphy, ip_address=eth_ip, with_timing_constraints=False)
             # Timing Constraints.
             platform.add_period_constraint(platform.lookup_request("eth_clocks", eth_phy).rx, 1e9/125e6)
             platform.add_false_path_constraints(self.crg.cd_sys.clk, platform.lookup_request("eth_clocks", eth_phy).rx)
 
+        # Dual Ethernet (Etherbone/UDP) ------------------------------------------------------------
+        if eth_dual is not None:
+            if with_ethernet:
+                raise ValueError("Dual Ethernet is only supported with Etherbone/UDP.")
+            ethphys = []
+            for n in range(2):
+                ethphy = LiteEthPHYRGMII(
+                    clock_pads = self.platform.request("eth_clocks", n),
+                    pads       = self.platform.request("eth", n),
+                    tx_delay   = 0e-9)
+                ethphy = ClockDomainsRenamer({"eth_tx": f"eth{n}_tx", "eth_rx": f"eth{n}_rx"})(ethphy)
+                setattr(self.submodules, f"ethphy{n}", ethphy)
+                ethphys.append(ethphy)
+            add_dual_ethernet(self, ethphys, ip_address=eth_ip, mode=eth_dual, with_etherbone=with_etherbone,
+                with_loopback=eth_dual_loopback, with_timing_constraints=False)
+            # Timing Constraints.
+            for n in range(2):
+                platform.add_period_constraint(platform.lookup_request("eth_clocks", n).rx, 1e9/125e6)
+                platform.add_false_path_constraints(self.crg.cd_sys.clk, platform.lookup_request("eth_clocks", n).rx)
+
         # Leds -------------------------------------------------------------------------------------
         if with_led_chaser:
             self.submodules.leds = LedChaser(
@@ -99,16 +122,22 @@ def main():
     ethopts = parser.add_mutually_exclusive_group()
     ethopts.add_argument("--with-ethernet",  action="store_true", help="Enable Ethernet support.")
     ethopts.add_argument("--with-etherbone", action="store_true", help="Enable Etherbone support.")
+    parser.add_argument("--eth-ip",          default="192.168.1.50", type=str, help="Ethernet/Etherbone IP address.")
     parser.add_argument("--eth-phy",         default=0, type=int, help="Ethernet PHY (0 or 1).")
+    parser.add_argument("--eth-dual",        default=None,        help="Use both Ethernet PHYs: etherbone+udp, round-robin or hash (UDP load sharing).", choices=["etherbone+udp", "round-robin", "hash"])
+    parser.add_argument("--eth-dual-loopback", action="store_true", default=None, help="Loop back (UDP echo) the UDP data port (default with --eth-dual=etherbone+udp).")
     builder_args(parser)
     soc_core_args(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
-        sys_clk_freq   = int(float(args.sys_clk_freq)),
-        with_ethernet  = args.with_ethernet,
-        with_etherbone = args.with_etherbone,
-        eth_phy        = int(args.eth_phy),
+        sys_clk_freq      = int(float(args.sys_clk_freq)),
+        with_ethernet     = args.with_ethernet,
+        with_etherbone    = args.with_etherbone,
+        eth_ip            = args.eth_ip,
+        eth_phy           = int(args.eth_phy),
+        eth_dual          = args.eth_dual,
+        eth_dual_loopback = args.eth_dual_loopback,
         **soc_core_argdict(args)
     )
     builder = Builder(soc, **builder_argdict(args))
@@ -19,12 +19,10 @@ from litex.build.xilinx.vivado import vivado_build_args, vivado_build_argdict
 
 from litex.soc.cores.clock import *
 from litex.soc.integration.soc_core import *
-from litex.soc.integration.soc import SoCRegion
 from litex.soc.integration.builder import *
 from litex.soc.cores.led import LedChaser
-from litex.soc.interconnect import wishbone
 
-from litex.soc.integration.soc import colorer
+from litex_boards.cores.sram import add_async_sram
 
 kB = 1024
 mB = 1024*kB
@@ -50,61 +48,6 @@ class _CRG(Module):
 
         platform.add_false_path_constraints(self.cd_sys.clk, pll.clkin) # Ignore sys_clk to pll.clkin path created by SoC's rst.
 
-# AsyncSRAM ------------------------------------------------------------------------------------------
-
-class AsyncSRAM(Module):
-    def __init__(self, platform, size):
-        addr_width = size//8
-        data_width = 8
-        self.bus = wishbone.Interface(data_width=data_width,adr_width=addr_width)
-        issiram = platform.request("issiram")
-        addr = issiram.addr
-        data = issiram.data
-        wen = issiram.wen
-        cen = issiram.cen
-        ########################
-        tristate_data = TSTriple(data_width)
-        self.specials += tristate_data.get_tristate(data)
-        ########################
-        chip_ena = self.bus.cyc & self.bus.stb & self.bus.sel[0]
-        write_ena = (chip_ena & self.bus.we)
-        ########################
-        # external write enable, 
-        # external chip enable, 
-        # internal tristate write enable
-        ########################
-        self.comb += [
-            cen.eq(~chip_ena),
-            wen.eq(~write_ena),
-            tristate_data.oe.eq(write_ena)
-        ]
-        ########################
-        # address and data
-        ########################
-        self.comb += [
-            addr.eq(self.bus.adr[:addr_width]),
-            self.bus.dat_r.eq(tristate_data.i[:data_width]),
-            tristate_data.o.eq(self.bus.dat_w[:data_width])
-        ]
-        ########################
-        # generate ack
-        ########################
-        self.sync += [
-            self.bus.ack.eq(self.bus.cyc & self.bus.stb & ~self.bus.ack),
-        ]
-        ########################
-
-def addAsyncSram(soc, platform, name, origin, size):
-    ram_bus = wishbone.Interface(data_width=soc.bus.data_width)
-    ram     = AsyncSRAM(platform,size)
-    soc.bus.add_slave(name, ram.bus, SoCRegion(origin=origin, size=size, mode="rw"))
-    soc.check_if_exists(name)
-    soc.logger.info("ISSIRAM {} {} {}.".format(
-        colorer(name),
-        colorer("added", color="green"),
-        soc.bus.regions[name]))
-    setattr(soc.submodules, name, ram)
-
 # BaseSoC ------------------------------------------------------------------------------------------
 
 class BaseSoC(SoCCore):
@@ -126,7 +69,8 @@ class BaseSoC(SoCCore):
 
         self.submodules.crg = _CRG(platform, sys_clk_freq)
 
-        addAsyncSram(self,platform,"main_ram",0x40000000,512*1024)
+        # AsyncSRAM --------------------------------------------------------------------------------
+        add_async_sram(self, platform.request("issiram"), name="main_ram", origin=0x40000000, size=512*kB)
         
         #self.add_timer()
 
@@ -15,6 +15,7 @@ from migen import *
 from migen.genlib.resetsync import AsyncResetSynchronizer
 
 from litex_boards.platforms import muselab_icesugar
+from litex_boards.cores.spiflash import add_spi_flash_prefetcher
 
 from litex.soc.cores.ram import Up5kSPRAM
 from litex.soc.cores.clock import iCE40PLL
@@ -58,7 +59,7 @@ class _CRG(Module):
 
 class BaseSoC(SoCCore):
     def __init__(self, bios_flash_offset, sys_clk_freq=int(24e6), with_led_chaser=True,
-                 with_video_terminal=False, **kwargs):
+                 with_video_terminal=False, spi_flash_prefetch_lines=0, **kwargs):
         platform = muselab_icesugar.Platform()
 
         # Disable Integrated ROM/SRAM since too large for iCE40 and UP5K has specific SPRAM.
@@ -85,6 +86,8 @@ class BaseSoC(SoCCore):
         from litespi.modules import W25Q64FV
         from litespi.opcodes import SpiNorFlashOpCodes as Codes
         self.add_spi_flash(mode="1x", module=W25Q64FV(Codes.READ_1_1_1), with_master=False)
+        if spi_flash_prefetch_lines:
+            add_spi_flash_prefetcher(self, nlines=spi_flash_prefetch_lines)
 
         # Add ROM linker region --------------------------------------------------------------------
         self.bus.add_region("rom", SoCRegion(
@@ -113,18 +116,20 @@ def flash(bios_flash_offset):
 
 def main():
     parser = argparse.ArgumentParser(description="LiteX SoC on iCEBreaker")
-    parser.add_argument("--build",               action="store_true", help="Build bitstream.")
-    parser.add_argument("--load",                action="store_true", help="Load bitstream.")
-    parser.add_argument("--flash",               action="store_true", help="Flash Bitstream.")
-    parser.add_argument("--sys-clk-freq",        default=24e6,        help="System clock frequency.")
-    parser.add_argument("--bios-flash-offset",   default="0x40000",   help="BIOS offset in SPI Flash.")
+    parser.add_argument("--build",                    action="store_true", help="Build bitstream.")
+    parser.add_argument("--load",                     action="store_true", help="Load bitstream.")
+    parser.add_argument("--flash",                    action="store_true", help="Flash Bitstream.")
+    parser.add_argument("--sys-clk-freq",             default=24e6,        help="System clock frequency.")
+    parser.add_argument("--bios-flash-offset",        default="0x40000",   help="BIOS offset in SPI Flash.")
+    parser.add_argument("--spi-flash-prefetch-lines", default=0, type=int, help="SPI Flash prefetcher lines (32 bytes each, 0 to disable, 32/128 lines: ~4/10 EBRs).")
     builder_args(parser)
     soc_core_args(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
-        bios_flash_offset   = int(args.bios_flash_offset, 0),
-        sys_clk_freq        = int(float(args.sys_clk_freq)),
+        bios_flash_offset        = int(args.bios_flash_offset, 0),
+        sys_clk_freq             = int(float(args.sys_clk_freq)),
+        spi_flash_prefetch_lines = args.spi_flash_prefetch_lines,
         **soc_core_argdict(args)
     )
     builder = Builder(soc, **builder_argdict(args))
@@ -14,6 +14,7 @@ import sys
 from migen import *
 
 from litex_boards.platforms import aller
+from litex_boards.cores.pcie import get_pcie_data_width
 
 from litex.soc.interconnect.csr import *
 from litex.soc.integration.soc_core import *
@@ -56,7 +57,7 @@ class CRG(Module):
 # BaseSoC -----------------------------------------------------------------------------------------
 
 class BaseSoC(SoCCore):
-    def __init__(self, sys_clk_freq=int(100e6), with_led_chaser=True, with_pcie=False, **kwargs):
+    def __init__(self, sys_clk_freq=int(100e6), with_led_chaser=True, with_pcie=False, pcie_lanes=4, pcie_data_width=None, pcie_dmas=1, **kwargs):
         platform = aller.Platform()
 
         # SoCCore ----------------------------------------------------------------------------------
@@ -84,10 +85,11 @@ class BaseSoC(SoCCore):
 
         # PCIe -------------------------------------------------------------------------------------
         if with_pcie:
-            self.submodules.pcie_phy = S7PCIEPHY(platform, platform.request("pcie_x4"),
-                data_width = 128,
-                bar0_size  = 0x20000)
-            self.add_pcie(phy=self.pcie_phy, ndmas=1)
+            self.submodules.pcie_phy = S7PCIEPHY(platform, platform.request(f"pcie_x{pcie_lanes}"),
+                data_width      = get_pcie_data_width(S7PCIEPHY, pcie_lanes, pcie_data_width),
+                pcie_data_width = get_pcie_data_width(S7PCIEPHY, pcie_lanes),
+                bar0_size       = 0x20000)
+            self.add_pcie(phy=self.pcie_phy, ndmas=pcie_dmas)
 
         # Leds -------------------------------------------------------------------------------------
         if with_led_chaser:
@@ -99,18 +101,24 @@ class BaseSoC(SoCCore):
 
 def main():
     parser = argparse.ArgumentParser(description="LiteX SoC on Aller")
-    parser.add_argument("--build",        action="store_true", help="Build bitstream.")
-    parser.add_argument("--load",         action="store_true", help="Load bitstream.")
-    parser.add_argument("--sys-clk-freq", default=100e6,       help="System clock frequency.")
-    parser.add_argument("--with-pcie",    action="store_true", help="Enable PCIe support.")
-    parser.add_argument("--driver",       action="store_true", help="Generate LitePCIe driver.")
+    parser.add_argument("--build",           action="store_true",    help="Build bitstream.")
+    parser.add_argument("--load",            action="store_true",    help="Load bitstream.")
+    parser.add_argument("--sys-clk-freq",    default=100e6,          help="System clock frequency.")
+    parser.add_argument("--with-pcie",       action="store_true",    help="Enable PCIe support.")
+    parser.add_argument("--pcie-lanes",      default=4, type=int,    help="PCIe lanes (1 or 4).")
+    parser.add_argument("--pcie-data-width", default=None, type=int, help="PCIe datapath width (default: sustaining the lanes bandwidth).")
+    parser.add_argument("--pcie-dmas",       default=1, type=int,    help="Number of PCIe DMA channels.")
+    parser.add_argument("--driver",          action="store_true",    help="Generate LitePCIe driver.")
     builder_args(parser)
     soc_core_args(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
-        sys_clk_freq = int(float(args.sys_clk_freq)),
-        with_pcie    = args.with_pcie,
+        sys_clk_freq    = int(float(args.sys_clk_freq)),
+        with_pcie       = args.with_pcie,
+        pcie_lanes      = args.pcie_lanes,
+        pcie_data_width = args.pcie_data_width,
+        pcie_dmas       = args.pcie_dmas,
         **soc_core_argdict(args)
     )
     builder = Builder(soc, **builder_argdict(args))
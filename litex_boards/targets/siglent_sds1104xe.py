@@ -69,7 +69,8 @@ class _CRG(Module):
 # BaseSoC ------------------------------------------------------------------------------------------
 
 class BaseSoC(SoCCore):
-    def __init__(self, sys_clk_freq=int(100e6), with_etherbone=True, eth_ip=DEFAULT_IP_PREFIX + "50", with_video_terminal=False, with_video_framebuffer=False, **kwargs):
+    def __init__(self, sys_clk_freq=int(100e6), with_etherbone=True, eth_ip=DEFAULT_IP_PREFIX + "50", eth_data_width=8,
+                 with_video_terminal=False, with_video_framebuffer=False, **kwargs):
         platform = sds1104xe.Platform()
 
         # SoCCore ----------------------------------------------------------------------------------
@@ -113,23 +114,30 @@ class BaseSoC(SoCCore):
             etherbone_ip_address  = convert_ip(DEFAULT_IP_PREFIX + "51")
             etherbone_mac_address = 0x10e2d5000001
 
+            # Datapath: 8-bit (in PHY clock domains for the MAC) or 32-bit (in sys clock domain with
+            # the width conversion/CDC at the PHY boundary).
+            assert eth_data_width in [8, 32]
+            dw = eth_data_width
+
             # Ethernet MAC
-            self.submodules.ethmac = LiteEthMAC(phy=self.ethphy, dw=8,
-                interface  = "hybrid",
-                endianness = self.cpu.endianness,
-                hw_mac     = etherbone_mac_address)
+            self.submodules.ethmac = LiteEthMAC(phy=self.ethphy, dw=dw,
+                interface         = "hybrid",
+                endianness        = self.cpu.endianness,
+                hw_mac            = etherbone_mac_address,
+                with_sys_datapath = (dw == 32))
 
             # Software Interface.
-            self.add_memory_region("ethmac", getattr(self.mem_map, "ethmac", None), 0x2000, type="io")
-            self.add_wb_slave(self.mem_regions["ethmac"].origin, self.ethmac.bus, 0x2000)
+            ethmac_region_size = (self.ethmac.rx_slots.constant + self.ethmac.tx_slots.constant)*self.ethmac.slot_size.constant
+            self.add_memory_region("ethmac", getattr(self.mem_map, "ethmac", None), ethmac_region_size, type="io")
+            self.add_wb_slave(self.mem_regions["ethmac"].origin, self.ethmac.bus, ethmac_region_size)
             if self.irq.enabled:
                 self.irq.add("ethmac", use_loc_if_exists=True)
 
             # Hardware Interface.
-            self.submodules.arp  = LiteEthARP(self.ethmac, etherbone_mac_address, etherbone_ip_address, sys_clk_freq, dw=8)
-            self.submodules.ip   = LiteEthIP(self.ethmac, etherbone_mac_address, etherbone_ip_address, self.arp.table, dw=8)
-            self.submodules.icmp = LiteEthICMP(self.ip, etherbone_ip_address, dw=8)
-            self.submodules.udp  = LiteEthUDP(self.ip, etherbone_ip_address, dw=8)
+            self.submodules.arp  = LiteEthARP(self.ethmac, etherbone_mac_address, etherbone_ip_address, sys_clk_freq, dw=dw)
+            self.submodules.ip   = LiteEthIP(self.ethmac, etherbone_mac_address, etherbone_ip_address, self.arp.table, dw=dw)
+            self.submodules.icmp = LiteEthICMP(self.ip, etherbone_ip_address, dw=dw)
+            self.submodules.udp  = LiteEthUDP(self.ip, etherbone_ip_address, dw=dw)
             self.add_constant("ETH_PHY_NO_RESET") # Disable reset from BIOS to avoid disabling Hardware Interface.
 
             # Etherbone
@@ -171,6 +179,7 @@ def main():
     parser.add_argument("--sys-clk-freq",   default=100e6,                    help="System clock frequency.")
     parser.add_argument("--with-etherbone", action="store_true",              help="Enable Etherbone support.")
     parser.add_argument("--eth-ip",         default=DEFAULT_IP_PREFIX + "50", type=str, help="Ethernet/Etherbone IP address.")
+    parser.add_argument("--eth-data-width", default=8, type=int,              help="Ethernet/Etherbone datapath width (8 or 32).")
     viopts = parser.add_mutually_exclusive_group()
     viopts.add_argument("--with-video-terminal",    action="store_true", help="Enable Video Terminal (HDMI).")
     viopts.add_argument("--with-video-framebuffer", action="store_true", help="Enable Video Framebuffer (HDMI).")
@@ -183,6 +192,7 @@ def main():
         sys_clk_freq   = int(float(args.sys_clk_freq)),
         with_etherbone = args.with_etherbone,
         eth_ip         = args.eth_ip,
+        eth_data_width = args.eth_data_width,
         with_video_terminal    = args.with_video_terminal,
         with_video_framebuffer = args.with_video_framebuffer,
         **soc_core_argdict(args)
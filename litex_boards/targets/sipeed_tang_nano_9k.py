@@ -20,8 +20,8 @@ from litex.soc.cores.led import LedChaser
 from litex.soc.cores.video import *
 
 from litex_boards.platforms import tang_nano_9k
-
-from litehyperbus.core.hyperbus import HyperRAM
+from litex_boards.cores.hyperram import add_hyperram
+from litex_boards.cores.spiflash import add_spi_flash_prefetcher
 
 kB = 1024
 mB = 1024*kB
@@ -48,8 +48,8 @@ class _CRG(Module):
 # BaseSoC ------------------------------------------------------------------------------------------
 
 class BaseSoC(SoCCore):
-    def __init__(self, sys_clk_freq=int(27e6), bios_flash_offset=0x0,
-                 with_led_chaser=True, **kwargs):
+    def __init__(self, sys_clk_freq=int(27e6), bios_flash_offset=0x0, hyperram_chips=2,
+                 spi_flash_mode="2x", spi_flash_prefetch_lines=0, with_led_chaser=True, **kwargs):
         platform = tang_nano_9k.Platform()
 
         # Disable Integrated ROM
@@ -64,9 +64,25 @@ class BaseSoC(SoCCore):
         self.submodules.crg = _CRG(platform, sys_clk_freq)
 
         # SPI Flash --------------------------------------------------------------------------------
-        from litespi.modules import W25Q32
+        # Only CS#/CLK/MOSI/MISO are wired: Dual reads (on MOSI/MISO) at most. The BIOS is executed
+        # from the SPI Flash, the optional prefetcher keeps the next lines of code in block RAM.
+        # Dual I/O reads (READ_1_2_2/0xBB) would also send the address on 2 lines (24 vs 40 clocks
+        # before the data) but are not used: the LiteSPI MMAP sends its fixed 0xdead pattern in the
+        # dummy phase, that becomes the M7-0 mode bits of 0xBB (0xAD, M5-4=10) and would switch the
+        # W25Q32JV to Continuous Read Mode, where the next 0xBB command would be taken as address.
+        from litespi.modules import W25Q32, W25Q32JV
         from litespi.opcodes import SpiNorFlashOpCodes as Codes
-        self.add_spi_flash(mode="1x", module=W25Q32(Codes.READ_1_1_1), with_master=False)
+        from litespi.phy.generic import LiteSPIPHY
+        if spi_flash_mode == "1x":
+            self.add_spi_flash(mode="1x", module=W25Q32(Codes.READ_1_1_1), with_master=False)
+        else:
+            spiflash_module = W25Q32JV(Codes.READ_1_1_2)
+            self.submodules.spiflash_phy = LiteSPIPHY(platform.request("spiflash2x"), spiflash_module,
+                device          = platform.device,
+                default_divisor = 1)
+            self.add_spi_flash(phy=self.spiflash_phy, module=spiflash_module, with_master=False)
+        if spi_flash_prefetch_lines:
+            add_spi_flash_prefetcher(self, nlines=spi_flash_prefetch_lines)
 
         # Add ROM linker region --------------------------------------------------------------------
         self.bus.add_region("rom", SoCRegion(
@@ -78,26 +94,27 @@ class BaseSoC(SoCCore):
 
         # HyperRAM ---------------------------------------------------------------------------------
         if not self.integrated_main_ram_size:
-            # TODO: Use second 32Mbit PSRAM chip.
-            dq      = platform.request("IO_psram_dq")
-            rwds    = platform.request("IO_psram_rwds")
-            reset_n = platform.request("O_psram_reset_n")
-            cs_n    = platform.request("O_psram_cs_n")
-            ck      = platform.request("O_psram_ck")
-            ck_n    = platform.request("O_psram_ck_n")
+            # 2x32Mbit PSRAM chips (each on its own byte lane): one chip (4MB) or both chips driven
+            # in lockstep as one 16-bit HyperRAM (8MB, 2x burst bandwidth).
+            ck   = platform.request("O_psram_ck")
+            ck_n = platform.request("O_psram_ck_n")
             class HyperRAMPads:
-                def __init__(self, n):
+                def __init__(self, chips):
                     self.clk   = Signal()
-                    self.rst_n = reset_n[n]
-                    self.dq    = dq[8*n:8*(n+1)]
-                    self.cs_n  = cs_n[n]
-                    self.rwds  = rwds[n]
-
-            hyperram_pads = HyperRAMPads(0)
-            self.comb += ck[0].eq(hyperram_pads.clk)
-            self.comb += ck_n[0].eq(~hyperram_pads.clk)
-            self.submodules.hyperram = HyperRAM(hyperram_pads)
-            self.bus.add_slave("main_ram", slave=self.hyperram.bus, region=SoCRegion(origin=self.mem_map["main_ram"], size=4*mB))
+                    self.rst_n = platform.request("O_psram_reset_n")[:chips]
+                    self.cs_n  = platform.request("O_psram_cs_n")[:chips]
+                    self.dq    = platform.request("IO_psram_dq")[:8*chips]
+                    self.rwds  = platform.request("IO_psram_rwds")[:chips]
+
+            hyperram_pads = HyperRAMPads(hyperram_chips)
+            for n in range(hyperram_chips):
+                self.comb += ck[n].eq(hyperram_pads.clk)
+                self.comb += ck_n[n].eq(~hyperram_pads.clk)
+            add_hyperram(self, hyperram_pads,
+                name   = "main_ram",
+                origin = self.mem_map["main_ram"],
+                size   = hyperram_chips*4*mB,
+                chips  = hyperram_chips)
 
         # Leds -------------------------------------------------------------------------------------
         if with_led_chaser:
@@ -109,12 +126,15 @@ class BaseSoC(SoCCore):
 
 def main():
     parser = argparse.ArgumentParser(description="LiteX SoC on Tang Nano 9K")
-    parser.add_argument("--build",       action="store_true", help="Build bitstream.")
-    parser.add_argument("--load",        action="store_true", help="Load bitstream.")
-    parser.add_argument("--flash",       action="store_true", help="Flash Bitstream.")
-    parser.add_argument("--sys-clk-freq",default=27e6,        help="System clock frequency.")
-    parser.add_argument("--bios-flash-offset", default="0x0", help="BIOS offset in SPI Flash.")
-    parser.add_argument("--with-spi-sdcard", action="store_true", help="Enable SPI-mode SDCard support.")
+    parser.add_argument("--build",                    action="store_true",                 help="Build bitstream.")
+    parser.add_argument("--load",                     action="store_true",                 help="Load bitstream.")
+    parser.add_argument("--flash",                    action="store_true",                 help="Flash Bitstream.")
+    parser.add_argument("--sys-clk-freq",             default=27e6,                        help="System clock frequency.")
+    parser.add_argument("--bios-flash-offset",        default="0x0",                       help="BIOS offset in SPI Flash.")
+    parser.add_argument("--hyperram-chips",           default=2, type=int, choices=[1, 2], help="Number of PSRAM chips used for main_ram (2: 16-bit, 8MB).")
+    parser.add_argument("--spi-flash-mode",           default="2x", choices=["1x", "2x"],  help="SPI Flash read mode (2x: Dual Output reads).")
+    parser.add_argument("--spi-flash-prefetch-lines", default=0, type=int,                 help="SPI Flash prefetcher lines (32 bytes each, 0 to disable).")
+    parser.add_argument("--with-spi-sdcard",          action="store_true",                 help="Enable SPI-mode SDCard support.")
     builder_args(parser)
     soc_core_args(parser)
     args = parser.parse_args()
@@ -122,6 +142,9 @@ def main():
     soc = BaseSoC(
         sys_clk_freq=int(float(args.sys_clk_freq)),
         bios_flash_offset=int(args.bios_flash_offset, 0),
+        hyperram_chips=args.hyperram_chips,
+        spi_flash_mode=args.spi_flash_mode,
+        spi_flash_prefetch_lines=args.spi_flash_prefetch_lines,
         **soc_core_argdict(args)
     )
 
@@ -30,6 +30,7 @@ import sys
 from migen import *
 
 from litex_boards.platforms import acorn
+from litex_boards.cores.pcie import get_pcie_data_width
 
 from litex.soc.interconnect.csr import *
 from litex.soc.integration.soc_core import *
@@ -73,7 +74,7 @@ class CRG(Module):
 
 class BaseSoC(SoCCore):
     def __init__(self, variant="cle-215+", sys_clk_freq=int(100e6), with_led_chaser=True,
-                 with_pcie=False, with_sata=False, **kwargs):
+                 with_pcie=False, pcie_lanes=4, pcie_data_width=None, pcie_dmas=1, with_sata=False, **kwargs):
         platform = acorn.Platform(variant=variant)
 
         # SoCCore ----------------------------------------------------------------------------------
@@ -99,10 +100,11 @@ class BaseSoC(SoCCore):
 
         # PCIe -------------------------------------------------------------------------------------
         if with_pcie:
-            self.submodules.pcie_phy = S7PCIEPHY(platform, platform.request("pcie_x4"),
-                data_width = 128,
-                bar0_size  = 0x20000)
-            self.add_pcie(phy=self.pcie_phy, ndmas=1)
+            self.submodules.pcie_phy = S7PCIEPHY(platform, platform.request(f"pcie_x{pcie_lanes}"),
+                data_width      = get_pcie_data_width(S7PCIEPHY, pcie_lanes, pcie_data_width),
+                pcie_data_width = get_pcie_data_width(S7PCIEPHY, pcie_lanes),
+                bar0_size       = 0x20000)
+            self.add_pcie(phy=self.pcie_phy, ndmas=pcie_dmas)
             # FIXME: Apply it to all targets (integrate it in LitePCIe?).
             platform.add_period_constraint(self.crg.cd_sys.clk, 1e9/sys_clk_freq)
             platform.toolchain.pre_placement_commands.add("set_clock_groups -group [get_clocks {sys_clk}] -group [get_clocks userclk2] -asynchronous", sys_clk=self.crg.cd_sys.clk)
@@ -166,25 +168,31 @@ class BaseSoC(SoCCore):
 
 def main():
     parser = argparse.ArgumentParser(description="LiteX SoC on Acorn CLE-101/215(+)")
-    parser.add_argument("--build",           action="store_true", help="Build bitstream.")
-    parser.add_argument("--load",            action="store_true", help="Load bitstream.")
-    parser.add_argument("--flash",           action="store_true", help="Flash bitstream.")
-    parser.add_argument("--variant",         default="cle-215+",  help="Board variant (cle-215+, cle-215 or cle-101).")
-    parser.add_argument("--sys-clk-freq",    default=100e6,       help="System clock frequency.")
+    parser.add_argument("--build",           action="store_true",    help="Build bitstream.")
+    parser.add_argument("--load",            action="store_true",    help="Load bitstream.")
+    parser.add_argument("--flash",           action="store_true",    help="Flash bitstream.")
+    parser.add_argument("--variant",         default="cle-215+",     help="Board variant (cle-215+, cle-215 or cle-101).")
+    parser.add_argument("--sys-clk-freq",    default=100e6,          help="System clock frequency.")
     pcieopts = parser.add_mutually_exclusive_group()
-    pcieopts.add_argument("--with-pcie",     action="store_true", help="Enable PCIe support.")
-    parser.add_argument("--driver",          action="store_true", help="Generate PCIe driver.")
-    parser.add_argument("--with-spi-sdcard", action="store_true", help="Enable SPI-mode SDCard support (requires SDCard adapter on P2).")
-    pcieopts.add_argument("--with-sata",     action="store_true", help="Enable SATA support (over PCIe2SATA).")
+    pcieopts.add_argument("--with-pcie",     action="store_true",    help="Enable PCIe support.")
+    parser.add_argument("--pcie-lanes",      default=4, type=int,    help="PCIe lanes (4).")
+    parser.add_argument("--pcie-data-width", default=None, type=int, help="PCIe datapath width (default: sustaining the lanes bandwidth).")
+    parser.add_argument("--pcie-dmas",       default=1, type=int,    help="Number of PCIe DMA channels.")
+    parser.add_argument("--driver",          action="store_true",    help="Generate PCIe driver.")
+    parser.add_argument("--with-spi-sdcard", action="store_true",    help="Enable SPI-mode SDCard support (requires SDCard adapter on P2).")
+    pcieopts.add_argument("--with-sata",     action="store_true",    help="Enable SATA support (over PCIe2SATA).")
     builder_args(parser)
     soc_core_args(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
-        variant      = args.variant,
-        sys_clk_freq = int(float(args.sys_clk_freq)),
-        with_pcie    = args.with_pcie,
-        with_sata    = args.with_sata,
+        variant         = args.variant,
+        sys_clk_freq    = int(float(args.sys_clk_freq)),
+        with_pcie       = args.with_pcie,
+        pcie_lanes      = args.pcie_lanes,
+        pcie_data_width = args.pcie_data_width,
+        pcie_dmas       = args.pcie_dmas,
+        with_sata       = args.with_sata,
         **soc_core_argdict(args)
     )
     if args.with_spi_sdcard:
@@ -12,6 +12,7 @@ import argparse
 from migen import *
 
 from litex_boards.platforms import fk33
+from litex_boards.cores.pcie import get_pcie_data_width
 
 from litex.soc.cores.clock import *
 from litex.soc.integration.soc_core import *
@@ -43,7 +44,8 @@ class _CRG(Module):
 # BaseSoC ------------------------------------------------------------------------------------------
 
 class BaseSoC(SoCCore):
-    def __init__(self, sys_clk_freq=int(125e6), with_led_chaser=True, with_pcie=False, **kwargs):
+    def __init__(self, sys_clk_freq=int(125e6), with_led_chaser=True, with_pcie=False, pcie_lanes=4, pcie_data_width=None,
+                 pcie_dmas=1, **kwargs):
         platform = fk33.Platform()
 
         # SoCCore ----------------------------------------------------------------------------------
@@ -60,9 +62,10 @@ class BaseSoC(SoCCore):
         if with_pcie:
             assert self.csr_data_width == 32
             # PHY
-            self.submodules.pcie_phy = USPHBMPCIEPHY(platform, platform.request("pcie_x4"),
-                data_width = 128,
-                bar0_size  = 0x20000)
+            self.submodules.pcie_phy = USPHBMPCIEPHY(platform, platform.request(f"pcie_x{pcie_lanes}"),
+                data_width      = get_pcie_data_width(USPHBMPCIEPHY, pcie_lanes, pcie_data_width),
+                pcie_data_width = get_pcie_data_width(USPHBMPCIEPHY, pcie_lanes),
+                bar0_size       = 0x20000)
 
             # Endpoint
             self.submodules.pcie_endpoint = LitePCIeEndpoint(self.pcie_phy, max_pending_requests=8)
@@ -72,20 +75,21 @@ class BaseSoC(SoCCore):
                 base_address = self.mem_map["csr"])
             self.add_wb_master(self.pcie_bridge.wishbone)
 
-            # DMA0
-            self.submodules.pcie_dma0 = LitePCIeDMA(self.pcie_phy, self.pcie_endpoint,
-                with_buffering = True, buffering_depth=1024,
-                with_loopback  = True)
+            # DMAs
+            self.interrupts = {}
+            for i in range(pcie_dmas):
+                pcie_dma = LitePCIeDMA(self.pcie_phy, self.pcie_endpoint,
+                    with_buffering = True, buffering_depth=1024,
+                    with_loopback  = True)
+                setattr(self.submodules, f"pcie_dma{i}", pcie_dma)
+                self.interrupts[f"PCIE_DMA{i}_WRITER"] = pcie_dma.writer.irq
+                self.interrupts[f"PCIE_DMA{i}_READER"] = pcie_dma.reader.irq
 
-            self.add_constant("DMA_CHANNELS", 1)
+            self.add_constant("DMA_CHANNELS", pcie_dmas)
 
             # MSI
             self.submodules.pcie_msi = LitePCIeMSI()
             self.comb += self.pcie_msi.source.connect(self.pcie_phy.msi)
-            self.interrupts = {
-                "PCIE_DMA0_WRITER":    self.pcie_dma0.writer.irq,
-                "PCIE_DMA0_READER":    self.pcie_dma0.reader.irq,
-            }
             for i, (k, v) in enumerate(sorted(self.interrupts.items())):
                 self.comb += self.pcie_msi.irqs[i].eq(v)
                 self.add_constant(k + "_INTERRUPT", i)
@@ -100,18 +104,24 @@ class BaseSoC(SoCCore):
 
 def main():
     parser = argparse.ArgumentParser(description="LiteX SoC on FK33")
-    parser.add_argument("--build",        action="store_true", help="Build bitstream.")
-    parser.add_argument("--load",         action="store_true", help="Load bitstream.")
-    parser.add_argument("--sys-clk-freq", default=125e6,       help="System clock frequency.")
-    parser.add_argument("--with-pcie",    action="store_true", help="Enable PCIe support.")
-    parser.add_argument("--driver",       action="store_true", help="Generate PCIe driver.")
+    parser.add_argument("--build",           action="store_true",    help="Build bitstream.")
+    parser.add_argument("--load",            action="store_true",    help="Load bitstream.")
+    parser.add_argument("--sys-clk-freq",    default=125e6,          help="System clock frequency.")
+    parser.add_argument("--with-pcie",       action="store_true",    help="Enable PCIe support.")
+    parser.add_argument("--pcie-lanes",      default=4, type=int,    help="PCIe lanes (2, 4, 8 or 16).")
+    parser.add_argument("--pcie-data-width", default=None, type=int, help="PCIe datapath width (default: sustaining the lanes bandwidth).")
+    parser.add_argument("--pcie-dmas",       default=1, type=int,    help="Number of PCIe DMA channels.")
+    parser.add_argument("--driver",          action="store_true",    help="Generate PCIe driver.")
     builder_args(parser)
     soc_core_args(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
-        sys_clk_freq = int(float(args.sys_clk_freq)),
-        with_pcie=args.with_pcie,
+        sys_clk_freq    = int(float(args.sys_clk_freq)),
+        with_pcie       = args.with_pcie,
+        pcie_lanes      = args.pcie_lanes,
+        pcie_data_width = args.pcie_data_width,
+        pcie_dmas       = args.pcie_dmas,
         **soc_core_argdict(args)
     )
     builder = Builder(soc, **builder_argdict(args))
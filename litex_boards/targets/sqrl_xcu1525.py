@@ -25,10 +25,13 @@ from litedram.phy import usddrphy
 from litepcie.phy.usppciephy import USPPCIEPHY
 from litepcie.software import generate_litepcie_software
 
+from litex_boards.cores.sdram import add_interleaved_sdram
+from litex_boards.cores.pcie import get_pcie_data_width
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
-    def __init__(self, platform, sys_clk_freq, ddram_channel):
+    def __init__(self, platform, sys_clk_freq, ddram_channel, ddram_channels=1):
         self.rst = Signal()
         self.clock_domains.cd_sys    = ClockDomain()
         self.clock_domains.cd_sys4x  = ClockDomain(reset_less=True)
@@ -54,11 +57,20 @@ class _CRG(Module):
 
         self.submodules.idelayctrl = USPIDELAYCTRL(cd_ref=self.cd_idelay, cd_sys=self.cd_sys)
 
+        # Additional DDR4 channels: sys4x generated from the same PLL output with their own buffers
+        # (placed in the clock region of the channel), sys shared (single BUFGCE_DIV, the phase of
+        # separate dividers not being guaranteed).
+        for i in range(1, ddram_channels):
+            cd_sys4x = ClockDomain(f"sys4x_ddr{i}", reset_less=True)
+            self.clock_domains += cd_sys4x
+            self.specials += Instance("BUFGCE", name=f"ddr{i}_bufgce",
+                i_CE=1, i_I=self.cd_pll4x.clk, o_O=cd_sys4x.clk)
+
 # BaseSoC ------------------------------------------------------------------------------------------
 
 class BaseSoC(SoCCore):
-    def __init__(self, sys_clk_freq=int(125e6), ddram_channel=0, with_led_chaser=True,
-                 with_pcie=False, with_sata=False, **kwargs):
+    def __init__(self, sys_clk_freq=int(125e6), ddram_channel=0, ddram_channels=1, ddram_interleaving="cacheline",
+                 with_led_chaser=True, with_pcie=False, pcie_lanes=4, pcie_data_width=None, pcie_dmas=1, with_sata=False, **kwargs):
         platform = xcu1525.Platform()
 
         # SoCCore ----------------------------------------------------------------------------------
@@ -67,30 +79,52 @@ class BaseSoC(SoCCore):
             **kwargs)
 
         # CRG --------------------------------------------------------------------------------------
-        self.submodules.crg = _CRG(platform, sys_clk_freq, ddram_channel)
+        self.submodules.crg = _CRG(platform, sys_clk_freq, ddram_channel, ddram_channels)
 
         # DDR4 SDRAM -------------------------------------------------------------------------------
         if not self.integrated_main_ram_size:
-            self.submodules.ddrphy = usddrphy.USPDDRPHY(
-                pads             = platform.request("ddram", ddram_channel),
-                memtype          = "DDR4",
-                sys_clk_freq     = sys_clk_freq,
-                iodelay_clk_freq = 500e6)
-            self.add_sdram("sdram",
-                phy           = self.ddrphy,
-                module        = MT40A512M8(sys_clk_freq, "1:4"),
-                size          = 0x40000000,
-                l2_cache_size = kwargs.get("l2_size", 8192)
-            )
+            assert ddram_channels in [1, 2]
+            # Multi-channel: channels 0 to N-1 (sys clock from the first one).
+            ddram_channels_ids = [ddram_channel] if ddram_channels == 1 else range(ddram_channels)
+            ddrphys = []
+            for i, channel in enumerate(ddram_channels_ids):
+                ddrphy = usddrphy.USPDDRPHY(
+                    pads             = platform.request("ddram", channel),
+                    memtype          = "DDR4",
+                    sys_clk_freq     = sys_clk_freq,
+                    iodelay_clk_freq = 500e6)
+                if i > 0:
+                    ddrphy = ClockDomainsRenamer({"sys4x": f"sys4x_ddr{i}"})(ddrphy)
+                ddrphys.append(ddrphy)
+            if ddram_channels == 1:
+                self.submodules.ddrphy = ddrphys[0]
+                self.add_sdram("sdram",
+                    phy           = self.ddrphy,
+                    module        = MT40A512M8(sys_clk_freq, "1:4"),
+                    size          = 0x40000000,
+                    l2_cache_size = kwargs.get("l2_size", 8192)
+                )
+            else:
+                # Single main_ram interleaved over the channels (the PHYs are exposed as a single
+                # ddrphy by add_interleaved_sdram, the BIOS calibrating all the channels).
+                self.submodules += ddrphys
+                add_interleaved_sdram(self,
+                    phys          = ddrphys,
+                    module        = MT40A512M8(sys_clk_freq, "1:4"),
+                    size          = 0x40000000, # Limited by the 32-bit address space.
+                    interleaving  = ddram_interleaving,
+                    l2_cache_size = kwargs.get("l2_size", 8192)
+                )
             # Workadound for Vivado 2018.2 DRC, can be ignored and probably fixed on newer Vivado versions.
             platform.add_platform_command("set_property SEVERITY {{Warning}} [get_drc_checks PDCN-2736]")
 
         # PCIe -------------------------------------------------------------------------------------
         if with_pcie:
-            self.submodules.pcie_phy = USPPCIEPHY(platform, platform.request("pcie_x4"),
-                data_width = 128,
-                bar0_size  = 0x20000)
-            self.add_pcie(phy=self.pcie_phy, ndmas=1)
+            self.submodules.pcie_phy = USPPCIEPHY(platform, platform.request(f"pcie_x{pcie_lanes}"),
+                data_width      = get_pcie_data_width(USPPCIEPHY, pcie_lanes, pcie_data_width),
+                pcie_data_width = get_pcie_data_width(USPPCIEPHY, pcie_lanes),
+                bar0_size       = 0x20000)
+            self.add_pcie(phy=self.pcie_phy, ndmas=pcie_dmas)
 
         # SATA -------------------------------------------------------------------------------------
         if with_sata:
@@ -135,22 +169,32 @@ class BaseSoC(SoCCore):
 
 def main():
     parser = argparse.ArgumentParser(description="LiteX SoC on XCU1525")
-    parser.add_argument("--build",         action="store_true", help="Build bitstream.")
-    parser.add_argument("--load",          action="store_true", help="Load bitstream.")
-    parser.add_argument("--sys-clk-freq",  default=125e6,       help="System clock frequency.")
-    parser.add_argument("--ddram-channel", default="0",         help="DDRAM channel (0, 1, 2 or 3).")
-    parser.add_argument("--with-pcie",     action="store_true", help="Enable PCIe support.")
-    parser.add_argument("--driver",        action="store_true", help="Generate PCIe driver.")
-    parser.add_argument("--with-sata",     action="store_true", help="Enable SATA support (over SFP2SATA).")
+    parser.add_argument("--build",              action="store_true",    help="Build bitstream.")
+    parser.add_argument("--load",               action="store_true",    help="Load bitstream.")
+    parser.add_argument("--sys-clk-freq",       default=125e6,          help="System clock frequency.")
+    parser.add_argument("--ddram-channel",      default="0",            help="DDRAM channel (0, 1, 2 or 3).")
+    parser.add_argument("--ddram-channels",     default=1, type=int,    help="Number of DDRAM channels.", choices=[1, 2])
+    parser.add_argument("--ddram-interleaving", default="cacheline",    help="DDRAM channels interleaving granularity (cacheline or page).")
+    parser.add_argument("--with-pcie",          action="store_true",    help="Enable PCIe support.")
+    parser.add_argument("--pcie-lanes",         default=4, type=int,    help="PCIe lanes (2, 4, 8 or 16).")
+    parser.add_argument("--pcie-data-width",    default=None, type=int, help="PCIe datapath width (default: sustaining the lanes bandwidth).")
+    parser.add_argument("--pcie-dmas",          default=1, type=int,    help="Number of PCIe DMA channels.")
+    parser.add_argument("--driver",             action="store_true",    help="Generate PCIe driver.")
+    parser.add_argument("--with-sata",          action="store_true",    help="Enable SATA support (over SFP2SATA).")
     builder_args(parser)
     soc_core_args(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
-        sys_clk_freq  = int(float(args.sys_clk_freq)),
-        ddram_channel = int(args.ddram_channel, 0),
-        with_pcie     = args.with_pcie,
-        with_sata     = args.with_sata,
+        sys_clk_freq       = int(float(args.sys_clk_freq)),
+        ddram_channel      = int(args.ddram_channel, 0),
+        ddram_channels     = args.ddram_channels,
+        ddram_interleaving = args.ddram_interleaving,
+        with_pcie          = args.with_pcie,
+        pcie_lanes         = args.pcie_lanes,
+        pcie_data_width    = args.pcie_data_width,
+        pcie_dmas          = args.pcie_dmas,
+        with_sata          = args.with_sata,
         **soc_core_argdict(args)
 	)
     builder = Builder(soc, **builder_argdict(args))
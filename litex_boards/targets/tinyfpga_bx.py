@@ -15,6 +15,7 @@ from migen import *
 from litex.build.io import CRG
 
 from litex_boards.platforms import tinyfpga_bx
+from litex_boards.cores.spiflash import add_spi_flash_prefetcher
 
 from litex.soc.integration.soc_core import *
 from litex.soc.integration.soc import SoCRegion
@@ -27,7 +28,8 @@ mB = 1024*kB
 # BaseSoC ------------------------------------------------------------------------------------------
 
 class BaseSoC(SoCCore):
-    def __init__(self, bios_flash_offset, sys_clk_freq=int(16e6), with_led_chaser=True, **kwargs):
+    def __init__(self, bios_flash_offset, sys_clk_freq=int(16e6), with_led_chaser=True,
+                 spi_flash_prefetch_lines=0, **kwargs):
         platform = tinyfpga_bx.Platform()
 
         # Disable Integrated ROM since too large for iCE40.
@@ -45,6 +47,8 @@ class BaseSoC(SoCCore):
         from litespi.modules import AT25SF081
         from litespi.opcodes import SpiNorFlashOpCodes as Codes
         self.add_spi_flash(mode="1x", module=AT25SF081(Codes.READ_1_1_1), with_master=False)
+        if spi_flash_prefetch_lines:
+            add_spi_flash_prefetcher(self, nlines=spi_flash_prefetch_lines)
 
         # Add ROM linker region --------------------------------------------------------------------
         self.bus.add_region("rom", SoCRegion(
@@ -64,16 +68,18 @@ class BaseSoC(SoCCore):
 
 def main():
     parser = argparse.ArgumentParser(description="LiteX SoC on TinyFPGA BX")
-    parser.add_argument("--build",             action="store_true", help="Build bitstream.")
-    parser.add_argument("--bios-flash-offset", default="0x50000",   help="BIOS offset in SPI Flash.")
-    parser.add_argument("--sys-clk-freq",      default=16e6,        help="System clock frequency.")
+    parser.add_argument("--build",                    action="store_true", help="Build bitstream.")
+    parser.add_argument("--bios-flash-offset",        default="0x50000",   help="BIOS offset in SPI Flash.")
+    parser.add_argument("--spi-flash-prefetch-lines", default=0, type=int, help="SPI Flash prefetcher lines (32 bytes each, 0 to disable, 32/128 lines: ~4/10 EBRs).")
+    parser.add_argument("--sys-clk-freq",             default=16e6,        help="System clock frequency.")
     builder_args(parser)
     soc_core_args(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
-         bios_flash_offset = int(args.bios_flash_offset, 0),
-         sys_clk_freq      = int(float(args.sys_clk_freq)),
+         bios_flash_offset        = int(args.bios_flash_offset, 0),
+         sys_clk_freq             = int(float(args.sys_clk_freq)),
+         spi_flash_prefetch_lines = args.spi_flash_prefetch_lines,
          **soc_core_argdict(args)
     )
     builder = Builder(soc, **builder_argdict(args))
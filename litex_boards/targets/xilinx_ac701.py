@@ -13,6 +13,7 @@ import argparse
 from migen import *
 
 from litex_boards.platforms import ac701
+from litex_boards.cores.pcie import get_pcie_data_width
 
 from litex.soc.cores.clock import *
 from litex.soc.integration.soc_core import *
@@ -57,7 +58,7 @@ class _CRG(Module):
 
 class BaseSoC(SoCCore):
     def __init__(self, sys_clk_freq=int(100e6), with_ethernet=False, eth_phy="rgmii",
-                 with_led_chaser=True, with_pcie=False, **kwargs):
+                 with_led_chaser=True, with_pcie=False, pcie_lanes=4, pcie_data_width=None, pcie_dmas=1, **kwargs):
         platform = ac701.Platform()
 
         # SoCCore ----------------------------------------------------------------------------------
@@ -121,10 +122,11 @@ class BaseSoC(SoCCore):
 
         # PCIe -------------------------------------------------------------------------------------
         if with_pcie:
-            self.submodules.pcie_phy = S7PCIEPHY(platform, platform.request("pcie_x4"),
-                data_width = 128,
-                bar0_size  = 0x20000)
-            self.add_pcie(phy=self.pcie_phy, ndmas=1)
+            self.submodules.pcie_phy = S7PCIEPHY(platform, platform.request(f"pcie_x{pcie_lanes}"),
+                data_width      = get_pcie_data_width(S7PCIEPHY, pcie_lanes, pcie_data_width),
+                pcie_data_width = get_pcie_data_width(S7PCIEPHY, pcie_lanes),
+                bar0_size       = 0x20000)
+            self.add_pcie(phy=self.pcie_phy, ndmas=pcie_dmas)
 
         # Leds -------------------------------------------------------------------------------------
         if with_led_chaser:
@@ -137,20 +139,26 @@ def main():
     parser = argparse.ArgumentParser(description="LiteX SoC on AC701")
     builder_args(parser)
     soc_core_args(parser)
-    parser.add_argument("--build",         action="store_true", help="Build bitstream.")
-    parser.add_argument("--load",          action="store_true", help="Load bitstream.")
-    parser.add_argument("--sys-clk-freq",  default=100e6,       help="System clock frequency.")
-    parser.add_argument("--with-ethernet", action="store_true", help="Enable Ethernet support.")
-    parser.add_argument("--eth-phy",       default="rgmii",     help="Select Ethernet PHY (rgmii or 1000basex).")
-    parser.add_argument("--with-pcie",     action="store_true", help="Enable PCIe support.")
-    parser.add_argument("--driver",        action="store_true", help="Generate PCIe driver.")
+    parser.add_argument("--build",           action="store_true",    help="Build bitstream.")
+    parser.add_argument("--load",            action="store_true",    help="Load bitstream.")
+    parser.add_argument("--sys-clk-freq",    default=100e6,          help="System clock frequency.")
+    parser.add_argument("--with-ethernet",   action="store_true",    help="Enable Ethernet support.")
+    parser.add_argument("--eth-phy",         default="rgmii",        help="Select Ethernet PHY (rgmii or 1000basex).")
+    parser.add_argument("--with-pcie",       action="store_true",    help="Enable PCIe support.")
+    parser.add_argument("--pcie-lanes",      default=4, type=int,    help="PCIe lanes (1 or 4).")
+    parser.add_argument("--pcie-data-width", default=None, type=int, help="PCIe datapath width (default: sustaining the lanes bandwidth).")
+    parser.add_argument("--pcie-dmas",       default=1, type=int,    help="Number of PCIe DMA channels.")
+    parser.add_argument("--driver",          action="store_true",    help="Generate PCIe driver.")
     args = parser.parse_args()
 
     soc = BaseSoC(
-        sys_clk_freq  = int(float(args.sys_clk_freq)),
-        with_ethernet = args.with_ethernet,
-        eth_phy       = args.eth_phy,
-        with_pcie     = args.with_pcie,
+        sys_clk_freq    = int(float(args.sys_clk_freq)),
+        with_ethernet   = args.with_ethernet,
+        eth_phy         = args.eth_phy,
+        with_pcie       = args.with_pcie,
+        pcie_lanes      = args.pcie_lanes,
+        pcie_data_width = args.pcie_data_width,
+        pcie_dmas       = args.pcie_dmas,
         **soc_core_argdict(args)
     )
     builder = Builder(soc, **builder_argdict(args))
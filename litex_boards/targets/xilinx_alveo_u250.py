@@ -26,10 +26,13 @@ from litedram.phy import usddrphy
 from litepcie.phy.usppciephy import USPPCIEPHY
 from litepcie.software import generate_litepcie_software
 
+from litex_boards.cores.sdram import add_interleaved_sdram
+from litex_boards.cores.pcie import get_pcie_data_width
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
-    def __init__(self, platform, sys_clk_freq):
+    def __init__(self, platform, sys_clk_freq, ddram_channels=1):
         self.rst = Signal()
         self.clock_domains.cd_sys    = ClockDomain()
         self.clock_domains.cd_sys4x  = ClockDomain(reset_less=True)
@@ -55,10 +58,20 @@ class _CRG(Module):
 
         self.submodules.idelayctrl = USIDELAYCTRL(cd_ref=self.cd_idelay, cd_sys=self.cd_sys)
 
+        # Additional DDR4 channels: sys4x generated from the same PLL output with their own buffers
+        # (placed in the clock region of the channel), sys shared (single BUFGCE_DIV, the phase of
+        # separate dividers not being guaranteed).
+        for i in range(1, ddram_channels):
+            cd_sys4x = ClockDomain(f"sys4x_ddr{i}", reset_less=True)
+            self.clock_domains += cd_sys4x
+            self.specials += Instance("BUFGCE", name=f"ddr{i}_bufgce",
+                i_CE=1, i_I=self.cd_pll4x.clk, o_O=cd_sys4x.clk)
+
 # BaseSoC ------------------------------------------------------------------------------------------
 
 class BaseSoC(SoCCore):
-    def __init__(self, sys_clk_freq=int(125e6), with_led_chaser=True, with_pcie=False, **kwargs):
+    def __init__(self, sys_clk_freq=int(125e6), ddram_channels=1, ddram_interleaving="cacheline",
+                 with_led_chaser=True, with_pcie=False, pcie_lanes=4, pcie_data_width=None, pcie_dmas=1, **kwargs):
         platform = alveo_u250.Platform()
 
         # SoCCore ----------------------------------------------------------------------------------
@@ -67,31 +80,51 @@ class BaseSoC(SoCCore):
             **kwargs)
 
         # CRG --------------------------------------------------------------------------------------
-        self.submodules.crg = _CRG(platform, sys_clk_freq)
+        self.submodules.crg = _CRG(platform, sys_clk_freq, ddram_channels)
 
         # DDR4 SDRAM -------------------------------------------------------------------------------
         if not self.integrated_main_ram_size:
-            self.submodules.ddrphy = usddrphy.USPDDRPHY(platform.request("ddram"),
-                memtype          = "DDR4",
-                sys_clk_freq     = sys_clk_freq,
-                iodelay_clk_freq = 500e6,
-                is_rdimm         = True)
-            self.add_sdram("sdram",
-                phy           = self.ddrphy,
-                module        = MTA18ASF2G72PZ(sys_clk_freq, "1:4"),
-                size          = 0x40000000,
-                l2_cache_size = kwargs.get("l2_size", 8192)
-            )
+            assert ddram_channels in [1, 2]
+            ddrphys = []
+            for i in range(ddram_channels):
+                ddrphy = usddrphy.USPDDRPHY(platform.request("ddram", i),
+                    memtype          = "DDR4",
+                    sys_clk_freq     = sys_clk_freq,
+                    iodelay_clk_freq = 500e6,
+                    is_rdimm         = True)
+                if i > 0:
+                    ddrphy = ClockDomainsRenamer({"sys4x": f"sys4x_ddr{i}"})(ddrphy)
+                ddrphys.append(ddrphy)
+            if ddram_channels == 1:
+                self.submodules.ddrphy = ddrphys[0]
+                self.add_sdram("sdram",
+                    phy           = self.ddrphy,
+                    module        = MTA18ASF2G72PZ(sys_clk_freq, "1:4"),
+                    size          = 0x40000000,
+                    l2_cache_size = kwargs.get("l2_size", 8192)
+                )
+            else:
+                # Single main_ram interleaved over the channels (the PHYs are exposed as a single
+                # ddrphy by add_interleaved_sdram, the BIOS calibrating all the channels).
+                self.submodules += ddrphys
+                add_interleaved_sdram(self,
+                    phys          = ddrphys,
+                    module        = MTA18ASF2G72PZ(sys_clk_freq, "1:4"),
+                    size          = 0x40000000, # Limited by the 32-bit address space.
+                    interleaving  = ddram_interleaving,
+                    l2_cache_size = kwargs.get("l2_size", 8192)
+                )
 
         # Firmware RAM (To ease initial LiteDRAM calibration support) ------------------------------
         self.add_ram("firmware_ram", 0x20000000, 0x8000)
 
         # PCIe -------------------------------------------------------------------------------------
         if with_pcie:
-            self.submodules.pcie_phy = USPPCIEPHY(platform, platform.request("pcie_x4"),
-                data_width = 128,
-                bar0_size  = 0x20000)
-            self.add_pcie(phy=self.pcie_phy, ndmas=1)
+            self.submodules.pcie_phy = USPPCIEPHY(platform, platform.request(f"pcie_x{pcie_lanes}"),
+                data_width      = get_pcie_data_width(USPPCIEPHY, pcie_lanes, pcie_data_width),
+                pcie_data_width = get_pcie_data_width(USPPCIEPHY, pcie_lanes),
+                bar0_size       = 0x20000)
+            self.add_pcie(phy=self.pcie_phy, ndmas=pcie_dmas)
 
         # Leds -------------------------------------------------------------------------------------
         if with_led_chaser:
@@ -103,18 +136,28 @@ class BaseSoC(SoCCore):
 
 def main():
     parser = argparse.ArgumentParser(description="LiteX SoC on Alveo U250")
-    parser.add_argument("--build",        action="store_true", help="Build bitstream.")
-    parser.add_argument("--load",         action="store_true", help="Load bitstream.")
-    parser.add_argument("--sys-clk-freq", default=125e6,       help="System clock frequency.")
-    parser.add_argument("--with-pcie",    action="store_true", help="Enable PCIe support.")
-    parser.add_argument("--driver",       action="store_true", help="Generate PCIe driver.")
+    parser.add_argument("--build",              action="store_true",    help="Build bitstream.")
+    parser.add_argument("--load",               action="store_true",    help="Load bitstream.")
+    parser.add_argument("--sys-clk-freq",       default=125e6,          help="System clock frequency.")
+    parser.add_argument("--ddram-channels",     default=1, type=int,    help="Number of DDR4 channels.", choices=[1, 2])
+    parser.add_argument("--ddram-interleaving", default="cacheline",    help="DDR4 channels interleaving granularity (cacheline or page).")
+    parser.add_argument("--with-pcie",          action="store_true",    help="Enable PCIe support.")
+    parser.add_argument("--pcie-lanes",         default=4, type=int,    help="PCIe lanes (4 or 16).")
+    parser.add_argument("--pcie-data-width",    default=None, type=int, help="PCIe datapath width (default: sustaining the lanes bandwidth).")
+    parser.add_argument("--pcie-dmas",          default=1, type=int,    help="Number of PCIe DMA channels.")
+    parser.add_argument("--driver",             action="store_true",    help="Generate PCIe driver.")
     builder_args(parser)
     soc_core_args(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
-        sys_clk_freq = int(float(args.sys_clk_freq)),
-        with_pcie    = args.with_pcie,
+        sys_clk_freq       = int(float(args.sys_clk_freq)),
+        ddram_channels     = args.ddram_channels,
+        ddram_interleaving = args.ddram_interleaving,
+        with_pcie          = args.with_pcie,
+        pcie_lanes         = args.pcie_lanes,
+        pcie_data_width    = args.pcie_data_width,
+        pcie_dmas          = args.pcie_dmas,
         **soc_core_argdict(args)
     )
     builder = Builder(soc, **builder_argdict(args))
@@ -12,9 +12,11 @@
 import argparse, os
 
 from migen import *
+from migen.genlib.cdc import MultiReg, PulseSynchronizer
 from migen.genlib.resetsync import AsyncResetSynchronizer
 
 from litex_boards.platforms import alveo_u280
+from litex_boards.cores.pcie import get_pcie_data_width
 
 from litex.soc.cores.clock import *
 from litex.soc.integration.soc_core import *
@@ -38,10 +40,21 @@ from litescope import LiteScopeAnalyzer
 # HBM IP
 
 class HBMIP(Module, AutoCSR):
-    """Xilinx Virtex US+ High Bandwidth Memory 2 IP wrapper"""
-    def __init__(self, platform, hbm_ip_name="hbm_0"):
-        self.platform = platform
-        self.hbm_name = hbm_ip_name
+    """Xilinx Virtex US+ High Bandwidth Memory 2 IP wrapper
+
+    The IP is generated locally (at synthesis) from its parameters: AXI clock frequency and mask of
+    the enabled AXI ports (the second stack is only used when one of AXI ports 16-31 is enabled).
+    Generated IPs are cached (keyed on a hash of their configuration) and re-used by the next builds.
+    """
+    def __init__(self, platform, hbm_ip_name="hbm_0", axi_clk_freq=450e6, ports_mask=0xffffffff):
+        assert 225e6 <= axi_clk_freq <= 450e6
+        assert 0 < ports_mask < 2**32
+        stacks = 1 if ports_mask < 2**16 else 2
+        self.platform     = platform
+        self.hbm_name     = hbm_ip_name
+        self.stacks       = stacks
+        self.axi_clk_freq = axi_clk_freq
+        self.ports_mask   = ports_mask
 
         self.axi = []
         self.apb = []
@@ -56,23 +69,28 @@ class HBMIP(Module, AutoCSR):
 
         # Clocks -----------------------------------------------------------------------------------
         # Ref = 100 MHz (HBM: 900 (225-900) MHz), drives internal PLL (1 per stack).
-        for i in range(2):
+        for i in range(stacks):
             self.hbm_params[f"i_HBM_REF_CLK_{i:1d}"] = ClockSignal("hbm_ref")
 
         # APB: 100 (50-100) MHz
-        for i in range(2):
+        for i in range(stacks):
             self.hbm_params[f"i_APB_{i:1d}_PCLK"]     = ClockSignal("apb")
             self.hbm_params[f"i_APB_{i:1d}_PRESET_N"] = ~ResetSignal("apb")
 
         # AXI: 450 (225-450) MHz
-        for i in range(32):
+        for i in range(16*stacks):
+            if not (ports_mask >> i) & 0b1:
+                continue
             self.hbm_params[f"i_AXI_{i:02d}_ACLK"]     = ClockSignal("axi")
             self.hbm_params[f"i_AXI_{i:02d}_ARESET_N"] = ~ResetSignal("apb")
 
         # AXI --------------------------------------------------------------------------------------
-        for i in range(32):
+        for i in range(16*stacks):
             axi = AXIInterface(data_width=256, address_width=33, id_width=6)
             self.axi.append(axi)
+            # Disabled ports are not present on the generated IP.
+            if not (ports_mask >> i) & 0b1:
+                continue
 
             # AW Channel.
             self.hbm_params[f"i_AXI_{i :02d}_AWADDR"]      = axi.aw.addr
@@ -117,8 +135,8 @@ class HBMIP(Module, AutoCSR):
 
         # APB --------------------------------------------------------------------------------------
         # FIXME: Connect to CSR or Wishbone.
-        apb_complete = Signal(2)
-        for i in range(2):
+        apb_complete = Signal(stacks)
+        for i in range(stacks):
             self.hbm_params[f"i_APB_{i:1d}_PWDATA"]  = 0
             self.hbm_params[f"i_APB_{i:1d}_PADDR"]   = 0
             self.hbm_params[f"i_APB_{i:1d}_PENABLE"] = 0
@@ -130,49 +148,239 @@ class HBMIP(Module, AutoCSR):
             self.hbm_params[f"o_APB_{i:1d}_PSLVERR"] = Open()
 
             self.hbm_params[f"o_apb_complete_{i:1d}"] = apb_complete[i]
-        self.comb += self.init_done.status.eq(apb_complete == 0b11)
+        self.comb += self.init_done.status.eq(apb_complete == (2**stacks - 1))
 
         # Temperature ------------------------------------------------------------------------------
-        for i in range(2):
+        for i in range(stacks):
             self.hbm_params[f"o_DRAM_{i:1d}_STAT_CATTRIP"] = Open()
             self.hbm_params[f"o_DRAM_{i:1d}_STAT_TEMP"]    = Open()
 
+    def get_config(self):
+        """Return the configuration (CONFIG.* properties) of the Vivado HBM IP."""
+        axi_clk_mhz = self.axi_clk_freq/1e6
+        config = {
+            "USER_HBM_DENSITY"        : f"{4*self.stacks}GB",
+            "USER_HBM_STACK"          : f"{self.stacks}",
+            "USER_MEMORY_DISPLAY"     : f"{4096*self.stacks}",
+            "USER_CLK_SEL_LIST0"      : "AXI_00_ACLK",
+            "USER_AXI_CLK_FREQ"       : f"{axi_clk_mhz:g}",
+            "USER_AXI_INPUT_CLK_FREQ" : f"{axi_clk_mhz:g}",
+            "USER_AXI_INPUT_CLK_NS"   : f"{1e3/axi_clk_mhz:.3f}",
+            "USER_AXI_INPUT_CLK_PS"   : f"{1e6/axi_clk_mhz:.0f}",
+            "USER_AXI_INPUT_CLK_XDC"  : f"{1e3/axi_clk_mhz:.3f}",
+        }
+        if self.stacks == 1:
+            config["USER_SINGLE_STACK_SELECTION"] = "LEFT"
+        else:
+            config["USER_CLK_SEL_LIST1"] = "AXI_16_ACLK"
+        for i in range(self.stacks):
+            config[f"USER_HBM_REF_CLK_{i}"]       = "100"
+            config[f"USER_APB_PCLK_{i}"]          = "100"
+            config[f"USER_SWITCH_ENABLE_{i:02d}"] = "TRUE"
+        for i in range(16*self.stacks):
+            config[f"USER_SAXI_{i:02d}"] = "true" if (self.ports_mask >> i) & 0b1 else "false"
+        return config
+
     def add_sources(self, platform):
-        this_dir = os.path.dirname(os.path.abspath(os.path.realpath(__file__)))
-        os.system("wget https://github.com/litex-hub/litex-boards/files/6893157/hbm_0.xci.txt")
-        os.makedirs("ip/hbm", exist_ok=True)
-        os.system("mv hbm_0.xci.txt ip/hbm/hbm_0.xci")
-        platform.add_ip(os.path.join(this_dir, "ip", "hbm", self.hbm_name + ".xci"))
+        from litex_boards.cache import add_cached_ip
+        add_cached_ip(platform, self.hbm_name, "xilinx.com:ip:hbm", self.get_config())
 
     def do_finalize(self):
         self.add_sources(self.platform)
         self.specials += Instance(self.hbm_name, **self.hbm_params)
 
+# HBM Traffic Generator ----------------------------------------------------------------------------
+
+class HBMTrafficGenerator(Module, AutoCSR):
+    """AXI burst traffic generator/checker
+
+    Issues back-to-back INCR bursts (write or read) on an AXI interface, without waiting for the
+    completion of previous bursts, to saturate a HBM pseudo-channel. Written data is a pattern of
+    the burst/beat indexes that is checked on reads. The generator runs in clock_domain (the AXI
+    clock of the HBM), the CSRs stay in sys and are resynchronized.
+    """
+    def __init__(self, axi, base=0x0000_0000, burst_length=16, with_csr=True, clock_domain="sys"):
+        self.start  = Signal()                              # i
+        self.write  = Signal(reset=1)                       # i (1: Write, 0: Read)
+        self.base   = Signal(len(axi.aw.addr), reset=base)  # i (Bytes)
+        self.bursts = Signal(32)                            # i
+        self.done   = Signal()                              # o
+        self.cycles = Signal(32)                            # o
+        self.errors = Signal(32)                            # o
+
+        # # #
+
+        data_width  = len(axi.w.data)
+        burst_shift = log2_int(burst_length*data_width//8)
+
+        running  = Signal()
+        aw_count = Signal(32)
+        w_count  = Signal(32)
+        w_beat   = Signal(max=burst_length)
+        b_count  = Signal(32)
+        ar_count = Signal(32)
+        r_count  = Signal(32)
+        r_beat   = Signal(max=burst_length)
+
+        def pattern(burst, beat):
+            return Replicate(Cat(beat, burst)[:32] ^ 0x5a5a_5a5a, data_width//32)
+
+        sync = getattr(self.sync, clock_domain)
+
+        # Control.
+        sync += [
+            If(self.start,
+                running.eq(1),
+                self.done.eq(0),
+                self.cycles.eq(0),
+            ).Elif(running,
+                self.cycles.eq(self.cycles + 1),
+                If(Mux(self.write, b_count, r_count) == self.bursts,
+                    running.eq(0),
+                    self.done.eq(1),
+                )
+            )
+        ]
+
+        # Write (AW/W/B).
+        self.comb += [
+            axi.aw.valid.eq(running & self.write & (aw_count != self.bursts)),
+            axi.aw.addr.eq(self.base + (aw_count << burst_shift)),
+            axi.aw.burst.eq(0b01), # INCR.
+            axi.aw.len.eq(burst_length - 1),
+            axi.aw.size.eq(log2_int(data_width//8)),
+            axi.w.valid.eq(running & self.write & (w_count != aw_count)),
+            axi.w.data.eq(pattern(w_count, w_beat)),
+            axi.w.strb.eq(2**(data_width//8) - 1),
+            axi.w.last.eq(w_beat == (burst_length - 1)),
+            axi.b.ready.eq(1),
+        ]
+        sync += [
+            If(self.start,
+                aw_count.eq(0),
+                w_count.eq(0),
+                w_beat.eq(0),
+                b_count.eq(0),
+            ).Else(
+                If(axi.aw.valid & axi.aw.ready,
+                    aw_count.eq(aw_count + 1)
+                ),
+                If(axi.w.valid & axi.w.ready,
+                    w_beat.eq(w_beat + 1),
+                    If(axi.w.last,
+                        w_beat.eq(0),
+                        w_count.eq(w_count + 1)
+                    )
+                ),
+                If(axi.b.valid & axi.b.ready,
+                    b_count.eq(b_count + 1)
+                )
+            )
+        ]
+
+        # Read (AR/R).
+        self.comb += [
+            axi.ar.valid.eq(running & ~self.write & (ar_count != self.bursts)),
+            axi.ar.addr.eq(self.base + (ar_count << burst_shift)),
+            axi.ar.burst.eq(0b01), # INCR.
+            axi.ar.len.eq(burst_length - 1),
+            axi.ar.size.eq(log2_int(data_width//8)),
+            axi.r.ready.eq(1),
+        ]
+        sync += [
+            If(self.start,
+                ar_count.eq(0),
+                r_count.eq(0),
+                r_beat.eq(0),
+                self.errors.eq(0),
+            ).Else(
+                If(axi.ar.valid & axi.ar.ready,
+                    ar_count.eq(ar_count + 1)
+                ),
+                If(axi.r.valid & axi.r.ready,
+                    r_beat.eq(r_beat + 1),
+                    If(axi.r.data != pattern(r_count, r_beat),
+                        self.errors.eq(self.errors + 1)
+                    ),
+                    If(axi.r.last,
+                        r_beat.eq(0),
+                        r_count.eq(r_count + 1)
+                    )
+                )
+            )
+        ]
+
+        if with_csr:
+            self.add_csr(clock_domain)
+
+    def add_csr(self, clock_domain="sys"):
+        self._start  = CSR()
+        self._write  = CSRStorage(reset=1)
+        self._base   = CSRStorage(len(self.base), reset=self.base.reset.value)
+        self._bursts = CSRStorage(32)
+        self._done   = CSRStatus()
+        self._cycles = CSRStatus(32)
+        self._errors = CSRStatus(32)
+
+        # # #
+
+        if clock_domain == "sys":
+            self.comb += [
+                self.start.eq(self._start.re),
+                self.write.eq(self._write.storage),
+                self.base.eq(self._base.storage),
+                self.bursts.eq(self._bursts.storage),
+                self._done.status.eq(self.done),
+                self._cycles.status.eq(self.cycles),
+                self._errors.status.eq(self.errors),
+            ]
+        else:
+            # Configuration is static during a run and results are read once done: MultiRegs.
+            self.submodules.start_ps = start_ps = PulseSynchronizer("sys", clock_domain)
+            self.comb += [
+                start_ps.i.eq(self._start.re),
+                self.start.eq(start_ps.o),
+            ]
+            self.specials += [
+                MultiReg(self._write.storage,  self.write,  clock_domain),
+                MultiReg(self._base.storage,   self.base,   clock_domain),
+                MultiReg(self._bursts.storage, self.bursts, clock_domain),
+                MultiReg(self.done,   self._done.status,   "sys"),
+                MultiReg(self.cycles, self._cycles.status, "sys"),
+                MultiReg(self.errors, self._errors.status, "sys"),
+            ]
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
-    def __init__(self, platform, sys_clk_freq, ddram_channel, with_hbm):
-        if with_hbm:
-            self.clock_domains.cd_sys     = ClockDomain()
-            self.clock_domains.cd_hbm_ref = ClockDomain()
-            self.clock_domains.cd_apb     = ClockDomain()
-        else: # ddr4
+    def __init__(self, platform, sys_clk_freq, ddram_channel, with_ddr4=True, with_hbm=False, hbm_clk_freq=450e6):
+        self.clock_domains.cd_sys = ClockDomain()
+        if with_ddr4:
             self.rst = Signal()
-            self.clock_domains.cd_sys    = ClockDomain()
             self.clock_domains.cd_sys4x  = ClockDomain(reset_less=True)
             self.clock_domains.cd_pll4x  = ClockDomain(reset_less=True)
             self.clock_domains.cd_idelay = ClockDomain()
+        if with_hbm:
+            self.clock_domains.cd_hbm     = ClockDomain()
+            self.clock_domains.cd_hbm_ref = ClockDomain()
+            self.clock_domains.cd_apb     = ClockDomain()
 
         # # #
 
+        # HBM2: AXI/Ref/APB clocks from their own MMCM (on the other sysclk when DDR4 is also used).
         if with_hbm:
-            self.submodules.pll = pll = USMMCM(speedgrade=-2)
-            pll.register_clkin(platform.request("sysclk", ddram_channel), 100e6)
-            pll.create_clkout(self.cd_sys,     sys_clk_freq)
-            pll.create_clkout(self.cd_hbm_ref, 100e6)
-            pll.create_clkout(self.cd_apb,     100e6)
-            platform.add_false_path_constraints(self.cd_sys.clk, self.cd_apb.clk)
-        else: # ddr4
+            hbm_sysclk = (ddram_channel + 1)%2 if with_ddr4 else ddram_channel
+            self.submodules.hbm_pll = hbm_pll = USMMCM(speedgrade=-2)
+            hbm_pll.register_clkin(platform.request("sysclk", hbm_sysclk), 100e6)
+            if not with_ddr4:
+                hbm_pll.create_clkout(self.cd_sys, sys_clk_freq)
+            hbm_pll.create_clkout(self.cd_hbm,     hbm_clk_freq)
+            hbm_pll.create_clkout(self.cd_hbm_ref, 100e6)
+            hbm_pll.create_clkout(self.cd_apb,     100e6)
+            platform.add_false_path_constraints(self.cd_sys.clk, self.cd_hbm.clk, self.cd_apb.clk)
+
+        # DDR4.
+        if with_ddr4:
             self.submodules.pll = pll = USMMCM(speedgrade=-2)
             self.comb += pll.reset.eq(self.rst)
             pll.register_clkin(platform.request("sysclk", ddram_channel), 100e6)
@@ -194,10 +402,17 @@ class _CRG(Module):
 # BaseSoC ------------------------------------------------------------------------------------------
 
 class BaseSoC(SoCCore):
-    def __init__(self, sys_clk_freq=int(150e6), ddram_channel=0, with_pcie=False, with_led_chaser=False, with_hbm=False, **kwargs):
+    def __init__(self, sys_clk_freq=int(150e6), ddram_channel=0, with_pcie=False, pcie_lanes=4, pcie_data_width=None, pcie_dmas=1,
+                 with_led_chaser=False, with_ddr4=None, with_hbm=False, hbm_clk_freq=int(450e6), hbm_ports=4, hbm_interconnect="p2p", with_hbm_traffic_gen=False, **kwargs):
         platform = alveo_u280.Platform()
+        # DDR4 (CPU main_ram) by default, HBM2 only when requested alone.
+        if with_ddr4 is None:
+            with_ddr4 = not with_hbm
+        assert with_ddr4 or with_hbm
         if with_hbm:
-            assert 225e6 <= sys_clk_freq <= 450e6
+            assert 225e6 <= hbm_clk_freq <= 450e6
+            assert 1 <= hbm_ports <= 32
+            assert hbm_interconnect in ["p2p", "crossbar"]
 
         # SoCCore ----------------------------------------------------------------------------------
         SoCCore.__init__(self, platform, sys_clk_freq,
@@ -205,23 +420,13 @@ class BaseSoC(SoCCore):
             **kwargs)
 
         # CRG --------------------------------------------------------------------------------------
-        self.submodules.crg = _CRG(platform, sys_clk_freq, ddram_channel, with_hbm)
-
-        if with_hbm:
-            # JTAGBone --------------------------------------------------------------------------------
-            #self.add_jtagbone(chain=2) # Chain 1 already used by HBM2 debug probes.
-
-            # Add HBM Core.
-            self.submodules.hbm = hbm = ClockDomainsRenamer({"axi": "sys"})(HBMIP(platform))
+        self.submodules.crg = _CRG(platform, sys_clk_freq, ddram_channel,
+            with_ddr4    = with_ddr4,
+            with_hbm     = with_hbm,
+            hbm_clk_freq = hbm_clk_freq)
 
-            # Connect four of the HBM's AXI interfaces to the main bus of the SoC.
-            for i in range(4):
-                axi_hbm      = hbm.axi[i]
-                axi_lite_hbm = AXILiteInterface(data_width=256, address_width=33)
-                self.submodules += AXILite2AXI(axi_lite_hbm, axi_hbm)
-                self.bus.add_slave(f"hbm{i}", axi_lite_hbm, SoCRegion(origin=0x4000_0000 + 0x1000_0000*i, size=0x1000_0000)) # 256MB.
-        else:
-            # DDR4 SDRAM -------------------------------------------------------------------------------
+        # DDR4 SDRAM -------------------------------------------------------------------------------
+        if with_ddr4:
             if not self.integrated_main_ram_size:
                 self.submodules.ddrphy = usddrphy.USPDDRPHY(platform.request("ddram", ddram_channel),
                     memtype          = "DDR4",
@@ -239,12 +444,73 @@ class BaseSoC(SoCCore):
             # Firmware RAM (To ease initial LiteDRAM calibration support) ------------------------------
             self.add_ram("firmware_ram", 0x20000000, 0x8000)
 
+        # HBM2 -------------------------------------------------------------------------------------
+        # HBM2 runs in its own clock domain (hbm, AXI clock of the IP), independent of sys.
+        if with_hbm:
+            # JTAGBone --------------------------------------------------------------------------------
+            #self.add_jtagbone(chain=2) # Chain 1 already used by HBM2 debug probes.
+
+            # Add HBM Core.
+            # Only the used AXI ports are enabled on the generated IP.
+            hbm = HBMIP(platform,
+                axi_clk_freq = hbm_clk_freq,
+                ports_mask   = 2**hbm_ports - 1)
+            self.submodules.hbm = hbm = ClockDomainsRenamer({"axi": "hbm"})(hbm)
+
+            # AXI masters of each of the used HBM's AXI ports (pseudo-channels).
+            hbm_masters = [[] for i in range(hbm_ports)]
+            def hbm_axi():
+                return AXIInterface(data_width=256, address_width=33, id_width=6)
+
+            # Connect up to four of the HBM's AXI interfaces to the main bus of the SoC (single-beat
+            # accesses, for control/debug), after DDR4's main_ram when present (in IO region, uncached).
+            hbm_origin = 0x8000_0000 if with_ddr4 else 0x4000_0000
+            for i in range(min(hbm_ports, 4)):
+                axi_hbm      = hbm_axi()
+                axi_lite_hbm = AXILiteInterface(data_width=256, address_width=33)
+                axi_lite_sys = AXILiteInterface(data_width=256, address_width=33)
+                self.submodules += AXILiteClockDomainCrossing(axi_lite_sys, axi_lite_hbm, cd_from="sys", cd_to="hbm")
+                self.submodules += ClockDomainsRenamer("hbm")(AXILite2AXI(axi_lite_hbm, axi_hbm))
+                self.bus.add_slave(f"hbm{i}", axi_lite_sys, SoCRegion(origin=hbm_origin + 0x1000_0000*i, size=0x1000_0000, cached=not with_ddr4)) # 256MB.
+                hbm_masters[i].append(axi_hbm)
+
+            # Add a Traffic Generator (full-burst AXI master) per used HBM's AXI interface.
+            if with_hbm_traffic_gen:
+                hbm_tg_axis = []
+                for i in range(hbm_ports):
+                    axi_tg = hbm_axi()
+                    tg     = HBMTrafficGenerator(axi_tg, base=0x1000_0000*i, clock_domain="hbm") # 256MB per pseudo-channel.
+                    setattr(self.submodules, f"hbm_tg{i}", tg)
+                    hbm_tg_axis.append(axi_tg)
+                # Point-to-Point: Traffic Generator i only accesses HBM's AXI interface i.
+                if hbm_interconnect == "p2p":
+                    for i in range(hbm_ports):
+                        hbm_masters[i].append(hbm_tg_axis[i])
+                # Crossbar: Traffic Generators can access any HBM's AXI interface (through base).
+                if hbm_interconnect == "crossbar":
+                    hbm_slaves = []
+                    for i in range(hbm_ports):
+                        axi_xbar = hbm_axi()
+                        hbm_slaves.append((lambda addr, i=i: addr[23:28] == i, axi_xbar)) # Word address (256-bit).
+                        hbm_masters[i].append(axi_xbar)
+                    self.submodules.hbm_xbar = ClockDomainsRenamer("hbm")(AXICrossbar(hbm_tg_axis, hbm_slaves))
+
+            # Connect/Arbitrate the masters on the HBM's AXI interfaces.
+            for i in range(hbm_ports):
+                if len(hbm_masters[i]) == 0:
+                    continue
+                if len(hbm_masters[i]) == 1:
+                    self.submodules += AXIInterconnectPointToPoint(hbm_masters[i][0], hbm.axi[i])
+                else:
+                    self.submodules += ClockDomainsRenamer("hbm")(AXIArbiter(hbm_masters[i], hbm.axi[i]))
+
         # PCIe -------------------------------------------------------------------------------------
         if with_pcie:
-            self.submodules.pcie_phy = USPPCIEPHY(platform, platform.request("pcie_x4"),
-                data_width = 128,
-                bar0_size  = 0x20000)
-            self.add_pcie(phy=self.pcie_phy, ndmas=1)
+            self.submodules.pcie_phy = USPPCIEPHY(platform, platform.request(f"pcie_x{pcie_lanes}"),
+                data_width      = get_pcie_data_width(USPPCIEPHY, pcie_lanes, pcie_data_width),
+                pcie_data_width = get_pcie_data_width(USPPCIEPHY, pcie_lanes),
+                bar0_size       = 0x20000)
+            self.add_pcie(phy=self.pcie_phy, ndmas=pcie_dmas)
 
         # Leds -------------------------------------------------------------------------------------
         if with_led_chaser:
@@ -256,29 +522,42 @@ class BaseSoC(SoCCore):
 
 def main():
     parser = argparse.ArgumentParser(description="LiteX SoC on Alveo U280")
-    parser.add_argument("--build",           action="store_true", help="Build bitstream.")
-    parser.add_argument("--load",            action="store_true", help="Load bitstream.")
-    parser.add_argument("--sys-clk-freq",    default=150e6,       help="System clock frequency.") # HBM2 with 250MHz, DDR4 with 150MHz (1:4)
-    parser.add_argument("--ddram-channel",   default="0",         help="DDRAM channel (0, 1, 2 or 3).") # also selects clk 0 or 1
-    parser.add_argument("--with-pcie",       action="store_true", help="Enable PCIe support.")
-    parser.add_argument("--driver",          action="store_true", help="Generate PCIe driver.")
-    parser.add_argument("--with-hbm",        action="store_true", help="Use HBM2.")
-    parser.add_argument("--with-analyzer",   action="store_true", help="Enable Analyzer.")
-    parser.add_argument("--with-led-chaser", action="store_true", help="Enable LED Chaser.")
+    parser.add_argument("--build",                action="store_true",    help="Build bitstream.")
+    parser.add_argument("--load",                 action="store_true",    help="Load bitstream.")
+    parser.add_argument("--sys-clk-freq",         default=150e6,          help="System clock frequency.") # DDR4 with 150MHz (1:4)
+    parser.add_argument("--ddram-channel",        default="0",         help="DDRAM channel (0, 1, 2 or 3).") # also selects clk 0 or 1
+    parser.add_argument("--with-pcie",            action="store_true",    help="Enable PCIe support.")
+    parser.add_argument("--pcie-lanes",           default=4, type=int,    help="PCIe lanes (4 or 16).")
+    parser.add_argument("--pcie-data-width",      default=None, type=int, help="PCIe datapath width (default: sustaining the lanes bandwidth).")
+    parser.add_argument("--pcie-dmas",            default=1, type=int,    help="Number of PCIe DMA channels.")
+    parser.add_argument("--driver",               action="store_true",    help="Generate PCIe driver.")
+    parser.add_argument("--with-hbm",             action="store_true",    help="Use HBM2 (alone, or along with DDR4 with --with-ddr4).")
+    parser.add_argument("--with-ddr4",            action="store_true",    help="Use DDR4 (as main_ram) along with HBM2.")
+    parser.add_argument("--hbm-clk-freq",         default=450e6,          help="HBM2 AXI clock frequency (225-450MHz).")
+    parser.add_argument("--hbm-ports",            default=4, type=int,    help="Number of HBM2 AXI ports/pseudo-channels used (1-32).")
+    parser.add_argument("--hbm-interconnect",     default="p2p",          help="HBM2 Traffic Generators interconnect (p2p or crossbar).")
+    parser.add_argument("--with-hbm-traffic-gen", action="store_true",    help="Add a full-burst AXI Traffic Generator per HBM2 port.")
+    parser.add_argument("--with-analyzer",        action="store_true",    help="Enable Analyzer.")
+    parser.add_argument("--with-led-chaser",      action="store_true",    help="Enable LED Chaser.")
     builder_args(parser)
     soc_core_args(parser)
     args = parser.parse_args()
 
-    if args.with_hbm:
-        args.sys_clk_freq = 250e6
-
     soc = BaseSoC(
-        sys_clk_freq    = int(float(args.sys_clk_freq)),
-        ddram_channel   = int(args.ddram_channel, 0),
-        with_pcie       = args.with_pcie,
-        with_led_chaser = args.with_led_chaser,
-        with_hbm        = args.with_hbm,
-        with_analyzer   = args.with_analyzer,
+        sys_clk_freq         = int(float(args.sys_clk_freq)),
+        ddram_channel        = int(args.ddram_channel, 0),
+        with_pcie            = args.with_pcie,
+        pcie_lanes           = args.pcie_lanes,
+        pcie_data_width      = args.pcie_data_width,
+        pcie_dmas            = args.pcie_dmas,
+        with_led_chaser      = args.with_led_chaser,
+        with_ddr4            = args.with_ddr4 or not args.with_hbm,
+        with_hbm             = args.with_hbm,
+        hbm_clk_freq         = int(float(args.hbm_clk_freq)),
+        hbm_ports            = args.hbm_ports,
+        hbm_interconnect     = args.hbm_interconnect,
+        with_hbm_traffic_gen = args.with_hbm_traffic_gen,
+        with_analyzer        = args.with_analyzer,
         **soc_core_argdict(args)
 	)
     builder = Builder(soc, **builder_argdict(args))
@@ -14,12 +14,16 @@ import argparse
 from migen import *
 
 from litex_boards.platforms import kc705
+from litex_boards.cores.pcie import get_pcie_data_width
+from litex_boards.cores.ethernet import Xilinx10GBASERPHY, add_etherbone_64b
 
 from litex.soc.cores.clock import *
 from litex.soc.integration.soc_core import *
 from litex.soc.integration.builder import *
 from litex.soc.cores.led import LedChaser
 
+from litex.config import DEFAULT_IP_PREFIX
+
 from litedram.modules import MT8JTF12864
 from litedram.phy import s7ddrphy
 
@@ -52,8 +56,9 @@ class _CRG(Module):
 # BaseSoC ------------------------------------------------------------------------------------------
 
 class BaseSoC(SoCCore):
-    def __init__(self, sys_clk_freq=int(125e6), with_ethernet=False, with_led_chaser=True,
-                 with_pcie=False, with_sata=False, **kwargs):
+    def __init__(self, sys_clk_freq=int(125e6), with_ethernet=False, with_etherbone=False,
+                 eth_ip=DEFAULT_IP_PREFIX + "50", eth_phy="gmii", with_led_chaser=True,
+                 with_pcie=False, pcie_lanes=4, pcie_data_width=None, pcie_dmas=1, with_sata=False, **kwargs):
         platform = kc705.Platform()
 
         # SoCCore ----------------------------------------------------------------------------------
@@ -76,20 +81,34 @@ class BaseSoC(SoCCore):
                 l2_cache_size = kwargs.get("l2_size", 8192)
             )
 
-        # Ethernet ---------------------------------------------------------------------------------
-        if with_ethernet:
+        # Ethernet / Etherbone ---------------------------------------------------------------------
+        if (with_ethernet or with_etherbone) and eth_phy == "gmii":
             self.submodules.ethphy = LiteEthPHY(
                 clock_pads = self.platform.request("eth_clocks"),
                 pads       = self.platform.request("eth"),
                 clk_freq   = self.clk_freq)
-            self.add_ethernet(phy=self.ethphy)
+            if with_ethernet:
+                self.add_ethernet(phy=self.ethphy)
+            if with_etherbone:
+                self.add_etherbone(phy=self.ethphy, ip_address=eth_ip)
+        if (with_ethernet or with_etherbone) and eth_phy == "10gbase-r":
+            if with_ethernet:
+                raise ValueError("10GBASE-R is only supported with Etherbone.")
+            # SFP on GTX X0Y10, 156.25MHz RefClk on the SMA MGT RefClk inputs.
+            self.submodules.ethphy = Xilinx10GBASERPHY(platform,
+                refclk_pads = self.platform.request("user_sma_mgt_refclk"),
+                data_pads   = self.platform.request("sfp", 0),
+                dclk_freq   = sys_clk_freq)
+            self.comb += self.platform.request("sfp_tx_disable_n", 0).eq(1)
+            add_etherbone_64b(self, phy=self.ethphy, ip_address=eth_ip)
 
         # PCIe -------------------------------------------------------------------------------------
         if with_pcie:
-            self.submodules.pcie_phy = S7PCIEPHY(platform, platform.request("pcie_x4"),
-                data_width = 128,
-                bar0_size  = 0x20000)
-            self.add_pcie(phy=self.pcie_phy, ndmas=1)
+            self.submodules.pcie_phy = S7PCIEPHY(platform, platform.request(f"pcie_x{pcie_lanes}"),
+                data_width      = get_pcie_data_width(S7PCIEPHY, pcie_lanes, pcie_data_width),
+                pcie_data_width = get_pcie_data_width(S7PCIEPHY, pcie_lanes),
+                bar0_size       = 0x20000)
+            self.add_pcie(phy=self.pcie_phy, ndmas=pcie_dmas)
 
         # SATA -------------------------------------------------------------------------------------
         if with_sata:
@@ -135,22 +154,41 @@ class BaseSoC(SoCCore):
 
 def main():
     parser = argparse.ArgumentParser(description="LiteX SoC on KC705")
-    parser.add_argument("--build",         action="store_true", help="Build bitstream.")
-    parser.add_argument("--load",          action="store_true", help="Load bitstream.")
-    parser.add_argument("--sys-clk-freq",  default=125e6,       help="System clock frequency.")
-    parser.add_argument("--with-ethernet", action="store_true", help="Enable Ethernet support.")
-    parser.add_argument("--with-pcie",     action="store_true", help="Enable PCIe support.")
-    parser.add_argument("--driver",        action="store_true", help="Generate PCIe driver.")
-    parser.add_argument("--with-sata",     action="store_true", help="Enable SATA support (over SFP2SATA).")
+    parser.add_argument("--build",           action="store_true",    help="Build bitstream.")
+    parser.add_argument("--load",            action="store_true",    help="Load bitstream.")
+    parser.add_argument("--sys-clk-freq",    default=None,           help="System clock frequency (default: 125MHz, 175MHz with 10gbase-r).")
+    ethopts = parser.add_mutually_exclusive_group()
+    ethopts.add_argument("--with-ethernet",  action="store_true",    help="Enable Ethernet support.")
+    ethopts.add_argument("--with-etherbone", action="store_true",    help="Enable Etherbone support.")
+    parser.add_argument("--eth-ip",          default=DEFAULT_IP_PREFIX + "50", type=str, help="Ethernet/Etherbone IP address.")
+    parser.add_argument("--eth-phy",         default="gmii",         help="Ethernet PHY: gmii or 10gbase-r (on SFP, Etherbone only).", choices=["gmii", "10gbase-r"])
+    parser.add_argument("--with-pcie",       action="store_true",    help="Enable PCIe support.")
+    parser.add_argument("--pcie-lanes",      default=4, type=int,    help="PCIe lanes (1, 2, 4 or 8).")
+    parser.add_argument("--pcie-data-width", default=None, type=int, help="PCIe datapath width (default: sustaining the lanes bandwidth).")
+    parser.add_argument("--pcie-dmas",       default=1, type=int,    help="Number of PCIe DMA channels.")
+    parser.add_argument("--driver",          action="store_true",    help="Generate PCIe driver.")
+    parser.add_argument("--with-sata",       action="store_true",    help="Enable SATA support (over SFP2SATA).")
     builder_args(parser)
     soc_core_args(parser)
     args = parser.parse_args()
 
+    # 10GBASE-R: Run the 64-bit Etherbone stack at >= 156.25MHz to sustain 10Gbps (175MHz: closest
+    # frequency the MMCM can generate along with the 200MHz IDELAYCTRL clock).
+    sys_clk_freq = args.sys_clk_freq
+    if sys_clk_freq is None:
+        sys_clk_freq = 175e6 if args.eth_phy == "10gbase-r" else 125e6
+
     soc = BaseSoC(
-        sys_clk_freq  = int(float(args.sys_clk_freq)),
-        with_ethernet = args.with_ethernet,
-        with_pcie     = args.with_pcie,
-        with_sata     = args.with_sata,
+        sys_clk_freq    = int(float(sys_clk_freq)),
+        with_ethernet   = args.with_ethernet,
+        with_etherbone  = args.with_etherbone,
+        eth_ip          = args.eth_ip,
+        eth_phy         = args.eth_phy,
+        with_pcie       = args.with_pcie,
+        pcie_lanes      = args.pcie_lanes,
+        pcie_data_width = args.pcie_data_width,
+        pcie_dmas       = args.pcie_dmas,
+        with_sata       = args.with_sata,
         **soc_core_argdict(args)
     )
     builder = Builder(soc, **builder_argdict(args))
@@ -15,5 +15,6 @@ setup(
     license="BSD",
     python_requires="~=3.6",
     include_package_data=True,
+    package_data={"litex_boards": ["registry.json"]},
     packages=find_packages(exclude=['test*']),
 )
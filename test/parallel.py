@@ -0,0 +1,195 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Parallel runner for the platforms/targets tests: each board is built in its own process, from its
+# own working/output directory, and jobs are spread over all the cores of the machine.
+#
+# Jobs are either run in a fresh interpreter (subprocess) or, when fork is available, in a process
+# forked from a parent that already imported Migen/LiteX/cores: the import cost is then only paid
+# once and each board still starts from a clean global state (the parent's one).
+
+import os
+import sys
+import json
+import time
+import runpy
+import resource
+import importlib
+import traceback
+import subprocess
+import multiprocessing
+import multiprocessing.connection
+from xml.etree import ElementTree
+from concurrent.futures import ThreadPoolExecutor
+
+# Helpers ------------------------------------------------------------------------------------------
+
+repo_dir = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+def default_jobs():
+    return int(os.environ.get("LITEX_BOARDS_TEST_JOBS", os.cpu_count() or 1))
+
+# Job ----------------------------------------------------------------------------------------------
+
+class Job:
+    def __init__(self, name, args, cwd):
+        self.name = name
+        self.args = args
+        self.cwd  = cwd
+
+class JobResult:
+    def __init__(self, job, returncode, duration, max_rss, output):
+        self.job        = job
+        self.returncode = returncode
+        self.duration   = duration # in s.
+        self.max_rss    = max_rss  # in KB.
+        self.output     = output
+
+    @property
+    def passed(self):
+        return self.returncode == 0
+
+def run_job(job):
+    os.makedirs(job.cwd, exist_ok=True)
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [repo_dir, env.get("PYTHONPATH", "")]))
+    start = time.perf_counter()
+    with open(os.path.join(job.cwd, "output.log"), "w+") as log:
+        p = subprocess.Popen([sys.executable] + job.args,
+            cwd    = job.cwd,
+            env    = env,
+            stdout = log,
+            stderr = subprocess.STDOUT)
+        # Use wait4 (instead of Popen.wait) to get the resources used by this specific process.
+        _, status, rusage = os.wait4(p.pid, 0)
+        p.returncode = os.WEXITSTATUS(status) if os.WIFEXITED(status) else -os.WTERMSIG(status)
+        duration = time.perf_counter() - start
+        log.seek(0)
+        output = log.read()
+    return JobResult(job, p.returncode, duration, rusage.ru_maxrss, output)
+
+def run_jobs(jobs, njobs=None, inprocess=False):
+    if inprocess:
+        return run_jobs_inprocess(jobs, njobs)
+    # Jobs are sub-processes, threads are only used to dispatch/wait them.
+    with ThreadPoolExecutor(max_workers=njobs or default_jobs()) as executor:
+        return list(executor.map(run_job, jobs))
+
+# In-Process Jobs ----------------------------------------------------------------------------------
+
+# Heavy modules imported once in the parent and shared with the forked workers.
+preload_modules = [
+    "migen",
+    "litex.gen",
+    "litex.soc.integration.soc_core",
+    "litex.soc.integration.builder",
+    "litex.soc.cores.clock",
+    "litex.soc.cores.cpu.vexriscv",
+    "litedram.modules",
+    "litedram.phy",
+    "litedram.core",
+    "liteeth.phy",
+    "liteeth.core",
+    "litepcie.phy.s7pciephy",
+    "litepcie.phy.uspciephy",
+    "litescope",
+    "litesdcard.phy",
+    "litespi.modules",
+]
+
+def inprocess_supported():
+    return "fork" in multiprocessing.get_all_start_methods()
+
+def preload():
+    for module in preload_modules:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
+
+def _run_inprocess(job):
+    # Executed in the forked worker: run "-m module args" as "python3 -m module args" would do.
+    assert job.args[0] == "-m"
+    module, argv = job.args[1], job.args[2:]
+    os.chdir(job.cwd)
+    log = open("output.log", "w", buffering=1)
+    os.dup2(log.fileno(), 1)
+    os.dup2(log.fileno(), 2)
+    sys.stdout = sys.stderr = log
+    returncode = 0
+    try:
+        sys.argv = [module] + argv
+        runpy.run_module(module, run_name="__main__", alter_sys=True)
+    except SystemExit as e:
+        returncode = e.code if isinstance(e.code, int) else int(e.code is not None)
+    except BaseException:
+        traceback.print_exc()
+        returncode = 1
+    log.flush()
+    with open("result.json", "w") as f:
+        json.dump({"max_rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}, f)
+    os._exit(returncode)
+
+def run_jobs_inprocess(jobs, njobs=None):
+    njobs   = njobs or default_jobs()
+    context = multiprocessing.get_context("fork")
+    preload()
+    pending = list(jobs)
+    running = {}
+    results = {}
+    while pending or running:
+        # Fork new workers from the (pre-warmed) parent.
+        while pending and len(running) < njobs:
+            job = pending.pop(0)
+            os.makedirs(job.cwd, exist_ok=True)
+            p = context.Process(target=_run_inprocess, args=(job,))
+            p.start()
+            running[p.sentinel] = (p, job, time.perf_counter())
+        # Collect finished workers.
+        for sentinel in multiprocessing.connection.wait(list(running.keys())):
+            p, job, start = running.pop(sentinel)
+            p.join()
+            duration = time.perf_counter() - start
+            max_rss  = 0
+            output   = ""
+            try:
+                with open(os.path.join(job.cwd, "result.json")) as f:
+                    max_rss = json.load(f)["max_rss"]
+                with open(os.path.join(job.cwd, "output.log")) as f:
+                    output = f.read()
+            except OSError:
+                pass # Worker crashed.
+            results[job] = JobResult(job, p.exitcode, duration, max_rss, output)
+    return [results[job] for job in jobs]
+
+# Reports ------------------------------------------------------------------------------------------
+
+def print_report(results, title):
+    print(f"\n{title}:")
+    print(f"{'Name':48s} {'Status':8s} {'Time (s)':>10s} {'Peak RSS (MB)':>14s}")
+    for r in sorted(results, key=lambda r: -r.duration):
+        status = "PASS" if r.passed else "FAIL"
+        print(f"{r.job.name:48s} {status:8s} {r.duration:10.1f} {r.max_rss/1024:14.1f}")
+
+def write_junit(results, filename, suite_name):
+    suite = ElementTree.Element("testsuite",
+        name     = suite_name,
+        tests    = str(len(results)),
+        failures = str(sum(not r.passed for r in results)),
+        time     = f"{sum(r.duration for r in results):.3f}")
+    for r in results:
+        case = ElementTree.SubElement(suite, "testcase",
+            classname = suite_name,
+            name      = r.job.name,
+            time      = f"{r.duration:.3f}")
+        ElementTree.SubElement(case, "properties").extend([
+            ElementTree.Element("property", name="max_rss_kb", value=str(r.max_rss)),
+        ])
+        if not r.passed:
+            failure = ElementTree.SubElement(case, "failure", message=f"Exit code {r.returncode}")
+            failure.text = r.output
+        ElementTree.SubElement(case, "system-out").text = r.output
+    os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+    ElementTree.ElementTree(suite).write(filename, encoding="utf-8", xml_declaration=True)
@@ -0,0 +1,36 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import sys
+import unittest
+import subprocess
+import importlib.util
+
+import litex_boards
+
+class TestAliases(unittest.TestCase):
+    # Importing the platforms/targets packages should not import any platform/target.
+    def test_lazy_import(self):
+        cmd = [sys.executable, "-c", """\
+import sys
+import litex_boards.platforms
+import litex_boards.targets
+modules = [m for m in sys.modules if m.startswith(("litex_boards.platforms.", "litex_boards.targets."))]
+assert modules == [], modules
+"""]
+        subprocess.check_call(cmd)
+
+    # Short names should resolve to the vendor-prefixed module file.
+    def test_short_names(self):
+        for package in ["litex_boards.platforms", "litex_boards.targets"]:
+            for short_name, full_name in litex_boards.aliases[package].items():
+                with self.subTest(module=f"{package}.{short_name}"):
+                    short_spec = importlib.util.find_spec(f"{package}.{short_name}")
+                    full_spec  = importlib.util.find_spec(f"{package}.{full_name}")
+                    self.assertEqual(short_spec.origin, full_spec.origin)
+
+    def test_unknown_name(self):
+        self.assertIsNone(litex_boards.resolve_alias("litex_boards.targets", "unknown_board"))
+        self.assertIsNone(importlib.util.find_spec("litex_boards.targets.unknown_board"))
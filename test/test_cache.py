@@ -0,0 +1,61 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import time
+import tempfile
+import unittest
+
+from litex_boards.cache import BuildCache, get_build_key, get_ip_dir
+
+class _Platform:
+    sources = []
+    ips     = {}
+
+def _write(filename, content):
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    with open(filename, "w") as f:
+        f.write(content)
+
+class TestCache(unittest.TestCase):
+    def test_build_key(self):
+        with tempfile.TemporaryDirectory() as d:
+            for build in ["a", "b"]:
+                _write(os.path.join(d, build, "top.v"),     "module top(); endmodule")
+                _write(os.path.join(d, build, "top.xdc"),   "")
+                _write(os.path.join(d, build, "top.tcl"),   f"read_verilog {os.path.join(d, build)}/top.v")
+                _write(os.path.join(d, build, "top.bit"),   build)
+            key_a = get_build_key(_Platform(), os.path.join(d, "a"))
+            key_b = get_build_key(_Platform(), os.path.join(d, "b"))
+            # Build location and outputs should not change the key.
+            self.assertEqual(key_a, key_b)
+            # Sources should.
+            _write(os.path.join(d, "b", "top.xdc"), "set_property")
+            self.assertNotEqual(key_a, get_build_key(_Platform(), os.path.join(d, "b")))
+
+    def test_store_restore_evict(self):
+        with tempfile.TemporaryDirectory() as d:
+            cache = BuildCache(directory=os.path.join(d, "cache"), max_size=16)
+            gateware_dir = os.path.join(d, "gateware")
+            for key in ["key0", "key1"]:
+                _write(os.path.join(gateware_dir, "top.bit"), key*2)
+                cache.store(key, gateware_dir)
+                time.sleep(0.01)
+            self.assertEqual(set(cache.entries()), {"key0", "key1"})
+            self.assertTrue(cache.restore("key0", gateware_dir))
+            with open(os.path.join(gateware_dir, "top.bit")) as f:
+                self.assertEqual(f.read(), "key0key0")
+            self.assertFalse(cache.restore("key2", gateware_dir))
+            # key1 is now the least recently used entry.
+            _write(os.path.join(gateware_dir, "top.bit"), "key2key2")
+            cache.store("key2", gateware_dir)
+            self.assertEqual(set(cache.entries()), {"key0", "key2"})
+
+    def test_ip_dir(self):
+        config = {"USER_HBM_STACK": "2", "USER_AXI_CLK_FREQ": "450"}
+        ip_dir = get_ip_dir("hbm_0", config, directory="ips")
+        self.assertEqual(ip_dir, get_ip_dir("hbm_0", dict(reversed(list(config.items()))), directory="ips"))
+        self.assertNotEqual(ip_dir, get_ip_dir("hbm_0", {**config, "USER_AXI_CLK_FREQ": "250"}, directory="ips"))
+        self.assertTrue(os.path.basename(ip_dir).startswith("hbm_0_"))
@@ -0,0 +1,57 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import subprocess
+
+from litex_boards import registry
+
+class TestRegistry(unittest.TestCase):
+    # The shipped index should be up to date with the platforms/targets.
+    def test_up_to_date(self):
+        r = registry.Registry()
+        r.update()
+        self.assertFalse(r.modified, "Registry out of date, regenerate with: python3 -m litex_boards.registry --update")
+
+    def test_incremental_update(self):
+        with tempfile.TemporaryDirectory() as d:
+            filename = os.path.join(d, "registry.json")
+            shutil.copy(registry.REGISTRY_FILE, filename)
+            r = registry.Registry(filename, os.path.join(d, "registry_mtimes.json"))
+            r.entries["targets"]["digilent_arty"]["sha256"] = "0"
+            r.entries["targets"]["digilent_arty"]["info"]   = {}
+            r.update()
+            self.assertTrue(r.modified)
+            self.assertEqual(r.target("arty")["description"], "LiteX SoC on Arty A7")
+            # Mtimes are kept in the user cache, not in the shipped index.
+            self.assertTrue(r.mtimes_modified)
+            self.assertNotIn("mtime", r.entries["targets"]["digilent_arty"])
+
+    def test_queries(self):
+        arty = registry.target("arty")
+        self.assertEqual(arty["name"],      "digilent_arty")
+        self.assertEqual(arty["families"],  ["Artix7"])
+        self.assertEqual(arty["toolchain"], "vivado")
+        self.assertIn("--with-ethernet", arty["options"])
+        targets = registry.targets(family="ECP5", feature="ethernet")
+        self.assertIn("lattice_versa_ecp5", [t["name"] for t in targets])
+        for t in targets:
+            self.assertIn("ECP5",     t["families"])
+            self.assertIn("ethernet", t["features"])
+
+    # Lookups should not import any platform/target.
+    def test_no_import(self):
+        cmd = [sys.executable, "-c", """\
+import sys
+from litex_boards import registry
+registry.targets(family="ECP5", feature="ethernet")
+modules = [m for m in sys.modules if m.startswith(("litex_boards.platforms.", "litex_boards.targets."))]
+assert modules == [], modules
+"""]
+        subprocess.check_call(cmd)
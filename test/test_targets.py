@@ -5,13 +5,19 @@
 # This file is Copyright (c) 2019 Tim 'mithro' Ansell <me@mith.ro>
 # SPDX-License-Identifier: BSD-2-Clause
 
-import subprocess
-import unittest
 import os
+import unittest
+import tempfile
+
+import litex_boards
 
-from migen import *
+from .parallel import Job, run_jobs, inprocess_supported, print_report, write_junit
 
-from litex.soc.integration.builder import *
+# JUnit reports directory.
+junit_dir = os.environ.get("LITEX_BOARDS_TEST_REPORTS", "test-reports")
+
+# Run boards in processes forked from a pre-warmed parent (instead of fresh interpreters).
+inprocess = inprocess_supported() and os.environ.get("LITEX_BOARDS_TEST_INPROCESS", "1") == "1"
 
 class TestTargets(unittest.TestCase):
     excluded_platforms = [
@@ -37,47 +43,54 @@ class TestTargets(unittest.TestCase):
         "jungle_electronics_fireant",        # Reason: Require Efinity toolchain.
     ]
 
+    def run_boards(self, kind, jobs):
+        # Build all boards in parallel, each from its own directory.
+        with tempfile.TemporaryDirectory(prefix=f"litex_boards_{kind}_") as root:
+            for job in jobs:
+                job.cwd   = os.path.join(root, job.name)
+                job.args += ["--output-dir", os.path.join(job.cwd, "build")]
+            results = run_jobs(jobs, inprocess=inprocess)
+        print_report(results, title=f"Test {kind}")
+        write_junit(results, os.path.join(junit_dir, f"test_{kind}.xml"), suite_name=f"test_{kind}")
+        for r in results:
+            with self.subTest(**{kind[:-1]: r.job.name}):
+                self.assertTrue(r.passed, f"{r.job.name} failed:\n{r.output}")
+
     # Build simple design for all platforms.
     def test_platforms(self):
         # Collect platforms.
         platforms = []
-        for file in os.listdir("./litex_boards/platforms/"):
-            if file.endswith(".py"):
-                file = file.replace(".py", "")
-                if file not in ["__init__"] + self.excluded_platforms:
-                    platforms.append(file)
+        for name in litex_boards.modules["litex_boards.platforms"]:
+            if name not in self.excluded_platforms:
+                platforms.append(name)
 
         # Test platforms with simple design.
+        jobs = []
         for name in platforms:
-            with self.subTest(platform=name):
-                os.system("rm -rf build")
-                cmd = """\
-python3 -m litex_boards.targets.simple litex_boards.platforms.{} \
-    --no-compile-software   \
-    --no-compile-gateware   \
-    --uart-name="stub"      \
-""".format(name)
-                subprocess.check_call(cmd, shell=True)
+            jobs.append(Job(name, cwd=None, args=[
+                "-m", "litex_boards.targets.simple", f"litex_boards.platforms.{name}",
+                "--no-compile-software",
+                "--no-compile-gateware",
+                "--uart-name=stub",
+            ]))
+        self.run_boards("platforms", jobs)
 
     # Build default configuration for all targets.
     def test_targets(self):
         # Collect targets.
         targets = []
-        for file in os.listdir("./litex_boards/targets/"):
-            if file.endswith(".py"):
-                file = file.replace(".py", "")
-                if file not in ["__init__"] + self.excluded_targets:
-                    targets.append(file)
+        for name in litex_boards.modules["litex_boards.targets"]:
+            if name not in self.excluded_targets:
+                targets.append(name)
 
         # Test targets.
+        jobs = []
         for name in targets:
-            with self.subTest(target=name):
-                os.system("rm -rf build")
-                cmd = """\
-python3 -m litex_boards.targets.{} \
-    --cpu-type=vexriscv     \
-    --cpu-variant=minimal   \
-    --no-compile-software   \
-    --no-compile-gateware   \
-""".format(name)
-                subprocess.check_call(cmd, shell=True)
+            jobs.append(Job(name, cwd=None, args=[
+                "-m", f"litex_boards.targets.{name}",
+                "--cpu-type=vexriscv",
+                "--cpu-variant=minimal",
+                "--no-compile-software",
+                "--no-compile-gateware",
+            ]))
+        self.run_boards("targets", jobs)